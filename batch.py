@@ -0,0 +1,209 @@
+"""Wektorowy silnik wielu gier naraz (wymaga numpy).
+
+``BatchEngine`` prowadzi N niezależnych gier w tablicach numpy:
+plansze to jedna tablica ``(N, GRID_HEIGHT, GRID_WIDTH)`` typu uint8
+(0 = puste pole, 1..7 = kod kształtu z ``board.SHAPE_NAMES``), a stan
+klocków, wynik i poziom to tablice długości N (int64; wynik zatrzymuje
+się na engine.MAX_SCORE jak w TetrisEngine). Kolizje, osadzanie,
+czyszczenie linii i punktacja działają na całej paczce jednocześnie,
+według tych samych zasad co ``TetrisEngine``.
+
+Zakończone gry są od razu restartowane pojedynczo, więc paczka nigdy
+nie stoi. Wynik zakończonej gry trafia do ``final_score``.
+"""
+import numpy as np
+
+from board import GRID_WIDTH, GRID_HEIGHT, SHAPES, SHAPE_NAMES, PIECE_CELLS
+from engine import (
+    LINE_POINTS, MAX_SCORE,
+    ACTION_LEFT, ACTION_RIGHT, ACTION_DOWN, ACTION_ROTATE, ACTION_HARD_DROP,
+)
+
+NUM_SHAPES = len(SHAPES)
+
+
+def _build_tables():
+    """Tablice pól (dx, dy), liczby rotacji i szerokości dla kodów 1..7."""
+    cell_dx = np.zeros((NUM_SHAPES + 1, 4, 4), dtype=np.int16)
+    cell_dy = np.zeros((NUM_SHAPES + 1, 4, 4), dtype=np.int16)
+    num_rotations = np.ones(NUM_SHAPES + 1, dtype=np.int16)
+    widths = np.ones((NUM_SHAPES + 1, 4), dtype=np.int16)
+    for shape_id in range(1, NUM_SHAPES + 1):
+        shape = SHAPE_NAMES[shape_id]
+        rotations = SHAPES[shape]
+        num_rotations[shape_id] = len(rotations)
+        for rotation in range(4):
+            cells = PIECE_CELLS[shape][rotation % len(rotations)]
+            cell_dx[shape_id, rotation] = [dx for dx, _ in cells]
+            cell_dy[shape_id, rotation] = [dy for _, dy in cells]
+            widths[shape_id, rotation] = len(rotations[rotation % len(rotations)][0])
+    return cell_dx, cell_dy, num_rotations, widths
+
+
+CELL_DX, CELL_DY, NUM_ROTATIONS, WIDTHS = _build_tables()
+POINTS = np.array([LINE_POINTS[n] for n in range(5)], dtype=np.int64)
+SPAWN_X = (GRID_WIDTH // 2 - WIDTHS[:, 0] // 2).astype(np.int16)
+
+
+class BatchEngine:
+    def __init__(self, n, seed=None):
+        self.n = n
+        self.rng = np.random.default_rng(seed)
+
+        self.boards = np.zeros((n, GRID_HEIGHT, GRID_WIDTH), dtype=np.uint8)
+        self.piece = np.zeros(n, dtype=np.uint8)
+        self.next_piece = np.zeros(n, dtype=np.uint8)
+        self.rotation = np.zeros(n, dtype=np.int16)
+        self.x = np.zeros(n, dtype=np.int16)
+        self.y = np.zeros(n, dtype=np.int16)
+        self.score = np.zeros(n, dtype=np.int64)
+        self.level = np.ones(n, dtype=np.int64)
+        self.lines = np.zeros(n, dtype=np.int64)
+        self.pieces = np.zeros(n, dtype=np.int64)
+        self.final_score = np.zeros(n, dtype=np.int64)
+
+        # Każda gra ma własny worek 7 klocków i pozycję w nim
+        self.bags = np.zeros((n, NUM_SHAPES), dtype=np.uint8)
+        self.bag_pos = np.zeros(n, dtype=np.int16)
+
+        self.reset(np.ones(n, dtype=bool))
+
+    def _shuffle_bags(self, mask):
+        count = int(mask.sum())
+        if count:
+            perm = self.rng.random((count, NUM_SHAPES)).argsort(axis=1) + 1
+            self.bags[mask] = perm
+            self.bag_pos[mask] = 0
+
+    def _draw(self, mask):
+        """Pobiera kolejny kształt z worka dla wskazanych gier."""
+        self._shuffle_bags(mask & (self.bag_pos >= NUM_SHAPES))
+        idx = np.flatnonzero(mask)
+        drawn = self.bags[idx, self.bag_pos[idx]]
+        self.bag_pos[idx] += 1
+        return drawn
+
+    def _spawn(self, mask):
+        """Ustawia next_piece jako aktualny klocek i losuje nowy podgląd."""
+        self.piece[mask] = self.next_piece[mask]
+        self.next_piece[mask] = self._draw(mask)
+        self.rotation[mask] = 0
+        self.x[mask] = SPAWN_X[self.piece[mask]]
+        self.y[mask] = 0
+
+    def reset(self, mask):
+        """Restartuje wskazane gry (maska bool długości N)."""
+        self.boards[mask] = 0
+        self.score[mask] = 0
+        self.level[mask] = 1
+        self.lines[mask] = 0
+        self.pieces[mask] = 0
+        self._shuffle_bags(mask)
+        self.next_piece[mask] = self._draw(mask)
+        self._spawn(mask)
+
+    def collides(self, idx, dx=0, dy=0, rotation=None):
+        """Wektorowa kolizja dla gier idx (tablica indeksów)."""
+        if rotation is None:
+            rotation = self.rotation[idx]
+        piece = self.piece[idx]
+        xs = self.x[idx, None] + dx + CELL_DX[piece, rotation]
+        ys = self.y[idx, None] + dy + CELL_DY[piece, rotation]
+        outside = (xs < 0) | (xs >= GRID_WIDTH) | (ys >= GRID_HEIGHT)
+        visible = ~outside & (ys >= 0)
+        occupied = self.boards[idx[:, None], np.clip(ys, 0, GRID_HEIGHT - 1), np.clip(xs, 0, GRID_WIDTH - 1)] != 0
+        return (outside | (occupied & visible)).any(axis=1)
+
+    def _shift(self, idx, dx, dy):
+        """Przesuwa klocki gier idx tam, gdzie nie ma kolizji. Zwraca maskę kolizji."""
+        hit = self.collides(idx, dx, dy)
+        moved = idx[~hit]
+        self.x[moved] += dx
+        self.y[moved] += dy
+        return hit
+
+    def _rotate(self, idx):
+        rotation = (self.rotation[idx] + 1) % NUM_ROTATIONS[self.piece[idx]]
+        ok = idx[~self.collides(idx, rotation=rotation)]
+        self.rotation[ok] = (self.rotation[ok] + 1) % NUM_ROTATIONS[self.piece[ok]]
+
+    def _hard_drop(self, idx):
+        active = idx
+        while active.size:
+            active = active[~self._shift(active, 0, 1)]
+
+    def _lock(self, idx):
+        """Osadza klocki, czyści linie, liczy punkty i losuje kolejne klocki.
+           Zwraca liczbę usuniętych linii dla gier idx."""
+        piece = self.piece[idx]
+        rotation = self.rotation[idx]
+        xs = self.x[idx, None] + CELL_DX[piece, rotation]
+        ys = self.y[idx, None] + CELL_DY[piece, rotation]
+        self.boards[idx[:, None], ys, xs] = piece[:, None]
+        self.pieces[idx] += 1
+
+        # Pełne wiersze przesuwamy na górę (sortowanie stabilne), po czym je zerujemy
+        boards = self.boards[idx]
+        full = (boards != 0).all(axis=2)
+        cleared = full.sum(axis=1)
+        if cleared.any():
+            order = np.argsort(~full, axis=1, kind='stable')
+            boards = np.take_along_axis(boards, order[:, :, None], axis=1)
+            boards[np.arange(GRID_HEIGHT)[None, :] < cleared[:, None]] = 0
+            self.boards[idx] = boards
+
+        # Punktacja jak w TetrisEngine.update_score, z wynikiem zatrzymanym na MAX_SCORE.
+        # Punkty (najwyżej 800 * MAX_LEVEL) mieszczą się w int64, a suma jest ograniczana
+        # przed dodaniem, więc nic się nie przekręca.
+        points = POINTS[cleared] * self.level[idx]
+        self.lines[idx] += cleared
+        self.score[idx] = np.minimum(self.score[idx], MAX_SCORE - points) + points
+        self.level[idx] = 1 + self.score[idx] // 1000
+
+        mask = np.zeros(self.n, dtype=bool)
+        mask[idx] = True
+        self._spawn(mask)
+        return cleared
+
+    def step(self, actions):
+        """Wykonuje po jednej akcji (kody ACTION_*) w każdej grze.
+           Zwraca (usunięte linie, maska gier zakończonych w tym kroku)."""
+        actions = np.asarray(actions)
+        lines = np.zeros(self.n, dtype=np.int64)
+
+        left = np.flatnonzero(actions == ACTION_LEFT)
+        right = np.flatnonzero(actions == ACTION_RIGHT)
+        self._shift(left, -1, 0)
+        self._shift(right, 1, 0)
+        self._rotate(np.flatnonzero(actions == ACTION_ROTATE))
+
+        down = np.flatnonzero(actions == ACTION_DOWN)
+        locking = down[self._shift(down, 0, 1)]
+        drop = np.flatnonzero(actions == ACTION_HARD_DROP)
+        self._hard_drop(drop)
+        locking = np.concatenate((locking, drop))
+
+        return self._finish(locking, lines)
+
+    def step_placement(self, rotations, xs):
+        """Akcja typu "umieść": ustawia rotację i kolumnę, po czym zrzuca klocek.
+           Nieosiągalna pozycja (kolizja w wierszu startowym) kończy grę."""
+        idx = np.arange(self.n)
+        lines = np.zeros(self.n, dtype=np.int64)
+        self.rotation[:] = np.asarray(rotations) % NUM_ROTATIONS[self.piece]
+        max_x = GRID_WIDTH - WIDTHS[self.piece, self.rotation]
+        self.x[:] = np.clip(xs, 0, max_x)
+        blocked = self.collides(idx)
+        self._hard_drop(idx[~blocked])
+        return self._finish(idx[~blocked], lines, blocked)
+
+    def _finish(self, locking, lines, done=None):
+        if done is None:
+            done = np.zeros(self.n, dtype=bool)
+        if locking.size:
+            lines[locking] = self._lock(locking)
+            done[locking] |= self.collides(locking)
+        if done.any():
+            self.final_score[done] = self.score[done]
+            self.reset(done)
+        return lines, done
@@ -0,0 +1,364 @@
+"""Benchmarki gorących ścieżek silnika i rysowania klatek.
+
+    python bench.py                          # wszystko, wynik w bench_results.json
+    python bench.py --only engine --quick
+    python bench.py --only startup
+    python bench.py --save-baseline bench_baseline.json
+    python bench.py --baseline bench_baseline.json --tolerance 0.15
+
+Silnik: check_collision, move, rotate, place_piece, clear_lines i new_piece
+na obu planszach ('list' i 'bit'), na planszach z losowej gry i na planszach
+bliskich przepełnienia, oraz decyzje bota (bot.BotPlayer.decide).
+Wynik: operacje na sekundę.
+
+Rysowanie: N klatek TetrisGame.draw z Main.py i alternative.py pod
+SDL_VIDEODRIVER=dummy, w wariantach bez skórek, ze skórkami, po zmianie
+rozmiaru okna i w trybie dirty rectangles. Wynik: percentyle czasu klatki (ms).
+
+Start: czas uruchomienia nowego procesu Pythona z importem modułów rdzenia
+(tyle płaci każdy proces roboczy symulacji) w porównaniu z samym
+interpreterem i z frontendem pygame. Moduły rdzenia nie mogą importować
+pygame; jeśli to zrobią, benchmark zgłasza regresję także bez wyniku bazowego.
+
+Porównanie z zapisanym wynikiem bazowym zwraca kod 1 przy regresji większej
+niż --tolerance. Kod 1 zwraca też niespełniony cel wydajnościowy silnika
+(PIECES_PER_SEC_TARGET, opisany w module engine), także bez wyniku bazowego.
+"""
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+from bot import BotPlayer
+from board import GRID_WIDTH, GRID_HEIGHT, SHAPES, SHAPE_IDS
+from engine import TetrisEngine, ACTIONS, ACTION_HARD_DROP
+
+BOARDS = ('list', 'bit')
+
+# Cel z dokumentacji modułu engine: osadzone klocki na sekundę na jednym rdzeniu
+PIECES_PER_SEC_TARGET = {'list': 50_000, 'bit': 80_000}
+
+
+def percentile(values, p):
+    values = sorted(values)
+    if not values:
+        return 0.0
+    k = min(len(values) - 1, max(0, round(p / 100 * (len(values) - 1))))
+    return values[k]
+
+
+def random_states(seed, count):
+    """Snapshoty z losowych gier: kilka losowych ruchów i hard drop dla każdego klocka."""
+    rng = random.Random(seed)
+    states = []
+    while len(states) < count:
+        engine = TetrisEngine(board='bit', seed=rng.randrange(2 ** 32))
+        for _ in range(rng.randrange(30)):
+            for _ in range(rng.randrange(4)):
+                engine.step(rng.choice(ACTIONS[1:5]))
+            engine.step(ACTION_HARD_DROP)
+            if engine.game_over:
+                break
+        if not engine.game_over:
+            states.append(engine.snapshot())
+    return states
+
+
+def near_top_states(seed, count):
+    """Snapshoty z planszą zapełnioną do 4. wiersza (po jednej dziurze w wierszu)."""
+    rng = random.Random(seed)
+    states = []
+    shapes = list(SHAPES)
+    for _ in range(count):
+        engine = TetrisEngine(board='bit', seed=rng.randrange(2 ** 32))
+        cells = bytearray(GRID_WIDTH * GRID_HEIGHT)
+        for y in range(4, GRID_HEIGHT):
+            hole = rng.randrange(GRID_WIDTH)
+            for x in range(GRID_WIDTH):
+                if x != hole:
+                    cells[y * GRID_WIDTH + x] = SHAPE_IDS[rng.choice(shapes)]
+        engine.board.load_bytes(bytes(cells))
+        states.append(engine.snapshot())
+    return states
+
+
+def full_rows_states(seed, count):
+    """Snapshoty z 1-4 pełnymi wierszami do usunięcia przez clear_lines."""
+    rng = random.Random(seed)
+    states = []
+    for state in near_top_states(seed, count):
+        engine = TetrisEngine.from_snapshot(state, board='bit')
+        cells = bytearray(engine.board.to_bytes())
+        for y in rng.sample(range(4, GRID_HEIGHT), rng.randint(1, 4)):
+            cells[y * GRID_WIDTH:(y + 1) * GRID_WIDTH] = bytes([SHAPE_IDS['I']]) * GRID_WIDTH
+        engine.board.load_bytes(bytes(cells))
+        states.append(engine.snapshot())
+    return states
+
+
+def run_timed(states, board, op, repeat):
+    """Mierzy tylko samo wywołanie op(engine); przygotowanie stanu nie jest liczone."""
+    clock = time.perf_counter
+    engines = [TetrisEngine.from_snapshot(state, board=board) for state in states]
+    total = 0.0
+    calls = 0
+    for _ in range(repeat):
+        for state, engine in zip(states, engines):
+            start = clock()
+            op(engine)
+            total += clock() - start
+            calls += 1
+        if op.mutates:
+            engines = [TetrisEngine.from_snapshot(state, board=board) for state in states]
+    return calls / total if total else 0.0
+
+
+def _op(fn, mutates=False):
+    fn.mutates = mutates
+    return fn
+
+
+def _collision(engine):
+    for dx in (-1, 0, 1):
+        engine.check_collision(engine.current_piece, dx, 1)
+
+
+def _move(engine):
+    engine.move(-1, 0)
+    engine.move(1, 0)
+
+
+def _place(engine):
+    piece = engine.current_piece
+    while not engine.check_collision(piece, 0, 1):
+        piece['y'] += 1
+    engine.place_piece()
+
+
+_BOT = BotPlayer()
+
+ENGINE_OPS = {
+    'check_collision': _op(_collision),
+    'move': _op(_move),
+    'rotate': _op(lambda engine: engine.rotate()),
+    'new_piece': _op(lambda engine: engine.new_piece()),
+    'place_piece': _op(_place, mutates=True),
+    'clear_lines': _op(lambda engine: engine.clear_lines(), mutates=True),
+    'bot_decide': _op(lambda engine: _BOT.decide(engine)),
+}
+
+
+def bench_engine(quick=False):
+    count = 200 if quick else 1000
+    repeat = 2 if quick else 5
+    workloads = {
+        'random': random_states(1, count),
+        'near_top': near_top_states(2, count),
+    }
+    full_rows = full_rows_states(3, count)
+    results = {}
+    for board in BOARDS:
+        for name, op in ENGINE_OPS.items():
+            states = workloads.items() if name != 'clear_lines' else [('full_rows', full_rows)]
+            for workload, data in states:
+                results[f"{name}/{board}/{workload}"] = run_timed(data, board, op, repeat)
+        # Pełne gry: osadzone klocki na sekundę
+        start = time.perf_counter()
+        pieces = 0
+        rng = random.Random(4)
+        while time.perf_counter() - start < (0.5 if quick else 2.0):
+            engine = TetrisEngine(board=board, seed=rng.randrange(2 ** 32))
+            while not engine.game_over:
+                for _ in range(rng.randrange(4)):
+                    engine.step(rng.choice(ACTIONS[1:5]))
+                engine.step(ACTION_HARD_DROP)
+            pieces += engine.pieces
+        results[f"pieces_per_sec/{board}"] = pieces / (time.perf_counter() - start)
+    return results
+
+
+def _write_skins(directory):
+    import pygame
+    os.makedirs(os.path.join(directory, 'skins'), exist_ok=True)
+    for i, shape in enumerate(SHAPES):
+        surface = pygame.Surface((30, 30), pygame.SRCALPHA)
+        surface.fill((40 * i % 256, 255 - 30 * i, 128, 255))
+        pygame.draw.line(surface, (255, 255, 255, 255), (0, 0), (29, 29), 2)
+        pygame.image.save(surface, os.path.join(directory, 'skins', f"{shape}.png"))
+
+
+def _render_frames(module, frames, size, dirty, resize_to=None):
+    import pygame
+    flags = pygame.RESIZABLE if module.__name__ == 'alternative' else 0
+    window = pygame.display.set_mode(size, flags)
+    game = module.TetrisGame(window, module.SkinManager(), 'bench', dirty_rendering=dirty, seed=5)
+    if resize_to:
+        pygame.event.post(pygame.event.Event(pygame.VIDEORESIZE, w=resize_to[0], h=resize_to[1], size=resize_to))
+        game.handle_input()
+    rng = random.Random(6)
+    times = []
+    clock = time.perf_counter
+    for _ in range(frames):
+        if game.engine.game_over:
+            game = module.TetrisGame(game.window, game.skin_manager, 'bench', dirty_rendering=dirty, seed=rng.randrange(2 ** 32))
+        if rng.random() < 0.2:
+            game.engine.step(rng.choice(ACTIONS))
+        game.engine.advance_gravity(1000 // 60)
+        start = clock()
+        game.draw()
+        times.append((clock() - start) * 1000)
+    return {
+        'p50': percentile(times, 50),
+        'p95': percentile(times, 95),
+        'p99': percentile(times, 99),
+        'mean': sum(times) / len(times),
+    }
+
+
+def bench_render(quick=False):
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+    import pygame
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+    import Main
+    import alternative
+
+    frames = 200 if quick else 1000
+    variants = [
+        ('plain', (800, 600), False, None),
+        ('dirty', (800, 600), True, None),
+    ]
+    results = {}
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as skin_dir:
+        _write_skins(skin_dir)
+        for skinned in (False, True):
+            # SkinManager czyta katalog 'skins' z bieżącego katalogu
+            os.chdir(skin_dir if skinned else tempfile.gettempdir())
+            try:
+                for module in (Main, alternative):
+                    module_variants = list(variants)
+                    if module is alternative:
+                        module_variants.append(('resized', (800, 600), False, (1280, 960)))
+                    for name, size, dirty, resize_to in module_variants:
+                        key = f"{module.__name__}/{name}{'+skins' if skinned else ''}"
+                        results[key] = _render_frames(module, frames, size, dirty, resize_to)
+            finally:
+                os.chdir(cwd)
+    pygame.quit()
+    return results
+
+
+# Zestawy modułów importowanych w nowym procesie; None = sam interpreter
+STARTUP_IMPORTS = {
+    'interpreter': None,
+    'core': 'board, engine, scores',
+    'simulate': 'simulate',
+    'frontend': 'frontend',
+}
+# Zestawy, które nie mogą ładować pygame
+CORE_IMPORTS = ('interpreter', 'core', 'simulate')
+
+
+def bench_startup(quick=False):
+    """Czas (ms) uruchomienia procesu z importem modułów i to, czy załadował pygame."""
+    repeat = 3 if quick else 11
+    env = dict(os.environ, SDL_VIDEODRIVER='dummy', PYGAME_HIDE_SUPPORT_PROMPT='1')
+    here = os.path.dirname(os.path.abspath(__file__))
+    results = {}
+    for name, modules in STARTUP_IMPORTS.items():
+        code = "import sys\n"
+        if modules:
+            code += f"import {modules}\n"
+        code += "print('pygame' in sys.modules)"
+        times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            output = subprocess.run([sys.executable, '-c', code], cwd=here, env=env, check=True,
+                                    capture_output=True, text=True).stdout
+            times.append((time.perf_counter() - start) * 1000)
+        results[name] = {'ms': percentile(times, 50), 'pygame': output.strip() == 'True'}
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """Zwraca listę regresji względem wyniku bazowego."""
+    regressions = []
+    for name, ops in results.get('engine', {}).items():
+        base = baseline.get('engine', {}).get(name)
+        if base and ops < base * (1 - tolerance):
+            regressions.append(f"engine {name}: {ops:,.0f} ops/s vs {base:,.0f} baseline")
+    for name, stats in results.get('render', {}).items():
+        base = baseline.get('render', {}).get(name)
+        if base and stats['p95'] > base['p95'] * (1 + tolerance):
+            regressions.append(f"render {name}: p95 {stats['p95']:.3f} ms vs {base['p95']:.3f} ms baseline")
+    for name, stats in results.get('startup', {}).items():
+        base = baseline.get('startup', {}).get(name)
+        if base and stats['ms'] > base['ms'] * (1 + tolerance):
+            regressions.append(f"startup {name}: {stats['ms']:.1f} ms vs {base['ms']:.1f} ms baseline")
+    return regressions
+
+
+def missed_targets(results):
+    """Plansze, na których silnik nie osiąga celu PIECES_PER_SEC_TARGET."""
+    missed = []
+    for board, target in PIECES_PER_SEC_TARGET.items():
+        pieces = results.get('engine', {}).get(f"pieces_per_sec/{board}")
+        if pieces is not None and pieces < target:
+            missed.append(f"engine pieces_per_sec/{board}: {pieces:,.0f} pieces/s vs {target:,} target")
+    return missed
+
+
+def core_violations(results):
+    """Zestawy modułów rdzenia, które załadowały pygame."""
+    return [f"startup {name}: imports pygame"
+            for name, stats in results.get('startup', {}).items()
+            if name in CORE_IMPORTS and stats['pygame']]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks for engine hot paths and frame rendering.")
+    parser.add_argument('--only', choices=('engine', 'render', 'startup'))
+    parser.add_argument('--quick', action='store_true', help="fewer iterations")
+    parser.add_argument('--out', default='bench_results.json')
+    parser.add_argument('--baseline', help="compare against this results file")
+    parser.add_argument('--save-baseline', help="also write results to this file")
+    parser.add_argument('--tolerance', type=float, default=0.15)
+    args = parser.parse_args(argv)
+
+    results = {}
+    if args.only in (None, 'engine'):
+        results['engine'] = bench_engine(args.quick)
+        for name, ops in results['engine'].items():
+            print(f"{name:40s} {ops:>14,.0f} ops/s")
+    if args.only in (None, 'render'):
+        results['render'] = bench_render(args.quick)
+        for name, stats in results['render'].items():
+            print(f"{name:40s} p50 {stats['p50']:7.3f}  p95 {stats['p95']:7.3f}  p99 {stats['p99']:7.3f} ms")
+    if args.only in (None, 'startup'):
+        results['startup'] = bench_startup(args.quick)
+        for name, stats in results['startup'].items():
+            print(f"startup/{name:32s} {stats['ms']:10.1f} ms{'  (pygame)' if stats['pygame'] else ''}")
+
+    with open(args.out, 'w') as f:
+        json.dump(results, f, indent=2)
+    if args.save_baseline:
+        with open(args.save_baseline, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    regressions = core_violations(results) + missed_targets(results)
+    if args.baseline:
+        with open(args.baseline, 'r') as f:
+            regressions += compare(results, json.load(f), args.tolerance)
+    for line in regressions:
+        print("REGRESSION", line)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,434 @@
+"""Plansza gry: kształty tetromino i wymienne implementacje siatki.
+
+Obie implementacje mają ten sam interfejs (collides/place/clear_lines/
+drop_distance/get/cells/grid/to_bytes/load_bytes), dzięki czemu silnik może pracować na dowolnej z nich,
+a benchmarki mogą je porównywać bezpośrednio:
+
+* ``ListBoard`` - oryginalna siatka jako lista 20 list,
+* ``BitBoard`` - każdy wiersz to maska bitowa (bit x = kolumna x), kolory
+  trzymane osobno w zwartej tablicy ``bytearray``.
+
+Każda plansza utrzymuje też skrót Zobrista zajętości pól (``hash``):
+XOR losowych kluczy CELL_KEYS zajętych pól, aktualizowany przy osadzaniu
+klocka i usuwaniu linii, a nie liczony od nowa. ROW_HASH[y][maska] to
+gotowy XOR kluczy całego wiersza, więc zmiana wiersza to jedna operacja.
+
+Plansze trzymają też wysokości kolumn (``heights``, 0 = pusta kolumna),
+aktualizowane przy osadzaniu i po usunięciu linii. Razem z dolnym
+profilem rotacji (PIECE_PROFILES) dają odległość zrzutu klocka bez
+sprawdzania kolizji wiersz po wierszu (``drop_distance``).
+"""
+import random
+
+# Stałe
+GRID_WIDTH = 10
+GRID_HEIGHT = 20
+
+# Kształty tetromino z wszystkimi rotacjami
+SHAPES = {
+    'I': [
+        [[1, 1, 1, 1]],
+        [[1], [1], [1], [1]],
+        [[1, 1, 1, 1]],
+        [[1], [1], [1], [1]]
+    ],
+    'O': [
+        [[1, 1], [1, 1]]
+    ],
+    'T': [
+        [[0, 1, 0], [1, 1, 1]],
+        [[1, 0], [1, 1], [1, 0]],
+        [[1, 1, 1], [0, 1, 0]],
+        [[0, 1], [1, 1], [0, 1]]
+    ],
+    'L': [
+        [[1, 0], [1, 0], [1, 1]],
+        [[1, 1, 1], [1, 0, 0]],
+        [[1, 1], [0, 1], [0, 1]],
+        [[0, 0, 1], [1, 1, 1]]
+    ],
+    'J': [
+        [[0, 1], [0, 1], [1, 1]],
+        [[1, 0, 0], [1, 1, 1]],
+        [[1, 1], [1, 0], [1, 0]],
+        [[1, 1, 1], [0, 0, 1]]
+    ],
+    'S': [
+        [[0, 1, 1], [1, 1, 0]],
+        [[1, 0], [1, 1], [0, 1]]
+    ],
+    'Z': [
+        [[1, 1, 0], [0, 1, 1]],
+        [[0, 1], [1, 1], [1, 0]]
+    ]
+}
+
+# Pole śmieci dosyłanych przez przeciwnika w grze wieloosobowej (server.py)
+GARBAGE = 'G'
+
+# Kody kształtów w zwartej tablicy kolorów (0 = puste pole, ostatni kod to śmieci)
+SHAPE_NAMES = (0,) + tuple(SHAPES.keys()) + (GARBAGE,)
+SHAPE_IDS = {shape: i for i, shape in enumerate(SHAPE_NAMES) if shape}
+
+FULL_ROW = (1 << GRID_WIDTH) - 1
+EMPTY_GRID = bytes(GRID_WIDTH * GRID_HEIGHT)
+
+
+def _build_tables():
+    """Wylicza przy imporcie maski wierszy, listy pól i profile kolumn dla każdej rotacji."""
+    masks = {}
+    cells = {}
+    profiles = {}
+    for shape, rotations in SHAPES.items():
+        masks[shape] = []
+        cells[shape] = []
+        profiles[shape] = []
+        for matrix in rotations:
+            width = len(matrix[0])
+            # Maski dla każdej dopuszczalnej pozycji x (0 .. GRID_WIDTH - width)
+            masks[shape].append([
+                tuple(sum(1 << (x + col) for col, cell in enumerate(row) if cell) for row in matrix)
+                for x in range(GRID_WIDTH - width + 1)
+            ])
+            cells[shape].append(tuple(
+                (col, row_i) for row_i, row in enumerate(matrix) for col, cell in enumerate(row) if cell
+            ))
+            column_rows = [[row_i for row_i, row in enumerate(matrix) if row[col]] for col in range(width)]
+            profiles[shape].append(tuple((col, min(ys), max(ys)) for col, ys in enumerate(column_rows)))
+    return masks, cells, profiles
+
+
+# PIECE_MASKS[shape][rotation][x] -> krotka masek kolejnych wierszy klocka
+# PIECE_CELLS[shape][rotation] -> krotka (dx, dy) zajętych pól
+# PIECE_PROFILES[shape][rotation] -> krotka (dx, najwyższe dy, najniższe dy) dla każdej kolumny
+PIECE_MASKS, PIECE_CELLS, PIECE_PROFILES = _build_tables()
+
+
+def _build_zobrist():
+    """Stałe (z ustalonego seeda) 64-bitowe klucze pól i skróty całych wierszy."""
+    rng = random.Random(0x5EED)
+    cells = [[rng.getrandbits(64) for _ in range(GRID_WIDTH)] for _ in range(GRID_HEIGHT)]
+    rows = []
+    for keys in cells:
+        row = [0] * (1 << GRID_WIDTH)
+        for mask in range(1, 1 << GRID_WIDTH):
+            low = mask & -mask
+            row[mask] = row[mask ^ low] ^ keys[low.bit_length() - 1]
+        rows.append(row)
+    return cells, rows
+
+
+# CELL_KEYS[y][x] -> klucz Zobrista pola, ROW_HASH[y][maska] -> XOR kluczy pól maski
+CELL_KEYS, ROW_HASH = _build_zobrist()
+
+
+def rows_hash(rows):
+    """Skrót Zobrista planszy z masek wierszy (liczony od zera)."""
+    result = 0
+    for y, row in enumerate(rows):
+        result ^= ROW_HASH[y][row]
+    return result
+
+
+def _raise_heights(heights, shape, rotation, px, py):
+    """Podnosi wysokości kolumn do górnych pól osadzonego klocka."""
+    for dx, top, _ in PIECE_PROFILES[shape][rotation]:
+        height = GRID_HEIGHT - py - top
+        if height > heights[px + dx]:
+            heights[px + dx] = height
+
+
+def _step_drop(board, shape, rotation, px, py):
+    """Odległość zrzutu liczona kolizjami wiersz po wierszu (klocek pod nawisem)."""
+    distance = 0
+    while not board.collides(shape, rotation, px, py + distance + 1):
+        distance += 1
+    return distance
+
+
+def column_heights(rows):
+    """Wysokości kolumn z masek wierszy (liczone od zera)."""
+    heights = [0] * GRID_WIDTH
+    seen = 0
+    for y, row in enumerate(rows):
+        new = row & ~seen
+        while new:
+            low = new & -new
+            heights[low.bit_length() - 1] = GRID_HEIGHT - y
+            new ^= low
+        seen |= row
+        if seen == FULL_ROW:
+            break
+    return heights
+
+
+def surface_drop(heights, shape, rotation, px, py):
+    """O ile wierszy klocek w (px, py) spadnie na powierzchnię kolumn.
+       None, jeśli klocek jest już poniżej powierzchni którejś kolumny (pod nawisem)."""
+    distance = GRID_HEIGHT
+    for dx, _, bottom in PIECE_PROFILES[shape][rotation]:
+        gap = GRID_HEIGHT - heights[px + dx] - 1 - py - bottom
+        if gap < 0:
+            return None
+        if gap < distance:
+            distance = gap
+    return distance
+
+
+class ListBoard:
+    """Siatka jako lista wierszy z literą kształtu lub 0."""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.grid = [[0 for _ in range(GRID_WIDTH)] for _ in range(GRID_HEIGHT)]
+        self.hash = 0
+        self.heights = [0] * GRID_WIDTH
+        # Maski zajętych pól każdego wiersza i wiersze dotknięte ostatnim klockiem:
+        # tylko one mogą się zapełnić, więc tylko je sprawdza clear_lines
+        self.masks = [0] * GRID_HEIGHT
+        self.touched = ()
+
+    def _grid_hash(self):
+        result = 0
+        for y, row in enumerate(self.grid):
+            for x, block in enumerate(row):
+                if block:
+                    result ^= CELL_KEYS[y][x]
+        return result
+
+    def collides(self, shape, rotation, px, py):
+        """Sprawdza kolizję klocka z krawędziami lub już osadzonymi klockami."""
+        for y, row in enumerate(SHAPES[shape][rotation]):
+            for x, cell in enumerate(row):
+                if cell:
+                    new_x = px + x
+                    new_y = py + y
+                    if new_x < 0 or new_x >= GRID_WIDTH or new_y >= GRID_HEIGHT:
+                        return True
+                    if new_y >= 0 and self.grid[new_y][new_x]:
+                        return True
+        return False
+
+    def place(self, shape, rotation, px, py):
+        """Wpisuje klocek do siatki. Zwraca False, jeśli wystaje ponad planszę."""
+        matrix = SHAPES[shape][rotation]
+        for y, row in enumerate(matrix):
+            for x, cell in enumerate(row):
+                if cell:
+                    if py + y < 0:
+                        return False
+                    self.grid[py + y][px + x] = shape
+                    self.masks[py + y] |= 1 << (px + x)
+                    self.hash ^= CELL_KEYS[py + y][px + x]
+        _raise_heights(self.heights, shape, rotation, px, py)
+        self.touched = range(py, py + len(matrix))
+        return True
+
+    def clear_lines(self):
+        """Usuwa zapełnione linie i zlicza ile usunięto.
+           Sprawdzane są tylko maski wierszy dotkniętych ostatnim klockiem. Skrót
+           i wysokości zmieniają się tylko od szczytu stosu do najniższej usuniętej
+           linii, więc tylko te wiersze są przeliczane."""
+        masks = self.masks
+        full = [y for y in self.touched if masks[y] == FULL_ROW]
+        self.touched = ()
+        if not full:
+            return 0
+        lines_cleared = len(full)
+        heights = self.heights
+        highest, lowest = full[0], full[-1]
+        top = GRID_HEIGHT - max(heights)
+        # Niżej niż najniższa usunięta linia nic się nie zmienia, wyżej niż szczyt stosu są puste wiersze
+        old_masks = masks[top:lowest + 1]
+        new_masks = [0] * lines_cleared + [mask for mask in old_masks if mask != FULL_ROW]
+        h = self.hash
+        for keys, old, new in zip(ROW_HASH[top:lowest + 1], old_masks, new_masks):
+            if old != new:
+                h ^= keys[old] ^ keys[new]
+        self.hash = h
+        masks[top:lowest + 1] = new_masks
+        grid = self.grid
+        for y in reversed(full):
+            del grid[y]
+        grid[0:0] = [[0 for _ in range(GRID_WIDTH)] for _ in range(lines_cleared)]
+        # Kolumna ze szczytem nad usuniętymi liniami obniża się o ich liczbę. Kolumna ze szczytem
+        # w najwyższej usuniętej linii ma nowy szczyt najwyżej w wierszu highest + lines_cleared
+        cut = GRID_HEIGHT - highest
+        for x, height in enumerate(heights):
+            if height > cut:
+                heights[x] = height - lines_cleared
+            else:
+                bit = 1 << x
+                for y in range(highest + lines_cleared, GRID_HEIGHT):
+                    if masks[y] & bit:
+                        heights[x] = GRID_HEIGHT - y
+                        break
+                else:
+                    heights[x] = 0
+        return lines_cleared
+
+    def _grid_heights(self):
+        return column_heights([sum(1 << x for x, block in enumerate(row) if block) for row in self.grid])
+
+    def drop_distance(self, shape, rotation, px, py):
+        """O ile wierszy klocek może spaść bez kolizji."""
+        distance = surface_drop(self.heights, shape, rotation, px, py)
+        if distance is None:
+            distance = _step_drop(self, shape, rotation, px, py)
+        return distance
+
+    def get(self, x, y):
+        return self.grid[y][x]
+
+    def to_bytes(self):
+        """Kody kształtów wszystkich pól, wiersz po wierszu."""
+        return bytes(SHAPE_IDS[block] if block else 0 for row in self.grid for block in row)
+
+    def load_bytes(self, data):
+        """Odtwarza siatkę z wyniku to_bytes()."""
+        self.grid = [[SHAPE_NAMES[code] for code in data[y * GRID_WIDTH:(y + 1) * GRID_WIDTH]]
+                     for y in range(GRID_HEIGHT)]
+        self.hash = self._grid_hash()
+        self.heights = self._grid_heights()
+        self.masks = [sum(1 << x for x, block in enumerate(row) if block) for row in self.grid]
+        # Wczytana siatka może mieć już pełne wiersze
+        self.touched = range(GRID_HEIGHT)
+
+    def cells(self):
+        """Zwraca (x, y, kształt) dla każdego zajętego pola."""
+        for y, row in enumerate(self.grid):
+            for x, block in enumerate(row):
+                if block:
+                    yield x, y, block
+
+
+class BitBoard:
+    """Siatka jako maski bitowe wierszy plus zwarta tablica kolorów.
+
+    Tablica kolorów jest zmieniana wyłącznie w miejscu, więc może nią być
+    zewnętrzny bufor (np. memoryview tablicy numpy w env.py), który wtedy
+    zawsze pokazuje aktualną siatkę bez kopiowania."""
+
+    def __init__(self, colors=None):
+        self.colors = bytearray(GRID_WIDTH * GRID_HEIGHT) if colors is None else colors
+        self.reset()
+
+    def reset(self):
+        self.rows = [0] * GRID_HEIGHT
+        self.colors[:] = EMPTY_GRID
+        self.hash = 0
+        self.heights = [0] * GRID_WIDTH
+        # Wiersze dotknięte ostatnim klockiem (zapełnienie wiersza to porównanie maski z FULL_ROW)
+        self.touched = ()
+
+    def collides(self, shape, rotation, px, py):
+        """Kolizja to kilka operacji AND na maskach wierszy."""
+        masks = PIECE_MASKS[shape][rotation]
+        if px < 0 or px >= len(masks):
+            return True
+        masks = masks[px]
+        if py + len(masks) > GRID_HEIGHT:
+            return True
+        rows = self.rows
+        for i, mask in enumerate(masks):
+            if py + i >= 0 and rows[py + i] & mask:
+                return True
+        return False
+
+    def place(self, shape, rotation, px, py):
+        """Wpisuje klocek do masek i tablicy kolorów. Zwraca False, jeśli wystaje ponad planszę."""
+        if py < 0:
+            return False
+        masks = PIECE_MASKS[shape][rotation][px]
+        for i, mask in enumerate(masks):
+            self.rows[py + i] |= mask
+            # Pola klocka były puste, więc XOR dokłada dokładnie je
+            self.hash ^= ROW_HASH[py + i][mask]
+        color = SHAPE_IDS[shape]
+        for dx, dy in PIECE_CELLS[shape][rotation]:
+            self.colors[(py + dy) * GRID_WIDTH + px + dx] = color
+        _raise_heights(self.heights, shape, rotation, px, py)
+        self.touched = range(py, py + len(masks))
+        return True
+
+    def clear_lines(self):
+        """Usuwa pełne wiersze w jednym przebiegu (porównanie z FULL_ROW).
+           Sprawdzane są tylko wiersze dotknięte ostatnim klockiem, a kolory
+           wierszy nad usuniętymi liniami są przesuwane w dół w miejscu."""
+        rows = self.rows
+        touched = self.touched
+        self.touched = ()
+        for y in touched:
+            if rows[y] == FULL_ROW:
+                break
+        else:
+            return 0
+        kept = [y for y in range(GRID_HEIGHT) if rows[y] != FULL_ROW]
+        lines_cleared = GRID_HEIGHT - len(kept)
+        colors = self.colors
+        dest = GRID_HEIGHT
+        for y in reversed(kept):
+            dest -= 1
+            if y != dest:
+                colors[dest * GRID_WIDTH:(dest + 1) * GRID_WIDTH] = colors[y * GRID_WIDTH:(y + 1) * GRID_WIDTH]
+        colors[:lines_cleared * GRID_WIDTH] = EMPTY_GRID[:lines_cleared * GRID_WIDTH]
+        new_rows = [0] * lines_cleared + [rows[y] for y in kept]
+        # Zmieniają się tylko wiersze przesunięte w dół (nad usuniętymi liniami)
+        h = self.hash
+        for y in range(GRID_HEIGHT):
+            if rows[y] != new_rows[y]:
+                h ^= ROW_HASH[y][rows[y]] ^ ROW_HASH[y][new_rows[y]]
+        self.hash = h
+        self.rows = new_rows
+        self.heights = column_heights(new_rows)
+        return lines_cleared
+
+    def drop_distance(self, shape, rotation, px, py):
+        """O ile wierszy klocek może spaść bez kolizji."""
+        distance = surface_drop(self.heights, shape, rotation, px, py)
+        if distance is None:
+            distance = _step_drop(self, shape, rotation, px, py)
+        return distance
+
+    def get(self, x, y):
+        return SHAPE_NAMES[self.colors[y * GRID_WIDTH + x]]
+
+    def to_bytes(self):
+        """Kody kształtów wszystkich pól, wiersz po wierszu."""
+        return bytes(self.colors)
+
+    def load_bytes(self, data):
+        """Odtwarza maski i kolory z wyniku to_bytes()."""
+        self.colors[:] = data
+        self.rows = [
+            sum(1 << x for x in range(GRID_WIDTH) if data[y * GRID_WIDTH + x])
+            for y in range(GRID_HEIGHT)
+        ]
+        self.hash = rows_hash(self.rows)
+        self.heights = column_heights(self.rows)
+        self.touched = range(GRID_HEIGHT)
+
+    def cells(self):
+        """Zwraca (x, y, kształt) dla każdego zajętego pola."""
+        colors = self.colors
+        for y, row in enumerate(self.rows):
+            if row:
+                base = y * GRID_WIDTH
+                for x in range(GRID_WIDTH):
+                    if row >> x & 1:
+                        yield x, y, SHAPE_NAMES[colors[base + x]]
+
+    @property
+    def grid(self):
+        """Widok siatki w formacie ListBoard (budowany przy każdym odczycie)."""
+        return [[SHAPE_NAMES[c] for c in self.colors[y * GRID_WIDTH:(y + 1) * GRID_WIDTH]]
+                for y in range(GRID_HEIGHT)]
+
+
+# Dostępne implementacje planszy, wybierane nazwą w TetrisEngine
+BOARDS = {
+    'list': ListBoard,
+    'bit': BitBoard,
+}
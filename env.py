@@ -0,0 +1,178 @@
+"""Środowisko w stylu Gym do uczenia ze wzmocnieniem (wymaga numpy).
+
+``TetrisEnv`` ma interfejs:
+    reset(seed=None)  -> (obserwacja, info)
+    step(akcja)       -> (obserwacja, nagroda, koniec gry, przerwane, info)
+Nagroda to przyrost wyniku, a "przerwane" oznacza przekroczenie max_steps.
+
+Tryby akcji (ACTION_MODES):
+    'move'       akcja to kod z engine.ACTIONS (ruch gracza), po niej
+                 grawitacja o gravity_ms, jak w pętli gry,
+    'placement'  akcja to rotacja * GRID_WIDTH + kolumna; klocek jest
+                 obracany i przesuwany zwykłymi ruchami silnika (z kolizjami)
+                 i zrzucany. Jeśli położenia nie da się tak osiągnąć, klocek
+                 spada tam, dokąd doszedł, a info['invalid'] jest True.
+
+Obserwacja to jeden prealokowany rekord numpy o typie OBSERVATION:
+    grid       (GRID_HEIGHT, GRID_WIDTH) uint8, kody z board.SHAPE_NAMES
+    piece      kształt, rotacja, x, y spadającego klocka (int8)
+    next       kod następnego kształtu
+    score, level, lines, pieces, game_over
+Wynik i poziom są dokładnymi wartościami silnika w polach uint64: silnik
+zatrzymuje wynik na engine.MAX_SCORE (2**63 - 1), a poziom na MAX_LEVEL,
+więc długie gry dochodzą do tych wartości i na nich zostają. Nagroda
+po nasyceniu wyniku wynosi 0.
+Siatka to tablica kolorów planszy silnika (BitBoard(colors=...) na tym
+samym buforze), zmieniana przez silnik w miejscu; pozostałe pola są
+wpisywane jednym struct.pack_into po każdym kroku. step() nie tworzy
+nowych tablic ani słowników: zwraca zawsze ten sam obiekt obserwacji
+(tablica tylko do odczytu albo memoryview bajtów bufora, parametr
+observation) i ten sam słownik info. Kto chce zachować obserwację,
+musi ją skopiować.
+
+Pomiar kroków na sekundę:
+    python env.py --mode move --steps 100000
+"""
+import argparse
+import random
+import struct
+import sys
+import time
+
+import numpy as np
+
+from board import BitBoard, GRID_WIDTH, GRID_HEIGHT, SHAPES, SHAPE_IDS
+from engine import ACTIONS, ACTION_LEFT, ACTION_RIGHT, ACTION_ROTATE, ACTION_HARD_DROP, TetrisEngine
+
+ACTION_MODES = ('move', 'placement')
+OBSERVATIONS = ('array', 'memoryview')
+
+# Czas grawitacji po każdym ruchu w trybie 'move' (jedna klatka przy 60 FPS)
+GRAVITY_MS = 16
+
+OBSERVATION = np.dtype([
+    ('grid', np.uint8, (GRID_HEIGHT, GRID_WIDTH)),
+    ('piece', np.int8, 4),
+    ('next', np.uint8),
+    ('score', '<u8'),
+    ('level', '<u8'),
+    ('lines', '<u4'),
+    ('pieces', '<u4'),
+    ('game_over', np.uint8),
+])
+
+# Pola obserwacji za siatką w tej samej kolejności i bez wyrównania
+FIELDS = struct.Struct('<bbbbBQQIIB')
+FIELDS_OFFSET = OBSERVATION.fields['piece'][1]
+assert FIELDS_OFFSET + FIELDS.size == OBSERVATION.itemsize
+
+
+class TetrisEnv:
+    """Gra na silniku TetrisEngine z obserwacją w prealokowanym buforze numpy."""
+
+    def __init__(self, action_mode='move', observation='array', gravity_ms=GRAVITY_MS, max_steps=None):
+        if action_mode not in ACTION_MODES:
+            raise ValueError(f"Unknown action mode: {action_mode}")
+        if observation not in OBSERVATIONS:
+            raise ValueError(f"Unknown observation type: {observation}")
+        self.action_mode = action_mode
+        self.gravity_ms = gravity_ms
+        self.max_steps = max_steps
+        self.action_count = len(ACTIONS) if action_mode == 'move' else 4 * GRID_WIDTH
+
+        self.raw = np.zeros(OBSERVATION.itemsize, dtype=np.uint8)
+        # Zapisywalny rekord dla środowiska i widok tylko do odczytu dla agenta
+        self.buffer = self.raw.view(OBSERVATION).reshape(())
+        self.bytes = memoryview(self.raw)
+        if observation == 'array':
+            self.observation = self.buffer.view()
+            self.observation.flags.writeable = False
+        else:
+            self.observation = self.bytes.toreadonly()
+
+        self.engine = None
+        self.steps = 0
+        self.info = {'lines': 0, 'invalid': False}
+
+    def reset(self, seed=None):
+        """Nowa gra (ten sam seed daje tę samą kolejność klocków)."""
+        board = BitBoard(self.bytes[:GRID_WIDTH * GRID_HEIGHT])
+        self.engine = TetrisEngine(board=board, seed=seed)
+        self.steps = 0
+        self.info['lines'] = 0
+        self.info['invalid'] = False
+        self._write()
+        return self.observation, self.info
+
+    def _write(self):
+        engine = self.engine
+        piece = engine.current_piece
+        FIELDS.pack_into(
+            self.bytes, FIELDS_OFFSET,
+            SHAPE_IDS[piece['shape']], piece['rotation'], piece['x'], piece['y'],
+            SHAPE_IDS[engine.next_piece], engine.score, engine.level, engine.lines, engine.pieces,
+            engine.game_over,
+        )
+
+    def _place(self, action):
+        """Obraca i przesuwa klocek ruchami silnika, potem zrzuca. Zwraca True, jeśli cel osiągnięto."""
+        engine = self.engine
+        piece = engine.current_piece
+        rotation, x = divmod(action, GRID_WIDTH)
+        rotation %= len(SHAPES[piece['shape']])
+        for _ in range((rotation - piece['rotation']) % len(SHAPES[piece['shape']])):
+            engine.step(ACTION_ROTATE)
+        move = ACTION_RIGHT if x > piece['x'] else ACTION_LEFT
+        for _ in range(abs(x - piece['x'])):
+            engine.step(move)
+        reached = piece['rotation'] == rotation and piece['x'] == x
+        engine.step(ACTION_HARD_DROP)
+        return reached
+
+    def step(self, action):
+        engine = self.engine
+        if engine is None:
+            raise RuntimeError("reset() must be called before step()")
+        if not 0 <= action < self.action_count:
+            raise ValueError(f"Action out of range: {action}")
+        score = engine.score
+        lines = engine.lines
+        if self.action_mode == 'move':
+            engine.step(action)
+            engine.advance_gravity(self.gravity_ms)
+            self.info['invalid'] = False
+        else:
+            self.info['invalid'] = not self._place(action)
+        self.steps += 1
+        self._write()
+        self.info['lines'] = engine.lines - lines
+        truncated = self.max_steps is not None and self.steps >= self.max_steps
+        return self.observation, engine.score - score, engine.game_over, truncated, self.info
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Random-agent throughput of the Gym-style environment.")
+    parser.add_argument('--mode', choices=ACTION_MODES, default='move')
+    parser.add_argument('--observation', choices=OBSERVATIONS, default='array')
+    parser.add_argument('--steps', type=int, default=100000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    env = TetrisEnv(args.mode, args.observation)
+    rng = random.Random(args.seed)
+    obs, _ = env.reset(seed=args.seed)
+    actions = [rng.randrange(env.action_count) for _ in range(args.steps)]
+    episodes = 0
+    start = time.perf_counter()
+    for action in actions:
+        obs, reward, terminated, truncated, info = env.step(action)
+        if terminated or truncated:
+            episodes += 1
+            obs, _ = env.reset(seed=args.seed + episodes)
+    elapsed = time.perf_counter() - start
+    print(f"{args.steps} steps, {episodes} episodes in {elapsed:.2f}s ({args.steps / elapsed:,.0f} steps/s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
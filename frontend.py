@@ -0,0 +1,665 @@
+"""Wspólna warstwa pygame obu wersji gry (Main.py i alternative.py).
+
+Zasady gry, kształty i tabela wyników są w modułach bez pygame (engine,
+board, scores), więc symulacje i procesy robocze nie płacą za import
+pygame/SDL. Ten moduł importuje pygame i jest ładowany dopiero przez
+frontend: SkinManager, Menu, TetrisGame i main() są tu raz, a Main.py
+i alternative.py ustawiają tylko układ ekranu.
+
+Układ TetrisGame zależy od block_size (rozmiar klocka w pikselach):
+domyślnie dopasowany do okna, które można skalować (RESIZABLE = True).
+Podklasa ze stałym układem (Main.py) nadpisuje fit_block_size(),
+next_pos(), hud_layout() i hud_rect().
+"""
+import os
+import random
+import sys
+import time
+
+import pygame
+
+from bot import BotPlayer
+from engine import (
+    GARBAGE, GRID_WIDTH, GRID_HEIGHT, SHAPES, TetrisEngine,
+    ACTION_LEFT, ACTION_RIGHT, ACTION_DOWN, ACTION_ROTATE, ACTION_HARD_DROP,
+)
+from replay import ReplayRecorder
+from scores import BACKENDS as SCORE_BACKENDS
+from render import TEXT_CACHE, DirtyTracker, frame_cells, ghost_cells, piece_cells, preview_cells
+from timing import FixedTimestep, FrameProfiler
+
+FPS = 60
+# Logika gry (grawitacja) działa w stałych krokach LOGIC_TICK_MS, niezależnie od rysowania
+LOGIC_TICK_MS = 10
+# Najwięcej nadrabianych kroków logiki na jedną klatkę; nadmiar czasu jest odrzucany
+MAX_CATCHUP_TICKS = 25
+# Limit klatek rysowania w trakcie gry: 0 = bez limitu, np. 30 na słabym sprzęcie
+RENDER_FPS = FPS
+# Synchronizacja pionowa; jeśli sterownik jej nie obsługuje, okno działa bez niej
+VSYNC = False
+# Menu czeka na zdarzenia; co MENU_IDLE_MS sprawdza, czy nie zmieniła się np. lista wyników
+MENU_IDLE_MS = 500
+
+# Przerysowywanie tylko zmienionych obszarów (oszczędza CPU na słabym sprzęcie)
+DIRTY_RENDERING = False
+# Nagrywanie powtórek (wejście gracza i kroki grawitacji) do katalogu REPLAY_DIR
+RECORD_REPLAYS = False
+REPLAY_DIR = 'replays'
+# Gra bota (bot.BotPlayer) zamiast gracza przy klawiaturze
+BOT_PLAYER = False
+# Podgląd miejsca lądowania klocka ("duch") jako obrys w kolorze kształtu
+SHOW_GHOST = True
+GHOST_BORDER = 2
+# Backend tabeli wyników: 'log' (ranking w pamięci) albo 'sqlite' (pełna historia gier)
+HIGH_SCORE_BACKEND = 'log'
+# Liczba wyników na jednej stronie listy (strzałki lewo/prawo zmieniają stronę)
+HIGH_SCORES_PAGE = 10
+# Pomiar czasu faz klatki (zdarzenia, logika, rysowanie, flip), zapis do PROFILE_PATH po grze
+PROFILE_FRAMES = False
+PROFILE_PATH = 'frame_timings.jsonl'
+# Nakładka z percentylami czasów faz (przełączana też klawiszem F3)
+SHOW_FRAME_TIMINGS = False
+TIMINGS_FONT_SIZE = 20
+
+# Kolory
+BLACK = (0, 0, 0)
+WHITE = (255, 255, 255)
+
+# Zdarzenia, po których okno trzeba narysować ponownie (odsłonięcie okna)
+REDRAW_EVENTS = (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED)
+
+SHAPE_COLORS = {
+    'I': (0, 255, 255),
+    'O': (255, 255, 0),
+    'T': (128, 0, 128),
+    'L': (255, 165, 0),
+    'J': (0, 0, 255),
+    'S': (0, 255, 0),
+    'Z': (255, 0, 0),
+    GARBAGE: (128, 128, 128)
+}
+
+# Kafelki atlasu: wszystkie kształty i pole śmieci z gry wieloosobowej
+TILES = tuple(SHAPES) + (GARBAGE,)
+
+
+class SkinManager:
+    """Skórki kształtów (katalog skins) i atlas kafelków do rysowania planszy.
+
+    Atlas to jedna powierzchnia z kafelkiem każdego kształtu (skórka albo
+    pole w kolorze kształtu) i pod nim obrysem "ducha". Cała klatka jest
+    wtedy listą (atlas, cel, obszar) dla jednego wywołania Surface.blits(),
+    a rysowanie ze skórkami i bez nich kosztuje tyle samo."""
+
+    def __init__(self):
+        self.skins = {}
+        # Przeskalowane i skonwertowane skórki: (kształt, block_size) -> Surface
+        self.scaled_skins = {}
+        # Atlas dla ostatnio użytego block_size: (block_size, (atlas, obszary, obszary ducha))
+        self.atlas_cache = (None, None)
+        self.load_skins()
+
+    def load_skins(self):
+        skin_dir = 'skins'
+        if not os.path.exists(skin_dir):
+            return
+        for shape in SHAPES.keys():
+            path = os.path.join(skin_dir, f"{shape}.png")
+            if os.path.exists(path):
+                self.skins[shape] = pygame.image.load(path).convert_alpha()
+
+    def get_skin(self, shape):
+        return self.skins.get(shape, SHAPE_COLORS.get(shape, WHITE))
+
+    def rescale(self, block_size):
+        """Buduje skórki i atlas dla nowego rozmiaru klocka i usuwa te dla starych rozmiarów."""
+        self.scaled_skins = {
+            (shape, block_size): pygame.transform.scale(skin, (block_size, block_size)).convert_alpha()
+            for shape, skin in self.skins.items()
+        }
+        self.atlas_cache = (None, None)
+
+    def get_scaled_skin(self, shape, block_size):
+        """Zwraca skórkę w rozmiarze block_size (z cache) albo kolor kształtu."""
+        skin = self.scaled_skins.get((shape, block_size))
+        if skin is None:
+            if shape not in self.skins:
+                return SHAPE_COLORS.get(shape, WHITE)
+            self.rescale(block_size)
+            skin = self.scaled_skins[(shape, block_size)]
+        return skin
+
+    def atlas(self, block_size):
+        """(atlas, {kształt: obszar klocka}, {kształt: obszar ducha}) dla block_size."""
+        size, atlas = self.atlas_cache
+        if size != block_size:
+            atlas = self.build_atlas(block_size)
+            self.atlas_cache = (block_size, atlas)
+        return atlas
+
+    def build_atlas(self, block_size):
+        """Kafelki wszystkich kształtów (i śmieci) w rzędzie, obrysy ducha w rzędzie pod nimi."""
+        surface = pygame.Surface((len(TILES) * block_size, 2 * block_size), pygame.SRCALPHA)
+        areas = {}
+        ghosts = {}
+        for i, shape in enumerate(TILES):
+            x = i * block_size
+            skin = self.get_scaled_skin(shape, block_size)
+            if isinstance(skin, pygame.Surface):
+                # Dodanie do przezroczystego tła kopiuje piksele skórki razem z kanałem alfa
+                surface.blit(skin, (x, 0), special_flags=pygame.BLEND_RGBA_ADD)
+                areas[shape] = pygame.Rect(x, 0, block_size, block_size)
+            else:
+                # Pole w kolorze kształtu z przerwą 1 px między klockami
+                areas[shape] = pygame.Rect(x, 0, block_size - 1, block_size - 1)
+                surface.fill(skin, areas[shape])
+            ghosts[shape] = pygame.Rect(x, block_size, block_size - 1, block_size - 1)
+            pygame.draw.rect(surface, SHAPE_COLORS.get(shape, WHITE), ghosts[shape], GHOST_BORDER)
+        return surface, areas, ghosts
+
+
+class Menu:
+    # Okno można skalować; czcionka menu jest wtedy dopasowywana do jego wysokości
+    RESIZABLE = True
+
+    def __init__(self, window, high_score_manager):
+        self.window = window
+        self.high_score_manager = high_score_manager
+        self.font_size = self.fit_font_size()
+        self.font = TEXT_CACHE.font(self.font_size)
+        self.name = ''
+        self.active_input = False
+
+    def fit_font_size(self):
+        """Rozmiar czcionki menu: rośnie wraz z wysokością okna."""
+        return max(20, self.window.get_height() // 15)
+
+    def update_font(self):
+        """Wywoływane przy zmianie rozmiaru okna, aby dopasować czcionkę."""
+        old_size = self.font_size
+        self.font_size = self.fit_font_size()
+        if old_size != self.font_size:
+            TEXT_CACHE.discard_size(old_size)
+        self.font = TEXT_CACHE.font(self.font_size)
+
+    def wait_events(self):
+        """Blokuje do pierwszego zdarzenia (najwyżej MENU_IDLE_MS) i zwraca wszystkie oczekujące.
+           Bezczynne menu nie zużywa CPU."""
+        event = pygame.event.wait(MENU_IDLE_MS)
+        if event.type == pygame.NOEVENT:
+            return []
+        return [event] + pygame.event.get()
+
+    def handle_system_event(self, event):
+        """Zamknięcie i zmiana rozmiaru okna. Zwraca True, jeśli ekran trzeba narysować od nowa."""
+        if event.type == pygame.QUIT:
+            pygame.quit()
+            sys.exit()
+        if event.type == pygame.VIDEORESIZE and self.RESIZABLE:
+            self.window = open_window((event.w, event.h), pygame.RESIZABLE)
+            self.update_font()
+            return True
+        return event.type in REDRAW_EVENTS
+
+    def draw_text(self, text, color, x, y):
+        text_surface = TEXT_CACHE.render(text, color, self.font_size)
+        text_rect = text_surface.get_rect(center=(x, y))
+        self.window.blit(text_surface, text_rect)
+
+    def enter_name(self):
+        self.active_input = True
+        self.name = ''
+        # Ostatnio narysowany stan ekranu; None wymusza przerysowanie
+        shown = None
+        while self.active_input:
+            if shown != self.name:
+                self.window.fill(BLACK)
+                cx = self.window.get_width() // 2
+                cy = self.window.get_height() // 2
+                self.draw_text("Enter your name:", WHITE, cx, cy - self.font_size * 1.5)
+                self.draw_text(self.name, WHITE, cx, cy)
+                pygame.display.flip()
+                shown = self.name
+
+            for event in self.wait_events():
+                if self.handle_system_event(event):
+                    shown = None
+                if event.type == pygame.KEYDOWN:
+                    if event.key == pygame.K_RETURN:
+                        self.active_input = False
+                    elif event.key == pygame.K_BACKSPACE:
+                        self.name = self.name[:-1]
+                    else:
+                        if len(self.name) < 20:
+                            self.name += event.unicode
+        return self.name
+
+    def display_menu(self):
+        menu_running = True
+        selected = 0
+        options = ['Start Game', 'High Scores', 'Quit']
+        shown = None
+        while menu_running:
+            if shown != selected:
+                self.window.fill(BLACK)
+                cx = self.window.get_width() // 2
+                cy = self.window.get_height() // 2
+                for i, option in enumerate(options):
+                    color = WHITE if i != selected else (255, 0, 0)
+                    self.draw_text(option, color, cx, cy + i * (self.font_size + 10))
+                pygame.display.flip()
+                shown = selected
+
+            for event in self.wait_events():
+                if self.handle_system_event(event):
+                    shown = None
+                if event.type == pygame.KEYDOWN:
+                    if event.key == pygame.K_UP:
+                        selected = (selected - 1) % len(options)
+                    elif event.key == pygame.K_DOWN:
+                        selected = (selected + 1) % len(options)
+                    elif event.key == pygame.K_RETURN:
+                        if options[selected] == 'Start Game':
+                            name = self.enter_name()
+                            return 'start', name
+                        elif options[selected] == 'High Scores':
+                            self.show_high_scores()
+                            shown = None
+                        elif options[selected] == 'Quit':
+                            pygame.quit()
+                            sys.exit()
+        return 'quit', None
+
+    def show_high_scores(self):
+        showing = True
+        shown = None
+        number = 0
+        while showing:
+            # Z tabeli wyników pobieramy tylko wyświetlaną stronę
+            page = self.high_score_manager.page(number, HIGH_SCORES_PAGE)
+            scores = [(score['name'], score['score']) for score in page]
+            if shown != (number, scores):
+                self.window.fill(BLACK)
+                cx = self.window.get_width() // 2
+                self.draw_text("High Scores", WHITE, cx, self.font_size * 1.5)
+                for i, (name, score) in enumerate(scores):
+                    text = f"{number * HIGH_SCORES_PAGE + i + 1}. {name}: {score}"
+                    self.draw_text(text, WHITE, cx, (self.font_size * 3) + i * (self.font_size + 5))
+                pygame.display.flip()
+                shown = (number, scores)
+
+            for event in self.wait_events():
+                if self.handle_system_event(event):
+                    shown = None
+                if event.type == pygame.KEYDOWN:
+                    if event.key == pygame.K_ESCAPE:
+                        showing = False
+                    elif event.key == pygame.K_LEFT:
+                        number = max(0, number - 1)
+                    elif event.key == pygame.K_RIGHT:
+                        if self.high_score_manager.page(number + 1, HIGH_SCORES_PAGE):
+                            number += 1
+
+
+class TetrisGame:
+    # Okno można skalować; block_size jest wtedy liczony od nowa
+    RESIZABLE = True
+
+    def __init__(self, window, skin_manager, player_name, dirty_rendering=DIRTY_RENDERING,
+                 seed=None, replay_path=None, profile_path=None, show_timings=SHOW_FRAME_TIMINGS,
+                 player=None, show_ghost=SHOW_GHOST):
+        self.window = window
+        self.skin_manager = skin_manager
+        self.player_name = player_name
+
+        # Wymiary okna i rozmiar klocka
+        self.window_width = self.window.get_width()
+        self.window_height = self.window.get_height()
+        self.block_size = self.fit_block_size()
+        self.skin_manager.rescale(self.block_size)
+
+        # Zasady gry (plansza, worek, punktacja) prowadzi silnik.
+        # Ten sam seed i te same wejścia dają dokładnie tę samą grę.
+        self.seed = random.randrange(2 ** 63) if seed is None else seed
+        self.engine = TetrisEngine(seed=self.seed)
+        self.recorder = ReplayRecorder(replay_path, self.seed) if replay_path else None
+        # Gracz komputerowy: polityka player(engine, rng) -> akcja, jedna akcja na klatkę
+        self.player = player
+        self.show_ghost = show_ghost
+        self.last_fall = pygame.time.get_ticks()
+        # Czas rzeczywisty zamieniany na stałe kroki logiki
+        self.timestep = FixedTimestep(LOGIC_TICK_MS, MAX_CATCHUP_TICKS)
+        self.clock = pygame.time.Clock()
+
+        # Tryb "dirty rectangles": przerysowujemy tylko to, co się zmieniło,
+        # a pełne odświeżenie robimy po zmianie rozmiaru okna i po końcu gry
+        self.dirty_rendering = dirty_rendering
+        self.dirty = DirtyTracker()
+
+        # Warstwa z osadzonymi klockami, klucz: (engine.pieces, block_size)
+        self.layer = None
+        self.layer_key = None
+
+        # Pomiar czasu faz klatki; wyniki trafiają do profile_path po końcu gry
+        self.profile_path = profile_path
+        self.show_timings = show_timings
+        self.profiler = FrameProfiler(1000 / (RENDER_FPS or FPS)) if profile_path or show_timings else None
+        self.timings_text = ((), [])
+
+    @property
+    def score(self):
+        return self.engine.score
+
+    @property
+    def level(self):
+        return self.engine.level
+
+    @property
+    def game_over(self):
+        return self.engine.game_over
+
+    def fit_block_size(self):
+        """Rozmiar klocka, przy którym plansza (10x20) i podgląd obok mieszczą się w oknie:
+           w szerokości min. 14 klocków (10 na planszę i zapas na "next piece"),
+           w wysokości 20 klocków."""
+        return min(self.window_width // 14, self.window_height // 20)
+
+    def next_pos(self):
+        """Pozycja podglądu następnego klocka (po prawej stronie planszy)."""
+        return self.block_size * (GRID_WIDTH + 2), self.block_size * 2
+
+    def hud_layout(self):
+        """Rozmiar czcionki HUD, y pierwszego wiersza i odstęp między wierszami."""
+        font_size = max(20, self.block_size)  # dopasowujemy wielkość czcionki do rozmiaru klocka
+        _, next_y = self.next_pos()
+        return font_size, next_y + 5 * self.block_size, font_size + 10
+
+    def hud_rect(self):
+        """Obszar z punktacją pod podglądem następnego klocka."""
+        next_x, _ = self.next_pos()
+        font_size, top, _ = self.hud_layout()
+        return pygame.Rect(next_x, top, self.window_width - next_x, 2 * font_size + 10)
+
+    def timings_rect(self):
+        """Obszar nakładki z czasami faz klatki w prawym dolnym rogu okna."""
+        next_x, _ = self.next_pos()
+        height = 6 * TIMINGS_FONT_SIZE
+        return pygame.Rect(next_x, self.window_height - height - 10, self.window_width - next_x, height)
+
+    def piece_blits(self, ghost=False):
+        """Pozycje (atlas, cel, obszar) spadającego klocka albo jego ducha."""
+        engine = self.engine
+        cells = ghost_cells(engine) if ghost else piece_cells(engine)
+        if not cells:
+            return []
+        size = self.block_size
+        atlas, areas, ghosts = self.skin_manager.atlas(size)
+        area = (ghosts if ghost else areas)[engine.current_piece['shape']]
+        return [(atlas, (x * size, y * size), area) for x, y in cells]
+
+    def preview_blits(self, next_x, next_y):
+        """Pozycje (atlas, cel, obszar) podglądu następnego klocka."""
+        shape = self.engine.next_piece
+        size = self.block_size
+        atlas, areas, _ = self.skin_manager.atlas(size)
+        return [(atlas, (next_x + col_i * size, next_y + row_i * size), areas[shape])
+                for col_i, row_i in preview_cells(shape)]
+
+    def board_layer(self):
+        """Osadzone klocki na osobnej powierzchni (jedno wywołanie blits).
+           Przebudowywana tylko po osadzeniu klocka lub zmianie block_size."""
+        key = (self.engine.pieces, self.block_size)
+        if self.layer_key != key:
+            size = self.block_size
+            layer_size = (GRID_WIDTH * size, GRID_HEIGHT * size)
+            if self.layer is None or self.layer.get_size() != layer_size:
+                self.layer = pygame.Surface(layer_size).convert()
+            self.layer.fill(BLACK)
+            atlas, areas, _ = self.skin_manager.atlas(size)
+            self.layer.blits([(atlas, (x * size, y * size), areas[block])
+                              for x, y, block in self.engine.board.cells()], doreturn=False)
+            self.layer_key = key
+        return self.layer
+
+    def draw(self):
+        """Rysowanie całej sceny."""
+        if self.dirty_rendering and not self.dirty.full and not self.game_over:
+            self.draw_dirty()
+            return
+        engine = self.engine
+        self.window.fill(BLACK)
+
+        # Zakotwiczone klocki to jedna gotowa warstwa, na niej duch, spadający klocek
+        # i podgląd następnego klocka (po prawej stronie) - wszystko jednym blits
+        blits = [(self.board_layer(), (0, 0))]
+        if self.show_ghost:
+            blits += self.piece_blits(ghost=True)
+        blits += self.piece_blits()
+        blits += self.preview_blits(*self.next_pos())
+        self.window.blits(blits, doreturn=False)
+
+        # Wynik i poziom
+        self.draw_hud()
+
+        # Komunikat Game Over
+        if self.game_over:
+            font_size, _, _ = self.hud_layout()
+            text = TEXT_CACHE.render("Game Over", WHITE, font_size * 2)
+            text_rect = text.get_rect(center=(self.window_width // 2, self.window_height // 2))
+            self.window.blit(text, text_rect)
+
+        self.dirty.remember(frame_cells(engine, self.show_ghost), next=engine.next_piece,
+                            hud=(self.score, self.level))
+        self.present()
+
+    def draw_hud(self):
+        """Wynik i poziom pod podglądem następnego klocka."""
+        next_x, _ = self.next_pos()
+        font_size, top, line_height = self.hud_layout()
+        # Napisy są renderowane ponownie tylko, gdy zmieni się wynik lub poziom
+        score_text = TEXT_CACHE.render(f"Score: {self.score}", WHITE, font_size)
+        level_text = TEXT_CACHE.render(f"Level: {self.level}", WHITE, font_size)
+        self.window.blit(score_text, (next_x, top))
+        self.window.blit(level_text, (next_x, top + line_height))
+
+    def draw_dirty(self):
+        """Przerysowuje tylko zmienione pola, podgląd i HUD, po czym wysyła ich prostokąty."""
+        engine = self.engine
+        size = self.block_size
+        rects = []
+
+        layer = self.board_layer()
+        piece = piece_cells(engine)
+        ghost = ghost_cells(engine) if self.show_ghost else ()
+        if piece:
+            atlas, areas, ghosts = self.skin_manager.atlas(size)
+            shape = engine.current_piece['shape']
+        blits = []
+        for x, y in self.dirty.diff_cells(frame_cells(engine, self.show_ghost)):
+            # Tło pola kopiujemy z warstwy planszy, na wierzch ewentualnie spadający klocek
+            rect = pygame.Rect(x * size, y * size, size, size)
+            blits.append((layer, rect, rect))
+            if (x, y) in piece:
+                blits.append((atlas, rect.topleft, areas[shape]))
+            elif (x, y) in ghost:
+                blits.append((atlas, rect.topleft, ghosts[shape]))
+            rects.append(rect)
+
+        if self.dirty.changed('next', engine.next_piece):
+            rect = pygame.Rect(self.next_pos(), (4 * size, 4 * size))
+            self.window.fill(BLACK, rect)
+            blits += self.preview_blits(rect.x, rect.y)
+            rects.append(rect)
+
+        self.window.blits(blits, doreturn=False)
+
+        if self.dirty.changed('hud', (self.score, self.level)):
+            rect = self.hud_rect()
+            self.window.fill(BLACK, rect)
+            self.draw_hud()
+            rects.append(rect)
+
+        self.present(rects)
+
+    def present(self, rects=None):
+        """Wysyła klatkę na ekran: całą (flip) albo tylko podane prostokąty."""
+        if self.profiler:
+            rect = self.draw_timings(full=rects is None)
+            if rect and rects is not None:
+                rects.append(rect)
+            self.profiler.mark('draw')
+        if rects is None:
+            pygame.display.flip()
+        elif rects:
+            pygame.display.update(rects)
+
+    def draw_timings(self, full):
+        """Nakładka z percentylami czasów faz. Zwraca prostokąt, jeśli coś narysowano."""
+        if not self.show_timings:
+            return None
+        lines = self.profiler.overlay()
+        if not full and not self.dirty.changed('timings', lines):
+            return None
+        if self.timings_text[0] != lines:
+            # Napisy zmieniają się co chwilę, więc nie trafiają do wspólnego TEXT_CACHE
+            font = TEXT_CACHE.font(TIMINGS_FONT_SIZE)
+            self.timings_text = (lines, [font.render(line, True, WHITE) for line in lines])
+        rect = self.timings_rect()
+        self.window.fill(BLACK, rect)
+        for i, surface in enumerate(self.timings_text[1]):
+            self.window.blit(surface, (rect.x, rect.y + i * TIMINGS_FONT_SIZE))
+        return rect
+
+    def apply(self, action):
+        """Przekazuje akcję do silnika i do nagrania powtórki.
+           Po końcu gry (także po wyjściu klawiszem ESC) nic nie jest nagrywane,
+           bo odtwarzany silnik nie wie o przerwaniu gry i wykonałby te kroki."""
+        if self.engine.game_over:
+            return
+        if self.recorder:
+            self.recorder.action(action)
+        self.engine.step(action)
+        if self.recorder:
+            self.recorder.checkpoint(self.engine)
+
+    def advance(self, ms):
+        """Przesuwa czas gry w silniku i w nagraniu powtórki."""
+        if self.engine.game_over:
+            return
+        if self.recorder:
+            self.recorder.gravity(ms)
+        self.engine.advance_gravity(ms)
+        if self.recorder:
+            self.recorder.checkpoint(self.engine)
+
+    def resize(self, width, height):
+        """Nowe okno po zmianie rozmiaru: block_size, skórki i pełne przerysowanie."""
+        self.window_width, self.window_height = width, height
+        self.window = open_window((width, height), pygame.RESIZABLE)
+        self.block_size = self.fit_block_size()
+        self.skin_manager.rescale(self.block_size)
+        self.dirty.invalidate()
+
+    def handle_input(self):
+        """Obsługa inputu gracza oraz zdarzeń systemowych (w tym zmiany rozmiaru)."""
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                pygame.quit()
+                sys.exit()
+            if event.type == pygame.VIDEORESIZE and self.RESIZABLE:
+                self.resize(event.w, event.h)
+            if event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_LEFT:
+                    self.apply(ACTION_LEFT)
+                elif event.key == pygame.K_RIGHT:
+                    self.apply(ACTION_RIGHT)
+                elif event.key == pygame.K_DOWN:
+                    self.apply(ACTION_DOWN)
+                elif event.key == pygame.K_UP:
+                    self.apply(ACTION_ROTATE)
+                elif event.key == pygame.K_SPACE:
+                    # tzw. "hard drop"
+                    self.apply(ACTION_HARD_DROP)
+                elif event.key == pygame.K_ESCAPE:
+                    # Reszta zdarzeń tej klatki jest pomijana
+                    self.engine.game_over = True
+                    return
+                elif event.key == pygame.K_F3 and self.profiler:
+                    self.show_timings = not self.show_timings
+                    self.dirty.invalidate()
+
+    def run(self):
+        """Główna pętla gry."""
+        profiler = self.profiler
+        while not self.game_over:
+            if profiler:
+                profiler.start()
+            self.handle_input()
+            if self.game_over:
+                # Wyjście klawiszem ESC: bez ruchu bota i grawitacji w tej klatce
+                break
+            if profiler:
+                profiler.mark('events')
+            if self.player:
+                self.apply(self.player(self.engine, None))
+            now = pygame.time.get_ticks()
+            for _ in range(self.timestep.update(now - self.last_fall)):
+                self.advance(LOGIC_TICK_MS)
+                if self.game_over:
+                    break
+            self.last_fall = now
+            if profiler:
+                profiler.mark('logic')
+            # Faza 'draw' jest zamykana w present(), tuż przed flip
+            self.draw()
+            self.clock.tick(RENDER_FPS)
+            if profiler:
+                profiler.end('flip')
+        if self.recorder:
+            self.recorder.close(self.engine)
+        if self.profile_path:
+            profiler.dump(self.profile_path, seed=self.seed, player=self.player_name,
+                          score=self.score, pieces=self.engine.pieces)
+
+
+def open_window(size, flags=0):
+    """Otwiera okno gry; z VSYNC flip czeka na odświeżenie monitora."""
+    if VSYNC:
+        try:
+            return pygame.display.set_mode(size, flags | pygame.SCALED, vsync=1)
+        except pygame.error:
+            pass
+    return pygame.display.set_mode(size, flags)
+
+
+def main(size, game_class=TetrisGame, menu_class=Menu, skin_class=SkinManager):
+    """Menu, gry i zapis wyników aż do wyjścia z menu."""
+    pygame.init()
+    window = open_window(size, pygame.RESIZABLE if game_class.RESIZABLE else 0)
+    pygame.display.set_caption("Tetris")
+
+    high_score_manager = SCORE_BACKENDS[HIGH_SCORE_BACKEND]()
+    skin_manager = skin_class()
+    menu = menu_class(window, high_score_manager)
+
+    while True:
+        action, player_name = menu.display_menu()
+
+        if action == 'start':
+            replay_path = None
+            if RECORD_REPLAYS:
+                replay_path = os.path.join(REPLAY_DIR, f"{time.time_ns()}.trpl")
+            profile_path = PROFILE_PATH if PROFILE_FRAMES else None
+            player = BotPlayer() if BOT_PLAYER else None
+            game = game_class(window, skin_manager, player_name, replay_path=replay_path,
+                              profile_path=profile_path, player=player)
+            started = time.monotonic()
+            game.run()
+            if game.score > 0:
+                high_score_manager.add_score(player_name, game.score, level=game.level, lines=game.engine.lines,
+                                             duration=round(time.monotonic() - started, 3), seed=game.seed)
+        elif action == 'quit':
+            break
+
+    high_score_manager.close()
+    pygame.quit()
@@ -0,0 +1,114 @@
+"""Pomocnicze struktury rysowania frontendu pygame (frontend.py)."""
+from collections import OrderedDict
+
+import pygame
+
+from board import PIECE_CELLS, SHAPES
+
+# Znacznik pól "ducha" w frame_cells
+GHOST = 'ghost'
+
+
+def piece_cells(engine):
+    """Pola planszy zajmowane przez spadający klocek."""
+    piece = engine.current_piece
+    if not piece or engine.game_over:
+        return []
+    return [(piece['x'] + dx, piece['y'] + dy) for dx, dy in PIECE_CELLS[piece['shape']][piece['rotation']]]
+
+
+def ghost_cells(engine):
+    """Pola "ducha": spadający klocek w miejscu, w którym wyląduje po zrzucie."""
+    piece = engine.current_piece
+    if not piece or engine.game_over:
+        return []
+    y = engine.ghost_y()
+    return [(piece['x'] + dx, y + dy) for dx, dy in PIECE_CELLS[piece['shape']][piece['rotation']]]
+
+
+def frame_cells(engine, ghost=False):
+    """Zwraca {(x, y): kształt} dla osadzonych klocków i spadającego klocka
+       (z ghost=True także (GHOST, kształt) dla pól "ducha")."""
+    cells = {(x, y): block for x, y, block in engine.board.cells()}
+    if ghost:
+        for pos in ghost_cells(engine):
+            cells[pos] = (GHOST, engine.current_piece['shape'])
+    for pos in piece_cells(engine):
+        cells[pos] = engine.current_piece['shape']
+    return cells
+
+
+def preview_cells(shape):
+    """Pola podglądu następnego klocka (rotacja 0) jako (kolumna, wiersz)."""
+    return PIECE_CELLS[shape][0] if shape in SHAPES else ()
+
+
+class DirtyTracker:
+    """Pamięta stan poprzedniej klatki, aby przerysować tylko zmienione obszary."""
+
+    def __init__(self):
+        self.cells = {}
+        self.regions = {}
+        self.full = True
+
+    def invalidate(self):
+        """Wymusza pełne przerysowanie w następnej klatce (np. po zmianie rozmiaru)."""
+        self.full = True
+
+    def remember(self, cells, **regions):
+        """Zapisuje stan po pełnym przerysowaniu."""
+        self.cells = cells
+        self.regions = regions
+        self.full = False
+
+    def diff_cells(self, cells):
+        """Zwraca pola, które zmieniły się od poprzedniej klatki."""
+        old = self.cells
+        changed = [pos for pos, block in cells.items() if old.get(pos) != block]
+        changed.extend(pos for pos in old if pos not in cells)
+        self.cells = cells
+        return changed
+
+    def changed(self, name, value):
+        """Sprawdza, czy wartość obszaru (np. HUD) zmieniła się, i zapamiętuje nową."""
+        if self.regions.get(name) == value:
+            return False
+        self.regions[name] = value
+        return True
+
+
+class TextCache:
+    """Cache czcionek (wg rozmiaru) i wyrenderowanych napisów (LRU)."""
+
+    def __init__(self, max_surfaces=256):
+        self.fonts = {}
+        self.surfaces = OrderedDict()
+        self.max_surfaces = max_surfaces
+
+    def font(self, size):
+        font = self.fonts.get(size)
+        if font is None:
+            font = self.fonts[size] = pygame.font.Font(None, size)
+        return font
+
+    def render(self, text, color, size):
+        """Zwraca powierzchnię z napisem, renderując go tylko przy pierwszym użyciu."""
+        key = (text, color, size)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.surfaces.move_to_end(key)
+            return surface
+        surface = self.surfaces[key] = self.font(size).render(text, True, color)
+        if len(self.surfaces) > self.max_surfaces:
+            self.surfaces.popitem(last=False)
+        return surface
+
+    def discard_size(self, size):
+        """Usuwa czcionkę i napisy w danym rozmiarze (np. po zmianie rozmiaru okna)."""
+        self.fonts.pop(size, None)
+        for key in [key for key in self.surfaces if key[2] == size]:
+            del self.surfaces[key]
+
+
+# Wspólny cache dla menu i HUD
+TEXT_CACHE = TextCache()
@@ -0,0 +1,230 @@
+"""Nagrywanie i odtwarzanie rozgrywek w zwartym formacie binarnym.
+
+Plik powtórki:
+    nagłówek  MAGIC, wersja (B), seed (q)
+    rekordy   delta ms (H), kod akcji (B)
+    klatki    rekord z kodem KEYFRAME, a po nim czas gry (Q) i engine.snapshot()
+    koniec    rekord z kodem END, skrót stanu końcowego (20 B),
+              indeks klatek kluczowych (klocki, czas, offset) i stopka INDEX_MAGIC
+
+Rekord oznacza "advance_gravity(delta), potem step(akcja)" - dokładnie
+w kolejności, w jakiej frontend wywoływał silnik. Delta równa ESCAPE_DELTA
+oznacza, że prawdziwa delta jest zapisana zaraz po rekordzie jako uint32.
+Rekordy są tylko dopisywane na końcu pliku, więc przerwana gra zostawia
+poprawny (choć niezweryfikowany) zapis.
+
+Co KEYFRAME_INTERVAL klocków nagranie zawiera pełny stan gry, więc seek()
+wczytuje najbliższą wcześniejszą klatkę i symuluje tylko resztę.
+
+Odtwarzanie działa bez pygame i bez limitu 60 FPS:
+    python replay.py replays/*.trpl
+"""
+import bisect
+import hashlib
+import os
+import struct
+import sys
+import time
+
+from engine import TetrisEngine, ACTION_NONE, SNAPSHOT
+
+MAGIC = b'TRPL'
+VERSION = 3
+HEADER = struct.Struct('<4sBq')
+RECORD = struct.Struct('<HB')
+LONG_DELTA = struct.Struct('<I')
+KEYFRAME_TIME = struct.Struct('<Q')
+KEYFRAME_SIZE = KEYFRAME_TIME.size + SNAPSHOT.size
+INDEX_ENTRY = struct.Struct('<IQQ')
+FOOTER = struct.Struct('<I4s')
+INDEX_MAGIC = b'TKIX'
+ESCAPE_DELTA = 0xFFFF
+ACTION_KEYFRAME = 0xFE
+ACTION_END = 0xFF
+DIGEST_SIZE = 20
+KEYFRAME_INTERVAL = 50
+
+
+def state_hash(engine):
+    """Skrót stanu końcowego: wynik, poziom, linie, liczba klocków i siatka."""
+    digest = hashlib.sha1(f"{engine.score},{engine.level},{engine.lines},{engine.pieces}:".encode())
+    digest.update(engine.board.to_bytes())
+    return digest.digest()
+
+
+class ReplayRecorder:
+    """Dopisuje do pliku wejścia gracza, kroki grawitacji i klatki kluczowe jednej gry."""
+
+    def __init__(self, path, seed, keyframe_interval=KEYFRAME_INTERVAL):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.file = open(path, 'xb')
+        self.file.write(HEADER.pack(MAGIC, VERSION, seed))
+        # Czas grawitacji czekający na zapis razem z następną akcją
+        self.pending = 0
+        self.time_ms = 0
+        self.keyframe_interval = keyframe_interval
+        self.keyframe_pieces = 0
+        self.index = []
+
+    def _write(self, delta, action):
+        if delta >= ESCAPE_DELTA:
+            self.file.write(RECORD.pack(ESCAPE_DELTA, action) + LONG_DELTA.pack(delta))
+        else:
+            self.file.write(RECORD.pack(delta, action))
+
+    def _flush_pending(self):
+        if self.pending:
+            self._write(self.pending, ACTION_NONE)
+            self.pending = 0
+
+    def gravity(self, ms):
+        """Zapisuje wywołanie engine.advance_gravity(ms)."""
+        if ms <= 0:
+            return
+        self._flush_pending()
+        self.pending = ms
+        self.time_ms += ms
+
+    def action(self, action):
+        """Zapisuje wywołanie engine.step(action)."""
+        self._write(self.pending, action)
+        self.pending = 0
+
+    def checkpoint(self, engine):
+        """Wywoływane po każdym kroku silnika; co keyframe_interval klocków zapisuje klatkę kluczową."""
+        if engine.pieces - self.keyframe_pieces < self.keyframe_interval:
+            return
+        self._flush_pending()
+        self._write(0, ACTION_KEYFRAME)
+        self.index.append((engine.pieces, self.time_ms, self.file.tell()))
+        self.file.write(KEYFRAME_TIME.pack(self.time_ms) + engine.snapshot())
+        self.keyframe_pieces = engine.pieces
+
+    def close(self, engine):
+        """Kończy zapis skrótem stanu końcowego gry i indeksem klatek kluczowych."""
+        self._flush_pending()
+        self._write(0, ACTION_END)
+        self.file.write(state_hash(engine))
+        for entry in self.index:
+            self.file.write(INDEX_ENTRY.pack(*entry))
+        self.file.write(FOOTER.pack(len(self.index), INDEX_MAGIC))
+        self.file.close()
+
+
+def read_header(data):
+    magic, version, seed = HEADER.unpack_from(data, 0)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("Not a replay file")
+    return seed
+
+
+def iter_records(data, offset=HEADER.size):
+    """Zwraca (delta, akcja, offset) kolejnych rekordów.
+       Dla KEYFRAME i END offset wskazuje dane zapisane za rekordem."""
+    size = len(data)
+    unpack = RECORD.unpack_from
+    while offset + RECORD.size <= size:
+        delta, action = unpack(data, offset)
+        offset += RECORD.size
+        if delta == ESCAPE_DELTA:
+            delta, = LONG_DELTA.unpack_from(data, offset)
+            offset += LONG_DELTA.size
+        yield delta, action, offset
+        if action == ACTION_END:
+            return
+        if action == ACTION_KEYFRAME:
+            offset += KEYFRAME_SIZE
+
+
+def replay(data, board='bit'):
+    """Odtwarza zapis w pełnym tempie silnika.
+       Zwraca (silnik, wynik weryfikacji): True/False, albo None, gdy zapis nie ma skrótu."""
+    engine = TetrisEngine(board=board, seed=read_header(data))
+    step = engine.step
+    advance = engine.advance_gravity
+    for delta, action, offset in iter_records(data):
+        if action == ACTION_END:
+            expected = bytes(data[offset:offset + DIGEST_SIZE])
+            return engine, state_hash(engine) == expected
+        if action == ACTION_KEYFRAME:
+            continue
+        if delta:
+            advance(delta)
+        if action != ACTION_NONE:
+            step(action)
+    return engine, None
+
+
+def keyframe_index(data):
+    """Lista (klocki, czas ms, offset) klatek kluczowych.
+       Czytana ze stopki; dla niedokończonych zapisów budowana skanem rekordów."""
+    if data[-len(INDEX_MAGIC):] == INDEX_MAGIC:
+        count, _ = FOOTER.unpack_from(data, len(data) - FOOTER.size)
+        start = len(data) - FOOTER.size - count * INDEX_ENTRY.size
+        return [INDEX_ENTRY.unpack_from(data, start + i * INDEX_ENTRY.size) for i in range(count)]
+    index = []
+    for _, action, offset in iter_records(data):
+        if action == ACTION_KEYFRAME and offset + KEYFRAME_SIZE <= len(data):
+            time_ms, = KEYFRAME_TIME.unpack_from(data, offset)
+            pieces = TetrisEngine.from_snapshot(data, offset + KEYFRAME_TIME.size).pieces
+            index.append((pieces, time_ms, offset))
+    return index
+
+
+def seek(data, pieces=None, time_ms=None, board='bit'):
+    """Zwraca silnik w stanie, w którym gra osiągnęła `pieces` klocków
+       albo `time_ms` ms czasu gry. Symuluje tylko odcinek od najbliższej klatki kluczowej."""
+    by_time = pieces is None
+    target = time_ms if by_time else pieces
+    index = keyframe_index(data)
+    pos = bisect.bisect_right([entry[by_time] for entry in index], target) - 1
+    if pos >= 0:
+        offset = index[pos][2]
+        elapsed, = KEYFRAME_TIME.unpack_from(data, offset)
+        engine = TetrisEngine.from_snapshot(data, offset + KEYFRAME_TIME.size, board=board)
+        offset += KEYFRAME_SIZE
+    else:
+        elapsed = 0
+        engine = TetrisEngine(board=board, seed=read_header(data))
+        offset = HEADER.size
+    for delta, action, _ in iter_records(data, offset):
+        if action == ACTION_END:
+            break
+        if (elapsed + delta > target) if by_time else (engine.pieces >= target):
+            break
+        if action == ACTION_KEYFRAME:
+            continue
+        if delta:
+            elapsed += delta
+            engine.advance_gravity(delta)
+        if action != ACTION_NONE:
+            engine.step(action)
+    return engine
+
+
+def replay_file(path, board='bit'):
+    with open(path, 'rb') as f:
+        return replay(f.read(), board)
+
+
+def main(argv=None):
+    paths = sys.argv[1:] if argv is None else argv
+    if not paths:
+        print("usage: python replay.py FILE...", file=sys.stderr)
+        return 2
+    start = time.perf_counter()
+    failed = 0
+    for path in paths:
+        engine, verified = replay_file(path)
+        status = {True: 'ok', False: 'MISMATCH', None: 'unverified'}[verified]
+        failed += verified is False
+        print(f"{path}: {status} score={engine.score} lines={engine.lines} pieces={engine.pieces}")
+    elapsed = time.perf_counter() - start
+    print(f"{len(paths)} replays in {elapsed:.2f}s")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
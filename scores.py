@@ -0,0 +1,350 @@
+"""Tabela wyników: dziennik wszystkich gier i ranking utrzymywany w pamięci.
+
+Każdy wynik trafia na koniec dziennika (plik .log, jedna linia JSON na grę),
+a w pamięci aktualizowane są tylko:
+
+* kopiec TOP_K najlepszych wyników (wstawienie O(log K)),
+* słownik najlepszych wyników graczy (rekord osobisty w O(1)).
+
+Zapis do pliku robi osobny wątek, więc add_score nie czeka na dysk. Co
+COMPACT_EVERY wyników (i przy zamknięciu) ranking jest zapisywany jako
+snapshot: plik tymczasowy, fsync i os.replace, więc przerwanie w trakcie
+zapisu zostawia poprzedni, poprawny snapshot. Po zapisaniu snapshotu
+dziennik jest obcinany do zera, więc nie rośnie bez końca, a start
+programu czyta tylko wyniki dopisane po ostatnim snapshocie. Awaria
+między os.replace a obcięciem niczego nie psuje: wyniki ujęte już
+w snapshocie (seq nie większy niż w snapshocie) są przy wczytywaniu
+pomijane. Urwana ostatnia linia dziennika (np. po awarii zasilania)
+jest obcinana.
+
+Stary format highscores.json (lista 10 słowników) jest wczytywany
+i przy pierwszym snapshocie zastępowany nowym.
+
+SqliteHighScoreManager to opcjonalny backend z pełną historią gier
+(imię, wynik, poziom, linie, czas gry, seed) w bazie sqlite3 w trybie WAL,
+z zapytaniami po graczu, zakresie dat i percentylu. Oba backendy mają ten
+sam interfejs i są dostępne w BACKENDS pod nazwami 'log' i 'sqlite'.
+"""
+import atexit
+import heapq
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+
+# Ile najlepszych wyników trzyma ranking i ile z nich pokazuje menu
+TOP_K = 100
+SHOWN = 10
+COMPACT_EVERY = 1000
+SNAPSHOT_VERSION = 1
+
+# Znacznik w kolejce zapisu: zrób snapshot
+_COMPACT = object()
+
+
+class HighScoreManager:
+    """Ranking z dziennikiem wyników; interfejs zgodny z dawnym menedżerem JSON."""
+
+    def __init__(self, filename='highscores.json', top_k=TOP_K, compact_every=COMPACT_EVERY):
+        self.filename = filename
+        self.log_path = os.path.splitext(filename)[0] + '.log'
+        self.top_k = top_k
+        self.compact_every = compact_every
+        self.lock = threading.Lock()
+        self.queue = queue.Queue()
+        self.load_high_scores()
+        self.writer = threading.Thread(target=self._write_loop, name='highscores-writer', daemon=True)
+        self.writer.start()
+        atexit.register(self.close)
+
+    def _reset(self):
+        # Kopiec (wynik, -seq, imię): na szczycie najsłabszy wynik, przy remisie najnowszy
+        self.heap = []
+        self.best = {}
+        self.seq = 0
+        self.since_snapshot = 0
+        self.view = None
+
+    def _apply(self, seq, name, score):
+        entry = (score, -seq, name)
+        if len(self.heap) < self.top_k:
+            heapq.heappush(self.heap, entry)
+        elif entry > self.heap[0]:
+            heapq.heapreplace(self.heap, entry)
+        if score > self.best.get(name, score - 1):
+            self.best[name] = score
+        self.seq = max(self.seq, seq)
+        self.view = None
+
+    def load_high_scores(self):
+        """Wczytuje snapshot i wyniki dopisane do dziennika po nim."""
+        with self.lock:
+            self._reset()
+            offset = 0
+            if os.path.exists(self.filename):
+                with open(self.filename, 'r') as f:
+                    data = json.load(f)
+                if isinstance(data, list):
+                    # Dawny format: lista najlepszych wyników bez dziennika
+                    for entry in data:
+                        self.seq += 1
+                        self._apply(self.seq, entry['name'], entry['score'])
+                    self.since_snapshot = len(data)
+                else:
+                    self.seq = data['seq']
+                    offset = data['log_offset']
+                    self.best = data['best']
+                    self.heap = [(score, -seq, name) for score, seq, name in data['top']]
+                    heapq.heapify(self.heap)
+            self._read_log(offset, self.seq)
+
+    def _read_log(self, offset, snapshot_seq):
+        if not os.path.exists(self.log_path):
+            return
+        with open(self.log_path, 'rb+') as f:
+            f.seek(min(offset, os.fstat(f.fileno()).st_size))
+            while True:
+                start = f.tell()
+                line = f.readline()
+                if not line:
+                    break
+                try:
+                    if not line.endswith(b'\n'):
+                        raise ValueError("truncated")
+                    entry = json.loads(line)
+                except ValueError:
+                    # Urwany zapis na końcu dziennika - kolejne wyniki zaczną się od tego miejsca
+                    f.truncate(start)
+                    break
+                # Wyniki zapisane po zrobieniu snapshotu, ale już w nim ujęte, są pomijane
+                if entry['seq'] > snapshot_seq:
+                    self._apply(entry['seq'], entry['name'], entry['score'])
+                    self.since_snapshot += 1
+
+    @property
+    def high_scores(self):
+        """Najlepsze wyniki w kolejności malejącej, jako lista {'name', 'score'}."""
+        view = self.view
+        if view is None:
+            view = self.view = self.top(SHOWN)
+        return view
+
+    def top(self, count=SHOWN):
+        """Do `count` najlepszych wyników (najwyżej top_k)."""
+        with self.lock:
+            entries = heapq.nlargest(count, self.heap)
+        return [{'name': name, 'score': score} for score, _, name in entries]
+
+    def page(self, number, size=SHOWN):
+        """Strona rankingu numer `number` (od 0); ranking obejmuje top_k wyników."""
+        return self.top((number + 1) * size)[number * size:]
+
+    def personal_best(self, name):
+        """Najlepszy wynik gracza albo None."""
+        return self.best.get(name)
+
+    def add_score(self, name, score, **details):
+        """Dodaje wynik do rankingu i kolejki zapisu. Dodatkowe pola (np. level, seed)
+           trafiają tylko do dziennika."""
+        with self.lock:
+            self.seq += 1
+            self._apply(self.seq, name, score)
+            entry = dict(details, seq=self.seq, name=name, score=score, time=time.time())
+            self.queue.put((json.dumps(entry) + '\n').encode())
+            self.since_snapshot += 1
+            if self.since_snapshot >= self.compact_every:
+                self.since_snapshot = 0
+                self.queue.put(_COMPACT)
+
+    def save_high_scores(self):
+        """Zleca zapis snapshotu w wątku zapisu."""
+        self.queue.put(_COMPACT)
+
+    def close(self):
+        """Zapisuje zaległe wyniki i końcowy snapshot, po czym kończy wątek zapisu."""
+        if self.writer.is_alive():
+            self.queue.put(None)
+            self.writer.join()
+
+    def _write_loop(self):
+        with open(self.log_path, 'ab') as log:
+            running = True
+            while running:
+                batch = [self.queue.get()]
+                # Wszystko, co czeka w kolejce, zapisujemy jednym write i jednym fsync
+                while True:
+                    try:
+                        batch.append(self.queue.get_nowait())
+                    except queue.Empty:
+                        break
+                lines = [item for item in batch if isinstance(item, bytes)]
+                if lines:
+                    log.write(b''.join(lines))
+                    log.flush()
+                    os.fsync(log.fileno())
+                running = None not in batch
+                if _COMPACT in batch or not running:
+                    self._write_snapshot(log)
+
+    def _write_snapshot(self, log):
+        # Cały dziennik jest już w pamięci (add_score stosuje wynik przed kolejką
+        # zapisu), więc snapshot go obejmuje i dziennik można potem obciąć.
+        # Snapshot wskazuje początek dziennika: jeśli obcięcie nie nastąpi,
+        # stare wpisy zostaną pominięte przy wczytywaniu po seq.
+        with self.lock:
+            data = {
+                'version': SNAPSHOT_VERSION,
+                'seq': self.seq,
+                'log_offset': 0,
+                'top': [[score, -neg_seq, name] for score, neg_seq, name in self.heap],
+                'best': dict(self.best),
+            }
+            self.since_snapshot = 0
+        tmp_path = self.filename + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.filename)
+        log.truncate(0)
+        log.flush()
+        os.fsync(log.fileno())
+
+
+class SqliteHighScoreManager:
+    """Pełna historia gier w sqlite3; zapis partiami w osobnym wątku.
+
+    Odczyty idą przez połączenie wątku, który utworzył menedżera, zapisy
+    przez osobne połączenie wątku zapisu. Dzięki WAL odczyty nie czekają
+    na zapis, a widzą wyniki od momentu zatwierdzenia partii."""
+
+    SCHEMA = (
+        """CREATE TABLE IF NOT EXISTS games (
+               id INTEGER PRIMARY KEY,
+               name TEXT NOT NULL,
+               score INTEGER NOT NULL,
+               level INTEGER,
+               lines INTEGER,
+               duration REAL,
+               seed INTEGER,
+               played_at REAL NOT NULL
+           )""",
+        "CREATE INDEX IF NOT EXISTS games_score ON games (score DESC, id)",
+        "CREATE INDEX IF NOT EXISTS games_name_score ON games (name, score DESC)",
+        "CREATE INDEX IF NOT EXISTS games_name_played_at ON games (name, played_at)",
+        "CREATE INDEX IF NOT EXISTS games_played_at ON games (played_at)",
+    )
+    COLUMNS = ('name', 'score', 'level', 'lines', 'duration', 'seed', 'played_at')
+    INSERT = f"INSERT INTO games ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))})"
+
+    def __init__(self, filename='highscores.db'):
+        self.filename = filename
+        self.queue = queue.Queue()
+        self.conn = self._connect()
+        for statement in self.SCHEMA:
+            self.conn.execute(statement)
+        self.conn.commit()
+        self.writer = threading.Thread(target=self._write_loop, name='highscores-writer', daemon=True)
+        self.writer.start()
+        atexit.register(self.close)
+
+    def _connect(self):
+        conn = sqlite3.connect(self.filename)
+        conn.execute("PRAGMA journal_mode=WAL")
+        # W trybie WAL synchronous=NORMAL nie grozi uszkodzeniem bazy, najwyżej utratą ostatniej partii
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def _rows(self, sql, params=()):
+        return [dict(zip(self.COLUMNS, row)) for row in self.conn.execute(sql, params)]
+
+    def load_high_scores(self):
+        """Zgodność z HighScoreManager: dane są czytane z bazy przy każdym zapytaniu."""
+
+    @property
+    def high_scores(self):
+        return self.top(SHOWN)
+
+    def top(self, count=SHOWN):
+        return self.page(0, count)
+
+    def page(self, number, size=SHOWN):
+        """Strona rankingu numer `number` (od 0), czytana z indeksu games_score."""
+        return self._rows(f"SELECT {', '.join(self.COLUMNS)} FROM games "
+                          "ORDER BY score DESC, id LIMIT ? OFFSET ?", (size, number * size))
+
+    def personal_best(self, name):
+        row = self.conn.execute("SELECT MAX(score) FROM games WHERE name = ?", (name,)).fetchone()
+        return row[0]
+
+    def history(self, name, limit=100):
+        """Ostatnie gry gracza, od najnowszej."""
+        return self._rows(f"SELECT {', '.join(self.COLUMNS)} FROM games WHERE name = ? "
+                          "ORDER BY played_at DESC LIMIT ?", (name, limit))
+
+    def between(self, start, end, limit=100):
+        """Najlepsze gry rozegrane w przedziale [start, end) (znaczniki time.time())."""
+        return self._rows(f"SELECT {', '.join(self.COLUMNS)} FROM games "
+                          "WHERE played_at >= ? AND played_at < ? "
+                          "ORDER BY score DESC LIMIT ?", (start, end, limit))
+
+    def score_at_percentile(self, p):
+        """Wynik, od którego p procent gier jest nie lepszych (np. p=90), albo None."""
+        count, = self.conn.execute("SELECT COUNT(*) FROM games").fetchone()
+        if not count:
+            return None
+        offset = min(count - 1, max(0, round(p / 100 * (count - 1))))
+        row = self.conn.execute("SELECT score FROM games ORDER BY score LIMIT 1 OFFSET ?", (offset,)).fetchone()
+        return row[0]
+
+    def percentile_of(self, score):
+        """Procent gier z wynikiem niższym niż `score`."""
+        count, = self.conn.execute("SELECT COUNT(*) FROM games").fetchone()
+        if not count:
+            return 0.0
+        # Zakres po indeksie games_score zamiast warunku liczonego dla każdego wiersza
+        below, = self.conn.execute("SELECT COUNT(*) FROM games WHERE score < ?", (score,)).fetchone()
+        return 100 * below / count
+
+    def add_score(self, name, score, level=None, lines=None, duration=None, seed=None, **details):
+        """Dodaje grę do kolejki zapisu; nie czeka na dysk."""
+        self.queue.put((name, score, level, lines, duration, seed, time.time()))
+
+    def save_high_scores(self):
+        """Czeka, aż wątek zapisu zatwierdzi wszystkie wyniki z kolejki."""
+        self.queue.join()
+
+    def close(self):
+        if self.writer.is_alive():
+            self.queue.put(None)
+            self.writer.join()
+            self.conn.close()
+
+    def _write_loop(self):
+        conn = self._connect()
+        running = True
+        while running:
+            batch = [self.queue.get()]
+            while True:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            rows = [item for item in batch if item is not None]
+            running = len(rows) == len(batch)
+            if rows:
+                # Cała partia w jednej transakcji
+                with conn:
+                    conn.executemany(self.INSERT, rows)
+            for _ in batch:
+                self.queue.task_done()
+        conn.close()
+
+
+# Dostępne backendy tabeli wyników, wybierane nazwą we frontendach
+BACKENDS = {
+    'log': HighScoreManager,
+    'sqlite': SqliteHighScoreManager,
+}
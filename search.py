@@ -0,0 +1,252 @@
+"""Przeszukiwanie z wyprzedzeniem (bieżący klocek + podgląd) z opcjonalną tablicą transpozycji.
+
+Węzeł przeszukiwania to plansza i kolejka klocków, które zostały jeszcze
+do osadzenia, z pierwszym klockiem na pozycji startowej. Jego klucz to
+skrót Zobrista planszy (board.hash / board.rows_hash, aktualizowany
+przyrostowo przy osadzaniu i usuwaniu linii) XOR klucze kształtów kolejki
+na kolejnych pozycjach (QUEUE_KEYS, od pozycji 0). Wpis pamięta też
+głębokość, czyli długość tej kolejki.
+
+Gdy klocek zszedł już z pozycji startowej (ponowna decyzja po grawitacji),
+gracz bierze wynik korzenia zapamiętany przy decyzji na pozycji startowej,
+o ile jego cel jest nadal osiągalny; w przeciwnym razie liczy korzeń od
+nowa. Ten jeden zapamiętany korzeń działa także bez tablicy.
+
+Tablica transpozycji jest domyślnie wyłączona: w grze bota te same węzły
+prawie się nie powtarzają (trafienia 0-2.5%), a przy previews=2 koszt
+kluczy i zapisów przewyższa zysk. Włącza się ją jawnie, przekazując
+``table=TranspositionTable(...)`` albo ``--memory-mb`` w CLI.
+
+TranspositionTable ma stałą liczbę slotów wyliczoną z limitu pamięci
+(0 wyłącza tablicę) i jedną z polityk zastępowania:
+    'always'  nowy wpis zawsze wypiera stary,
+    'depth'   wpis z głębszego przeszukiwania nie jest wypierany przez płytszy.
+stats() podaje liczbę zapytań, trafień, zapisów, wyparć i odrzuceń.
+
+Strojenie rozmiaru tablicy:
+    python search.py --games 5 --memory-mb 4 --policy depth --gravity-ms 16
+"""
+import argparse
+import random
+import sys
+import time
+
+from board import GRID_WIDTH, PIECE_MASKS, ROW_HASH, SHAPES, column_heights, rows_hash
+from bot import (
+    CANONICAL_ROTATION, POPCOUNT, BotPlayer, board_rows, find_path, free_positions, placement_score,
+    placements, place_rows,
+)
+from engine import TetrisEngine
+
+# Przybliżony koszt jednego wpisu w CPythonie (klucz, głębokość, wynik i ruch)
+ENTRY_BYTES = 160
+DEFAULT_MEMORY = 16 * 1024 * 1024
+POLICIES = ('always', 'depth')
+MAX_QUEUE = 8
+
+
+def _build_queue_keys():
+    rng = random.Random(0x5EED + 2)
+    return [{shape: rng.getrandbits(64) for shape in SHAPES} for _ in range(MAX_QUEUE)]
+
+
+# QUEUE_KEYS[pozycja w kolejce][kształt]
+QUEUE_KEYS = _build_queue_keys()
+SPAWN_X = {shape: GRID_WIDTH // 2 - len(rotations[0][0]) // 2 for shape, rotations in SHAPES.items()}
+
+
+def queue_key(queue):
+    key = 0
+    for i, shape in enumerate(queue):
+        key ^= QUEUE_KEYS[i][shape]
+    return key
+
+
+class TranspositionTable:
+    """Tablica wyników węzłów o ograniczonym rozmiarze, adresowana młodszymi bitami klucza."""
+
+    def __init__(self, memory_bytes=DEFAULT_MEMORY, policy='depth'):
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown replacement policy: {policy}")
+        slots = 1 if memory_bytes >= ENTRY_BYTES else 0
+        while slots and slots * 2 * ENTRY_BYTES <= memory_bytes:
+            slots *= 2
+        self.size = slots
+        self.mask = max(slots - 1, 0)
+        self.policy = policy
+        self.keys = [None] * slots
+        self.depths = [0] * slots
+        self.values = [None] * slots
+        self.lookups = self.hits = self.stores = self.replaced = self.rejected = 0
+
+    def get(self, key, depth):
+        """Wynik zapisany dla klucza z przeszukiwania co najmniej tak głębokiego albo None."""
+        self.lookups += 1
+        if not self.size:
+            return None
+        i = key & self.mask
+        if self.keys[i] == key and self.depths[i] >= depth:
+            self.hits += 1
+            return self.values[i]
+        return None
+
+    def put(self, key, depth, value):
+        if not self.size:
+            return
+        i = key & self.mask
+        old = self.keys[i]
+        if old is not None and old != key:
+            if self.policy == 'depth' and self.depths[i] > depth:
+                self.rejected += 1
+                return
+            self.replaced += 1
+        self.keys[i] = key
+        self.depths[i] = depth
+        self.values[i] = value
+        self.stores += 1
+
+    def clear(self):
+        self.keys = [None] * self.size
+        self.depths = [0] * self.size
+        self.values = [None] * self.size
+
+    @property
+    def hit_rate(self):
+        return self.hits / self.lookups if self.lookups else 0.0
+
+    def stats(self):
+        return {
+            'slots': self.size,
+            'policy': self.policy,
+            'lookups': self.lookups,
+            'hits': self.hits,
+            'hit_rate': self.hit_rate,
+            'stores': self.stores,
+            'replaced': self.replaced,
+            'rejected': self.rejected,
+        }
+
+
+class LookaheadPlayer(BotPlayer):
+    """Bot oceniający pary ruchów: bieżący klocek i `previews` kolejnych z podglądu.
+
+    Gra zna tylko next_piece, więc domyślnie previews=1; większe wartości
+    podglądają też kolejne kształty z worka silnika. Bez ``table`` gracz
+    nie używa tablicy transpozycji (TranspositionTable(0))."""
+
+    def __init__(self, weights=None, previews=1, table=None):
+        super().__init__(weights)
+        self.previews = previews
+        self.table = table if table is not None else TranspositionTable(0)
+        # (klucz węzła, głębokość, wynik) ostatniego korzenia z pozycji startowej
+        self.root = None
+        self.root_hits = 0
+
+    def upcoming(self, engine):
+        queue = [engine.next_piece] + engine.bag[::-1]
+        return tuple(queue[:self.previews])
+
+    def _node(self, rows, key, queue):
+        """Najlepsza (wartość, pozycja) dla pierwszego klocka kolejki, startującego z pozycji początkowej."""
+        depth = len(queue)
+        node = key ^ queue_key(queue)
+        cached = self.table.get(node, depth)
+        if cached is not None:
+            return cached
+        shape = queue[0]
+        candidates, _ = placements(rows, shape, 0, SPAWN_X[shape], 0)
+        best = self._best(rows, key, shape, candidates, queue[1:])
+        self.table.put(node, depth, best)
+        return best
+
+    def _best(self, rows, key, shape, candidates, rest):
+        weights = self.weights
+        best = (float('-inf'), None)
+        if not rest:
+            # Liście oceniamy z wysokości kolumn liczonych raz dla całego węzła
+            heights = column_heights(rows)
+            cells = sum(POPCOUNT[row] for row in rows)
+        for candidate in candidates:
+            if rest:
+                child, lines = place_rows(rows, shape, *candidate)
+                if lines:
+                    child_key = rows_hash(child)
+                else:
+                    r, x, y = candidate
+                    child_key = key
+                    for i, mask in enumerate(PIECE_MASKS[shape][r][x]):
+                        child_key ^= ROW_HASH[y + i][mask]
+                value = weights['lines'] * lines + self._node(child, child_key, rest)[0]
+            else:
+                value = placement_score(rows, heights, cells, shape, *candidate, weights)
+            if best[1] is None or value > best[0]:
+                best = (value, candidate)
+        return best
+
+    def decide(self, engine):
+        piece = engine.current_piece
+        shape = piece['shape']
+        rows = board_rows(engine.board)
+        start = (piece['rotation'], piece['x'], piece['y'])
+        queue = (shape,) + self.upcoming(engine)
+        key = engine.board.hash
+        node = key ^ queue_key(queue)
+        self.decisions += 1
+        if start == (0, SPAWN_X[shape], 0):
+            best = self._node(rows, key, queue)
+            self.root = (node, len(queue), best)
+            target = best[1]
+            free = free_positions(rows, shape)
+        else:
+            candidates, free = placements(rows, shape, *start)
+            canonical = CANONICAL_ROTATION[shape]
+            reached = {(canonical[r], x, y): (r, x, y) for r, x, y in candidates}
+            # Najlepszy cel spod pozycji startowej jest najlepszy też wśród osiągalnych stąd
+            if self.root is not None and self.root[:2] == (node, len(queue)):
+                self.root_hits += 1
+                cached = self.root[2]
+            else:
+                cached = self.table.get(node, len(queue))
+            target = None
+            if cached is not None and cached[1] is not None:
+                r, x, y = cached[1]
+                target = reached.get((canonical[r], x, y))
+            if target is None:
+                # Wyniku z ograniczonego zbioru celów nie zapisujemy pod kluczem węzła
+                _, target = self._best(rows, key, shape, candidates, queue[1:])
+        if target is None:
+            return None, find_path(free, start, start)
+        return target, find_path(free, start, target)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Lookahead bot with an optional transposition table.")
+    parser.add_argument('--games', type=int, default=3)
+    parser.add_argument('--max-pieces', type=int, default=500)
+    parser.add_argument('--previews', type=int, default=1)
+    parser.add_argument('--memory-mb', type=float, default=0,
+                        help=f"transposition table size, 0 = off (try {DEFAULT_MEMORY // 2 ** 20})")
+    parser.add_argument('--policy', choices=POLICIES, default='depth')
+    parser.add_argument('--gravity-ms', type=int, default=0, help="gravity after each action, 16 = one frame")
+    args = parser.parse_args(argv)
+
+    table = TranspositionTable(int(args.memory_mb * 2 ** 20), args.policy)
+    player = LookaheadPlayer(previews=args.previews, table=table)
+    start = time.perf_counter()
+    for seed in range(args.games):
+        engine = TetrisEngine(board='bit', seed=seed)
+        while not engine.game_over and engine.pieces < args.max_pieces:
+            engine.step(player(engine))
+            if args.gravity_ms:
+                engine.advance_gravity(args.gravity_ms)
+        print(f"seed {seed}: pieces={engine.pieces} lines={engine.lines}")
+    elapsed = time.perf_counter() - start
+    print(f"{player.decisions} decisions in {elapsed:.2f}s ({1000 * elapsed / player.decisions:.2f} ms/decision)")
+    print(f"  root_hits {player.root_hits}")
+    for name, value in table.stats().items():
+        print(f"  {name:9s} {value:.3f}" if isinstance(value, float) else f"  {name:9s} {value}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,647 @@
+"""Autorytatywny serwer gry wieloosobowej (asyncio, bez pygame) i bot-klient do testów obciążenia.
+
+Serwer prowadzi setki meczów w jednym procesie. Każdy mecz ma własne
+zadanie asyncio, które co TICK_MS wykonuje jeden krok logiki wszystkich
+graczy na silnikach ``TetrisEngine``: akcje zebrane od klienta od
+poprzedniego kroku są wykonywane paczką (najwyżej INPUTS_PER_TICK na
+krok), potem grawitacja. Czas gry płynie w stałych krokach, więc
+spóźniony krok niczego w zasadach nie zmienia; przy zaległości większej
+niż MAX_LAG_TICKS zaległe kroki są pomijane zamiast nadrabiane serią.
+
+Usunięte linie zamieniają się w śmieci (GARBAGE_LINES) wysyłane
+przeciwnikowi. Śmieci najpierw znoszą śmieci oczekujące u atakującego,
+a u celu są wsuwane od dołu przy pierwszym osadzeniu klocka bez linii.
+
+Protokół: JSON, jedna wiadomość w wierszu.
+    klient -> serwer  {"type": "join", "name": ...}
+                      {"type": "input", "actions": [1, 1, 4, 5]}
+                      {"type": "spectate", "match": 3, "player": 0}
+                      {"type": "resync"}
+    serwer -> klient  {"type": "start", "match", "player", "players", "seed", "tick_ms"}
+                      {"type": "state", "tick", "pieces", "incoming", "snapshot"}
+                      {"type": "garbage", "lines", "from"}
+                      {"type": "over", "tick", "place"}
+                      {"type": "end", "tick", "winner", "scores"[, "error"]}
+                      {"type": "error", "message"}
+``snapshot`` to engine.snapshot() w base64. Po "spectate" serwer wysyła
+już tylko binarne ramki strumienia widza (spectate.py): klatkę kluczową,
+potem delty; "resync" prosi o nową klatkę kluczową po wykrytej luce.
+Błędne wiadomości widza są od tej chwili pomijane bez odpowiedzi.
+Wyjątek w kroku meczu jest wypisywany na stderr i kończy mecz
+wiadomością "end" z polem "error" dla wszystkich graczy.
+
+Backpressure: każdy klient ma własną kolejkę wyjściową (Outbox) i zadanie
+piszące, które czeka w writer.drain(). Krok meczu nigdy nie czeka na
+klienta. Stan gracza jest nadpisywany (wolny klient dostaje tylko
+najnowszy), a zdarzenia są kolejkowane; klient, któremu uzbiera się
+ponad OUTBOX_LIMIT zdarzeń, jest rozłączany i przegrywa mecz. Wolny widz
+nie jest rozłączany: zaległe ramki są odrzucane i zastępuje je jedna
+klatka kluczowa. Nadmiar akcji ponad MAX_PENDING_INPUTS jest odrzucany.
+
+Użycie:
+    python server.py serve --port 7777 --players 2
+    python server.py bots --port 7777 --count 100 --seconds 60
+    python server.py load --matches 200 --players 2 --seconds 10 --procs 4
+Tryb load uruchamia serwer i boty (w osobnych procesach) na jednej
+maszynie przez loopback i wypisuje przepustowość (mecze x kroki/s)
+oraz percentyle czasu i opóźnienia kroku.
+"""
+import argparse
+import asyncio
+import base64
+import json
+import multiprocessing
+import random
+import sys
+import traceback
+from collections import deque
+
+from bot import BotPlayer
+from engine import ACTIONS, GRID_WIDTH, GRID_HEIGHT, TetrisEngine
+from spectate import Publisher
+from timing import RollingHistogram
+
+HOST = '127.0.0.1'
+PORT = 7777
+
+# Krok logiki meczu (ms, liczba całkowita jak w advance_gravity) i liczba graczy w meczu
+TICK_MS = 16
+PLAYERS = 2
+
+# Akcje gracza wykonywane w jednym kroku i limit akcji czekających na wykonanie
+INPUTS_PER_TICK = 4
+MAX_PENDING_INPUTS = 32
+
+# Zdarzenia czekające na wysłanie, po których klient jest uznawany za zbyt wolnego
+OUTBOX_LIMIT = 64
+
+# Zaległość (w krokach), po której zadanie meczu przestaje nadrabiać kroki
+MAX_LAG_TICKS = 5
+
+# Wiersze śmieci wysyłane przeciwnikowi za linie usunięte jednym klockiem
+GARBAGE_LINES = {0: 0, 1: 0, 2: 1, 3: 2, 4: 4}
+
+# Czas "namysłu" bota przed wysłaniem ruchów (ms)
+BOT_THINK_MS = 100
+
+
+def _bytes_to_text(value):
+    if isinstance(value, bytes):
+        return base64.b64encode(value).decode('ascii')
+    raise TypeError(f"Cannot encode {type(value).__name__}")
+
+
+def encode(message):
+    """Wiadomość jako jeden wiersz JSON (bajty zapisane w base64)."""
+    return json.dumps(message, separators=(',', ':'), default=_bytes_to_text).encode() + b'\n'
+
+
+class Outbox:
+    """Kolejka wiadomości do jednego klienta z zadaniem piszącym.
+
+    send() dodaje zdarzenie, set_state() nadpisuje oczekujący stan gracza.
+    Obie metody nie blokują; kodowanie JSON odbywa się dopiero w zadaniu
+    piszącym, więc stany nadpisane przed wysłaniem nic nie kosztują.
+    Zdarzenia typu bytes są wysyłane bez zmian (ramki strumienia widza).
+
+    Po przepełnieniu kolejki wywoływane jest overflow(), a bez niego
+    połączenie jest zamykane."""
+
+    def __init__(self, writer, limit=OUTBOX_LIMIT):
+        self.writer = writer
+        self.limit = limit
+        self.events = deque()
+        self.state = None
+        self.ready = asyncio.Event()
+        self.overflow = None
+        self.closing = False
+        self.closed = False
+        self.too_slow = False
+        self.coalesced = 0
+        self.dropped = 0
+
+    def send(self, message):
+        if self.closed:
+            return
+        if len(self.events) >= self.limit:
+            if self.overflow is None:
+                self.too_slow = True
+                self.close()
+                return
+            self.dropped += len(self.events)
+            self.events.clear()
+            self.overflow()
+            return
+        self.events.append(message)
+        self.ready.set()
+
+    def set_state(self, message):
+        if self.closed:
+            return
+        if self.state is not None:
+            self.coalesced += 1
+        self.state = message
+        self.ready.set()
+
+    def finish(self):
+        """Zamyka połączenie po wysłaniu reszty kolejki."""
+        self.closing = True
+        self.ready.set()
+
+    def close(self):
+        """Zamyka połączenie bez wysyłania reszty kolejki."""
+        if not self.closed:
+            self.closed = True
+            self.writer.transport.abort()
+            self.ready.set()
+
+    async def run(self):
+        try:
+            while not self.closed:
+                await self.ready.wait()
+                self.ready.clear()
+                chunks = [message if isinstance(message, bytes) else encode(message)
+                          for message in self.events]
+                self.events.clear()
+                if self.state is not None:
+                    chunks.append(encode(self.state))
+                    self.state = None
+                if chunks and not self.closed:
+                    self.writer.write(b''.join(chunks))
+                    await self.writer.drain()
+                if self.closing and not self.events and self.state is None:
+                    self.closed = True
+                    self.writer.close()
+        except ConnectionError:
+            self.closed = True
+
+
+class Player:
+    """Gracz w meczu: silnik, akcje czekające na krok i śmieci do przyjęcia."""
+
+    def __init__(self, name, outbox):
+        self.name = name
+        self.outbox = outbox
+        self.engine = None
+        self.match = None
+        self.index = 0
+        self.inputs = deque()
+        self.incoming = 0
+        self.alive = True
+        self.connected = True
+        self.done = False
+        self.dropped_inputs = 0
+        # Ostatnio wysłany stan (skrót Zobrista, wynik, śmieci, koniec gry)
+        self.sent = None
+
+    def push(self, actions):
+        for action in actions:
+            if action not in ACTIONS:
+                continue
+            if len(self.inputs) >= MAX_PENDING_INPUTS:
+                self.dropped_inputs += 1
+            else:
+                self.inputs.append(action)
+
+    def publish(self, tick):
+        """Wysyła stan gracza, jeśli zmienił się od ostatniego wysłanego."""
+        engine = self.engine
+        key = (engine.zobrist_key(), engine.score, self.incoming, engine.game_over)
+        if key != self.sent:
+            self.sent = key
+            self.outbox.set_state({
+                'type': 'state', 'tick': tick, 'pieces': engine.pieces,
+                'incoming': self.incoming, 'snapshot': engine.snapshot(),
+            })
+
+
+class Match:
+    """Jeden mecz: gracze z tym samym seedem (ta sama kolejność klocków) i zadanie kroków."""
+
+    def __init__(self, server, match_id, players, seed):
+        self.server = server
+        self.id = match_id
+        self.players = players
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.tick_ms = server.tick_ms
+        self.ticks = 0
+        self.finished = False
+        # Strumienie widzów: indeks gracza -> Publisher, tworzone przy pierwszym widzu
+        self.feeds = {}
+        self.spectators = []
+        for i, player in enumerate(players):
+            player.match = self
+            player.index = i
+            player.engine = TetrisEngine(board='bit', seed=seed)
+        # Mecz jednoosobowy trwa do końca gry, wieloosobowy do ostatniego gracza
+        self.last_standing = 1 if len(players) > 1 else 0
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        server = self.server
+        tick_s = self.tick_ms / 1000
+        for player in self.players:
+            player.outbox.send({
+                'type': 'start', 'match': self.id, 'player': player.index,
+                'players': len(self.players), 'seed': self.seed, 'tick_ms': self.tick_ms,
+            })
+            player.publish(0)
+        deadline = loop.time()
+        try:
+            while not self.finished:
+                deadline += tick_s
+                delay = deadline - loop.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                else:
+                    if -delay > MAX_LAG_TICKS * tick_s:
+                        skipped = int(-delay / tick_s)
+                        server.skipped_ticks += skipped
+                        deadline += skipped * tick_s
+                    # Oddajemy sterowanie, żeby spóźniony mecz nie zagłodził pozostałych
+                    await asyncio.sleep(0)
+                started = loop.time()
+                server.tick_lag.add(max(0.0, started - deadline) * 1000)
+                try:
+                    self.tick()
+                except Exception:
+                    print(f"match {self.id}: tick {self.ticks} failed", file=sys.stderr)
+                    traceback.print_exc()
+                    self.end(error='internal error')
+                    break
+                server.tick_time.add((loop.time() - started) * 1000)
+                server.ticks += 1
+        finally:
+            server.finish(self)
+
+    def tick(self):
+        """Jeden krok logiki: paczka akcji każdego gracza, grawitacja, śmieci i wysłanie stanów."""
+        self.ticks += 1
+        for player in self.players:
+            if not player.alive:
+                continue
+            engine = player.engine
+            inputs = player.inputs
+            for _ in range(min(len(inputs), INPUTS_PER_TICK)):
+                pieces = engine.pieces
+                lines = engine.step(inputs.popleft())
+                if engine.pieces != pieces:
+                    self.locked(player, lines)
+            pieces = engine.pieces
+            lines = engine.lines
+            engine.advance_gravity(self.tick_ms)
+            if engine.pieces != pieces:
+                self.locked(player, engine.lines - lines)
+            if engine.game_over:
+                self.knock_out(player)
+        for player in self.players:
+            if player.connected:
+                player.publish(self.ticks)
+        for feed in self.feeds.values():
+            feed.publish()
+        max_ticks = self.server.max_ticks
+        if self.alive() <= self.last_standing or (max_ticks and self.ticks >= max_ticks):
+            self.end()
+
+    def watch(self, index, outbox):
+        """Zapisuje widza na strumień gracza `index`; wolny widz dostaje klatkę kluczową zamiast zaległych delt."""
+        feed = self.feeds.get(index)
+        if feed is None:
+            feed = self.feeds[index] = Publisher(self.players[index].engine)
+        outbox.overflow = lambda: feed.resync(outbox.send)
+        feed.subscribe(outbox.send)
+        self.spectators.append(outbox)
+        return feed
+
+    def alive(self):
+        return sum(1 for player in self.players if player.alive)
+
+    def locked(self, player, lines):
+        """Po osadzeniu klocka: atak śmieciami albo przyjęcie oczekujących śmieci."""
+        attack = GARBAGE_LINES.get(lines, 0)
+        if player.incoming:
+            cancelled = min(attack, player.incoming)
+            attack -= cancelled
+            player.incoming -= cancelled
+            if not lines and player.incoming:
+                player.engine.add_garbage(player.incoming, self.rng.randrange(GRID_WIDTH))
+                player.incoming = 0
+        if attack:
+            targets = [other for other in self.players if other.alive and other is not player]
+            if targets:
+                target = self.rng.choice(targets)
+                target.incoming = min(GRID_HEIGHT, target.incoming + attack)
+                target.outbox.send({'type': 'garbage', 'lines': attack, 'from': player.index})
+
+    def knock_out(self, player):
+        if not player.alive:
+            return
+        player.alive = False
+        player.outbox.send({'type': 'over', 'tick': self.ticks, 'place': self.alive() + 1})
+
+    def end(self, error=None):
+        """Kończy mecz; po błędzie (error) bez zwycięzcy."""
+        self.finished = True
+        alive = [player.index for player in self.players if player.alive]
+        message = {
+            'type': 'end', 'tick': self.ticks,
+            'winner': alive[0] if len(alive) == 1 and error is None else None,
+            'scores': [player.engine.score for player in self.players],
+        }
+        if error is not None:
+            message['error'] = error
+        for player in self.players:
+            player.done = True
+            player.outbox.send(message)
+        for outbox in self.spectators:
+            outbox.finish()
+
+
+class GameServer:
+    """Kojarzenie graczy w mecze, połączenia klientów i statystyki kroków."""
+
+    def __init__(self, players=PLAYERS, tick_ms=TICK_MS, max_ticks=0, seed=None):
+        self.players_per_match = players
+        self.tick_ms = tick_ms
+        self.max_ticks = max_ticks
+        self.rng = random.Random(seed)
+        self.waiting = []
+        self.matches = {}
+        self.tasks = set()
+        self.clients = set()
+        self.next_id = 0
+        self.server = None
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.tick_time = RollingHistogram(bin_ms=0.01)
+        self.tick_lag = RollingHistogram()
+        self.ticks = 0
+        self.skipped_ticks = 0
+        self.finished = 0
+        self.coalesced = 0
+        self.dropped_inputs = 0
+        self.slow_clients = 0
+
+    async def start(self, host=HOST, port=PORT):
+        self.server = await asyncio.start_server(self.handle_client, host, port)
+        return self.server.sockets[0].getsockname()[1]
+
+    async def close(self):
+        if self.server is not None:
+            self.server.close()
+        for task in list(self.tasks):
+            task.cancel()
+        # Zerwane połączenia kończą obsługę klientów bez anulowania ich zadań
+        for outbox in list(self.clients):
+            outbox.close()
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+        while self.clients:
+            await asyncio.sleep(0.01)
+
+    def join(self, player):
+        self.waiting.append(player)
+        if len(self.waiting) >= self.players_per_match:
+            players = self.waiting[:self.players_per_match]
+            del self.waiting[:self.players_per_match]
+            match = Match(self, self.next_id, players, self.rng.randrange(2 ** 63))
+            self.next_id += 1
+            self.matches[match.id] = match
+            task = asyncio.create_task(match.run())
+            self.tasks.add(task)
+            task.add_done_callback(self.tasks.discard)
+
+    def leave(self, player):
+        """Rozłączony gracz opuszcza kolejkę albo przegrywa trwający mecz."""
+        player.connected = False
+        self.coalesced += player.outbox.coalesced
+        self.dropped_inputs += player.dropped_inputs
+        if player.outbox.too_slow:
+            self.slow_clients += 1
+        if player in self.waiting:
+            self.waiting.remove(player)
+        elif player.match is not None and not player.done:
+            player.match.knock_out(player)
+
+    def finish(self, match):
+        self.matches.pop(match.id, None)
+        self.finished += 1
+
+    async def handle_client(self, reader, writer):
+        outbox = Outbox(writer)
+        self.clients.add(outbox)
+        sender = asyncio.create_task(outbox.run())
+        player = None
+        feed = None
+
+        def error(message):
+            # Odpowiedź JSON rozbiłaby binarny strumień widza
+            if feed is None:
+                outbox.send({'type': 'error', 'message': message})
+
+        try:
+            while not outbox.closed:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    message = json.loads(line)
+                    kind = message['type']
+                except (ValueError, TypeError, KeyError):
+                    error('invalid message')
+                    continue
+                if kind == 'input' and player is not None and not player.done:
+                    player.push(message.get('actions', ()))
+                elif kind == 'join' and feed is None and (player is None or player.done):
+                    if player is not None:
+                        self.coalesced += outbox.coalesced
+                        self.dropped_inputs += player.dropped_inputs
+                        outbox.coalesced = 0
+                    player = Player(str(message.get('name', '')), outbox)
+                    self.join(player)
+                elif kind == 'spectate' and player is None and feed is None:
+                    match = self.matches.get(message.get('match'))
+                    index = message.get('player', 0)
+                    if match is None or not isinstance(index, int) or not 0 <= index < len(match.players):
+                        error('no such match or player')
+                    else:
+                        feed = match.watch(index, outbox)
+                elif kind == 'resync' and feed is not None:
+                    feed.resync(outbox.send)
+                elif kind != 'input':
+                    error(f'unexpected {kind}')
+        except (ConnectionError, ValueError):
+            # Zerwane połączenie albo zbyt długi wiersz
+            pass
+        finally:
+            if feed is not None:
+                feed.unsubscribe(outbox.send)
+            if player is not None:
+                self.leave(player)
+            elif outbox.too_slow:
+                self.slow_clients += 1
+            outbox.close()
+            sender.cancel()
+            self.clients.discard(outbox)
+
+    def stats(self):
+        tick_time = self.tick_time.to_dict()
+        tick_lag = self.tick_lag.to_dict()
+        del tick_time['histogram'], tick_lag['histogram']
+        return {
+            'matches': len(self.matches),
+            'waiting': len(self.waiting),
+            'finished': self.finished,
+            'ticks': self.ticks,
+            'skipped_ticks': self.skipped_ticks,
+            'tick_ms': tick_time,
+            'lag_ms': tick_lag,
+            'coalesced': self.coalesced,
+            'dropped_inputs': self.dropped_inputs,
+            'slow_clients': self.slow_clients,
+        }
+
+
+async def bot_client(host, port, name, until, think_ms=BOT_THINK_MS, weights=None):
+    """Bot grający przez sieć do chwili until (loop.time()); po każdym meczu dołącza do kolejnego.
+       Ruchy liczy BotPlayer z odtworzonego silnika raz na klocek. Zwraca liczbę rozegranych meczów."""
+    loop = asyncio.get_running_loop()
+    reader, writer = await asyncio.open_connection(host, port)
+    bot = BotPlayer(weights)
+    games = 0
+    try:
+        while loop.time() < until:
+            writer.write(encode({'type': 'join', 'name': name}))
+            planned = None
+            while True:
+                line = await reader.readline()
+                if not line:
+                    return games
+                message = json.loads(line)
+                kind = message['type']
+                if kind == 'end':
+                    games += 1
+                    break
+                if kind != 'state' or message['pieces'] == planned:
+                    continue
+                engine = TetrisEngine.from_snapshot(base64.b64decode(message['snapshot']), board='bit')
+                if engine.game_over:
+                    continue
+                planned = message['pieces']
+                _, path = bot.decide(engine)
+                data = encode({'type': 'input', 'actions': [action for action, _ in path]})
+                loop.call_later(think_ms / 1000, writer.write, data)
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+    return games
+
+
+async def run_bots(host, port, count, seconds, think_ms=BOT_THINK_MS):
+    until = asyncio.get_running_loop().time() + seconds
+    games = await asyncio.gather(*(
+        bot_client(host, port, f'bot-{i}', until, think_ms) for i in range(count)
+    ), return_exceptions=True)
+    return sum(g for g in games if isinstance(g, int))
+
+
+def _bots_process(host, port, count, seconds, think_ms):
+    asyncio.run(run_bots(host, port, count, seconds, think_ms))
+
+
+async def serve(args):
+    server = GameServer(args.players, args.tick_ms, args.max_ticks)
+    port = await server.start(args.host, args.port)
+    print(f"listening on {args.host}:{port}")
+    try:
+        while True:
+            await asyncio.sleep(10)
+            stats = server.stats()
+            print(f"matches={stats['matches']} waiting={stats['waiting']} ticks={stats['ticks']} "
+                  f"p99 tick={stats['tick_ms']['p99']:.2f}ms p99 lag={stats['lag_ms']['p99']:.2f}ms")
+    finally:
+        await server.close()
+
+
+async def load_test(args):
+    """Serwer w tym procesie, boty w args.procs procesach; pomiar po zapełnieniu meczów."""
+    server = GameServer(args.players, args.tick_ms, args.max_ticks, seed=0)
+    port = await server.start(args.host, 0)
+    clients = args.matches * args.players
+    context = multiprocessing.get_context('spawn')
+    seconds = args.seconds + args.warmup + 30
+    procs = [
+        context.Process(target=_bots_process, daemon=True,
+                        args=(args.host, port, clients * (i + 1) // args.procs - clients * i // args.procs,
+                              seconds, args.think_ms))
+        for i in range(args.procs)
+    ]
+    for proc in procs:
+        proc.start()
+    try:
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + 30
+        while len(server.matches) < args.matches and loop.time() < deadline:
+            await asyncio.sleep(0.1)
+        await asyncio.sleep(args.warmup)
+        server.reset_stats()
+        start = loop.time()
+        await asyncio.sleep(args.seconds)
+        elapsed = loop.time() - start
+        stats = server.stats()
+    finally:
+        await server.close()
+        for proc in procs:
+            proc.terminate()
+    stats['elapsed'] = elapsed
+    stats['ticks_per_sec'] = stats['ticks'] / elapsed
+    print(f"{stats['matches']} matches x {args.players} players, tick {args.tick_ms} ms, "
+          f"{args.procs} bot processes")
+    print(f"{stats['ticks_per_sec']:.0f} match-ticks/s "
+          f"(target {args.matches * 1000 / args.tick_ms:.0f}), skipped {stats['skipped_ticks']}")
+    for name in ('tick_ms', 'lag_ms'):
+        h = stats[name]
+        print(f"  {name:8s} p50={h['p50']:.3f} p95={h['p95']:.3f} p99={h['p99']:.3f} max={h['max']:.3f}")
+    print(f"  finished={stats['finished']} coalesced={stats['coalesced']} "
+          f"dropped_inputs={stats['dropped_inputs']} slow_clients={stats['slow_clients']}")
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(stats, f, indent=2)
+    return stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Asyncio multiplayer server and loopback load test.")
+    parser.add_argument('mode', choices=('serve', 'bots', 'load'))
+    parser.add_argument('--host', default=HOST)
+    parser.add_argument('--port', type=int, default=PORT)
+    parser.add_argument('--players', type=int, default=PLAYERS, help='players per match')
+    parser.add_argument('--tick-ms', type=int, default=TICK_MS)
+    parser.add_argument('--max-ticks', type=int, default=0, help='end matches after N ticks (0 = never)')
+    parser.add_argument('--count', type=int, default=2, help='bots to run (mode bots)')
+    parser.add_argument('--matches', type=int, default=100, help='concurrent matches (mode load)')
+    parser.add_argument('--procs', type=int, default=max(1, (multiprocessing.cpu_count() or 2) - 1),
+                        help='bot client processes (mode load)')
+    parser.add_argument('--seconds', type=float, default=10.0)
+    parser.add_argument('--warmup', type=float, default=2.0)
+    parser.add_argument('--think-ms', type=int, default=BOT_THINK_MS)
+    parser.add_argument('--output', help='write load test stats as JSON')
+    args = parser.parse_args(argv)
+
+    if args.mode == 'serve':
+        try:
+            asyncio.run(serve(args))
+        except KeyboardInterrupt:
+            pass
+    elif args.mode == 'bots':
+        games = asyncio.run(run_bots(args.host, args.port, args.count, args.seconds, args.think_ms))
+        print(f"{games} matches played")
+    else:
+        asyncio.run(load_test(args))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
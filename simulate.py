@@ -0,0 +1,232 @@
+"""Równoległe symulacje gier bez okna (headless) na wielu rdzeniach.
+
+Przykład:
+    python simulate.py --games 20000 --workers 8 --out results.jsonl
+
+Seedy są dzielone na paczki (--chunk-size) i rozdzielane między procesy
+robocze przez kolejkę zadań. Wyniki pojedynczych gier wracają przez
+ograniczoną kolejkę wyników, a proces główny dopisuje je od razu do pliku
+JSON-lines. Ponowne uruchomienie z tym samym plikiem pomija seedy, które
+już mają wynik, więc przerwany przebieg można wznowić.
+
+Polityka gracza to funkcja ``policy(engine, rng) -> akcja`` (kody ACTION_*
+z modułu engine). Można podać nazwę wbudowanej polityki ('random',
+'bot' - heurystyczny bot z modułu bot, albo 'lookahead' - bot z podglądem
+następnego klocka z modułu search) albo ``moduł:funkcja``.
+"""
+import argparse
+import importlib
+import json
+import multiprocessing
+import os
+import queue
+import random
+import sys
+import time
+import traceback
+
+from bot import BotPlayer
+from engine import TetrisEngine, ACTIONS
+from search import LookaheadPlayer
+
+# Domyślnie jedna klatka gry przy 60 FPS na każdą akcję
+TICK_MS = 1000 // 60
+
+# Co ile sekund proces główny sprawdza, czy procesy robocze jeszcze żyją
+POLL_SECONDS = 1.0
+
+
+def random_policy(engine, rng):
+    """Losowa akcja w każdym kroku."""
+    return rng.choice(ACTIONS)
+
+
+POLICIES = {
+    'random': random_policy,
+    'bot': BotPlayer(),
+    'lookahead': LookaheadPlayer(),
+}
+
+
+def load_policy(spec):
+    """Zwraca politykę wbudowaną albo funkcję wskazaną jako 'moduł:funkcja'."""
+    if spec in POLICIES:
+        return POLICIES[spec]
+    module_name, _, func_name = spec.partition(':')
+    if not func_name:
+        raise ValueError(f"Unknown policy: {spec}")
+    return getattr(importlib.import_module(module_name), func_name)
+
+
+def play_game(seed, policy, max_pieces=None, tick_ms=TICK_MS, board='bit'):
+    """Rozgrywa jedną grę headless i zwraca słownik z wynikiem."""
+    start = time.perf_counter()
+    engine = TetrisEngine(board=board, seed=seed)
+    rng = random.Random(seed)
+    while not engine.game_over:
+        engine.step(policy(engine, rng))
+        engine.advance_gravity(tick_ms)
+        if max_pieces is not None and engine.pieces >= max_pieces:
+            break
+    return {
+        'seed': seed,
+        'score': engine.score,
+        'level': engine.level,
+        'lines': engine.lines,
+        'pieces': engine.pieces,
+        'duration': round(time.perf_counter() - start, 6),
+    }
+
+
+def _worker(tasks, results, policy_spec, max_pieces, tick_ms, board):
+    # Błąd trafia do procesu głównego jako wynik z polem 'error' (bez 'seed'
+    # w pliku wyników, więc wznowienie policzy tę grę jeszcze raz), a znacznik
+    # końca None jest wysyłany zawsze
+    try:
+        policy = load_policy(policy_spec)
+        while True:
+            chunk = tasks.get()
+            if chunk is None:
+                break
+            for seed in chunk:
+                try:
+                    result = play_game(seed, policy, max_pieces, tick_ms, board)
+                except Exception:
+                    result = {'error': traceback.format_exc(), 'failed_seed': seed}
+                # put() blokuje, gdy kolejka wyników jest pełna
+                results.put(result)
+    except Exception:
+        results.put({'error': traceback.format_exc()})
+    finally:
+        results.put(None)
+
+
+def load_done_seeds(path):
+    """Seedy, które mają już zapisany wynik (do wznawiania przebiegu)."""
+    done = set()
+    if not os.path.exists(path):
+        return done
+    with open(path, 'r') as f:
+        for line in f:
+            try:
+                done.add(json.loads(line)['seed'])
+            except (ValueError, KeyError):
+                # Urwana ostatnia linia po przerwaniu - zostanie policzona ponownie
+                continue
+    return done
+
+
+def _end_last_line(path):
+    """Kończy urwaną ostatnią linię, żeby pierwszy nowy wynik nie został z nią sklejony."""
+    if not os.path.exists(path):
+        return
+    with open(path, 'rb+') as f:
+        if f.seek(0, os.SEEK_END) == 0:
+            return
+        f.seek(-1, os.SEEK_END)
+        if f.read(1) != b'\n':
+            f.write(b'\n')
+
+
+def run(seeds, out_path, workers=None, chunk_size=64, queue_size=1024,
+        policy='random', max_pieces=None, tick_ms=TICK_MS, board='bit'):
+    """Rozgrywa gry dla seedów, których nie ma jeszcze w out_path. Zwraca liczbę nowych wyników.
+       Błędy gier i procesów roboczych są zgłaszane po zapisaniu pozostałych wyników (RuntimeError)."""
+    # Błędna polityka ma przerwać przebieg od razu, a nie w każdym procesie roboczym
+    load_policy(policy)
+    done = load_done_seeds(out_path)
+    pending = [seed for seed in seeds if seed not in done]
+    if not pending:
+        return 0
+    _end_last_line(out_path)
+    workers = workers or os.cpu_count() or 1
+    workers = min(workers, (len(pending) + chunk_size - 1) // chunk_size)
+
+    tasks = multiprocessing.Queue()
+    results = multiprocessing.Queue(maxsize=queue_size)
+    for i in range(0, len(pending), chunk_size):
+        tasks.put(pending[i:i + chunk_size])
+    for _ in range(workers):
+        tasks.put(None)
+
+    processes = [
+        multiprocessing.Process(target=_worker, args=(tasks, results, policy, max_pieces, tick_ms, board))
+        for _ in range(workers)
+    ]
+    for process in processes:
+        process.start()
+
+    written = 0
+    running = workers
+    errors = []
+    # Procesy, które zakończyły się bez wysłania znacznika końca (np. zabite)
+    lost = set()
+    try:
+        with open(out_path, 'a') as f:
+            while running:
+                try:
+                    result = results.get(timeout=POLL_SECONDS)
+                except queue.Empty:
+                    for process in processes:
+                        if process.exitcode not in (None, 0) and process not in lost:
+                            lost.add(process)
+                            running -= 1
+                            errors.append(f"worker {process.pid} exited with code {process.exitcode}")
+                    continue
+                if result is None:
+                    running -= 1
+                    continue
+                if 'error' in result:
+                    errors.append(result['error'])
+                    continue
+                f.write(json.dumps(result) + '\n')
+                f.flush()
+                written += 1
+    finally:
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+            process.join()
+    if errors:
+        raise RuntimeError(f"{len(errors)} simulation error(s), {written} results written:\n{errors[0]}")
+    return written
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless Tetris simulations on a process pool.")
+    parser.add_argument('--games', type=int, default=1000, help="number of seeded games")
+    parser.add_argument('--start-seed', type=int, default=0)
+    parser.add_argument('--workers', type=int, default=None, help="default: number of CPU cores")
+    parser.add_argument('--chunk-size', type=int, default=64, help="seeds per work item")
+    parser.add_argument('--queue-size', type=int, default=1024, help="bound of the result queue")
+    parser.add_argument('--policy', default='random', help="built-in policy name or module:function")
+    parser.add_argument('--max-pieces', type=int, default=None)
+    parser.add_argument('--tick-ms', type=int, default=TICK_MS, help="gravity time added after each action")
+    parser.add_argument('--board', default='bit', choices=('list', 'bit'))
+    parser.add_argument('--out', default='results.jsonl')
+    args = parser.parse_args(argv)
+
+    try:
+        load_policy(args.policy)
+    except (ValueError, ImportError, AttributeError) as e:
+        parser.error(f"bad --policy {args.policy!r}: {e}")
+
+    seeds = range(args.start_seed, args.start_seed + args.games)
+    start = time.perf_counter()
+    try:
+        written = run(seeds, args.out, args.workers, args.chunk_size, args.queue_size,
+                      args.policy, args.max_pieces, args.tick_ms, args.board)
+    except KeyboardInterrupt:
+        print("Interrupted, rerun with the same --out to resume.", file=sys.stderr)
+        return 1
+    except RuntimeError as e:
+        print(e, file=sys.stderr)
+        print("Rerun with the same --out to retry the failed games.", file=sys.stderr)
+        return 1
+    elapsed = time.perf_counter() - start
+    print(f"{written} games in {elapsed:.2f}s -> {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,316 @@
+"""Strumień stanu gry dla widzów: klatka kluczowa przy subskrypcji, potem same zmiany.
+
+Ramka (bajty, liczby little-endian):
+    nagłówek  długość reszty ramki (H), rodzaj (B), numer sekwencji (I)
+    KEYFRAME  klocek (kształt B, rotacja B, x b, y b), następny (B),
+              wynik (Q), poziom (Q), linie (I), klocki (I), koniec gry (B),
+              siatka GRID_WIDTH * GRID_HEIGHT kodów kształtów
+    DELTA     flagi (B), a po nich tylko zmienione części w kolejności flag:
+              PIECE  klocek jak w KEYFRAME
+              NEXT   następny kształt
+              STATS  wynik, poziom, linie, klocki, koniec gry
+              ROWS   liczba wierszy (B), każdy: y (B) + GRID_WIDTH kodów
+
+Kształty są kodami z ``board.SHAPE_NAMES``. Siatka zmienia się tylko po
+osadzeniu klocka (place_piece/clear_lines) albo po śmieciach, więc
+w większości aktualizacji delta to sam ruch klocka (kilka bajtów zamiast
+ponad 200).
+
+Każda aktualizacja ma kolejny numer sekwencji. DeltaDecoder odrzuca
+deltę, która nie jest następna po ostatnio zastosowanej (zgubiona ramka),
+i czeka na klatkę kluczową; Publisher.resync() wysyła ją widzowi od ręki.
+
+Publisher koduje każdą aktualizację raz i przekazuje te same bajty
+wszystkim subskrybentom (dowolne wywoływalne send(bytes)). Klatka
+kluczowa dla nowych widzów jest budowana ze stanu kodera, a nie silnika,
+więc następna delta zawsze do niej pasuje.
+
+Pomiar rozmiaru i kosztu strumienia na grach bota (z weryfikacją dekodera):
+    python spectate.py --games 3 --viewers 100 --loss 0.01
+"""
+import argparse
+import base64
+import random
+import struct
+import sys
+import time
+
+from board import GRID_WIDTH, GRID_HEIGHT, SHAPE_IDS, SHAPE_NAMES
+from bot import BotPlayer
+from engine import TetrisEngine
+
+HEADER = struct.Struct('<HBI')
+PIECE = struct.Struct('<BBbb')
+NEXT = struct.Struct('<B')
+STATS = struct.Struct('<QQIIB')
+ROW = struct.Struct(f'<B{GRID_WIDTH}s')
+ROW_COUNT = struct.Struct('<B')
+GRID = struct.Struct(f'{GRID_WIDTH * GRID_HEIGHT}s')
+
+# Rodzaje ramek
+KIND_KEYFRAME = 1
+KIND_DELTA = 2
+
+# Flagi części delty
+DELTA_PIECE = 1
+DELTA_NEXT = 2
+DELTA_STATS = 4
+DELTA_ROWS = 8
+
+
+def _frame(kind, seq, body):
+    # Pole długości nie liczy samego siebie
+    return HEADER.pack(HEADER.size - 2 + len(body), kind, seq) + body
+
+
+class DeltaEncoder:
+    """Koduje kolejne stany jednego silnika jako delty względem ostatnio zakodowanego stanu."""
+
+    def __init__(self):
+        self.seq = 0
+        self.piece = None
+        self.next_piece = None
+        self.stats = None
+        self.grid = None
+        # (klocki, skrót planszy) przy ostatnim porównaniu siatki
+        self.board_key = None
+
+    def _piece(self, engine):
+        piece = engine.current_piece
+        return PIECE.pack(SHAPE_IDS[piece['shape']], piece['rotation'], piece['x'], piece['y'])
+
+    def _stats(self, engine):
+        return STATS.pack(engine.score, engine.level, engine.lines, engine.pieces, engine.game_over)
+
+    def update(self, engine):
+        """Ramka z różnicą względem poprzedniego stanu albo None, jeśli nic się nie zmieniło.
+           Pierwsza aktualizacja to klatka kluczowa."""
+        if self.grid is None:
+            self.piece = self._piece(engine)
+            self.next_piece = NEXT.pack(SHAPE_IDS[engine.next_piece])
+            self.stats = self._stats(engine)
+            self.grid = engine.board.to_bytes()
+            self.board_key = (engine.pieces, engine.board.hash)
+            self.seq += 1
+            return self.keyframe()
+        flags = 0
+        parts = []
+        piece = self._piece(engine)
+        if piece != self.piece:
+            flags |= DELTA_PIECE
+            parts.append(piece)
+            self.piece = piece
+        next_piece = NEXT.pack(SHAPE_IDS[engine.next_piece])
+        if next_piece != self.next_piece:
+            flags |= DELTA_NEXT
+            parts.append(next_piece)
+            self.next_piece = next_piece
+        stats = self._stats(engine)
+        if stats != self.stats:
+            flags |= DELTA_STATS
+            parts.append(stats)
+            self.stats = stats
+        # Siatkę porównujemy tylko po osadzeniu klocka albo zmianie zajętości pól (śmieci)
+        board_key = (engine.pieces, engine.board.hash)
+        if board_key != self.board_key:
+            self.board_key = board_key
+            grid = engine.board.to_bytes()
+            old = self.grid
+            rows = [
+                ROW.pack(y, grid[y * GRID_WIDTH:(y + 1) * GRID_WIDTH])
+                for y in range(GRID_HEIGHT)
+                if grid[y * GRID_WIDTH:(y + 1) * GRID_WIDTH] != old[y * GRID_WIDTH:(y + 1) * GRID_WIDTH]
+            ]
+            if rows:
+                flags |= DELTA_ROWS
+                parts.append(ROW_COUNT.pack(len(rows)))
+                parts.extend(rows)
+                self.grid = grid
+        if not flags:
+            return None
+        self.seq += 1
+        return _frame(KIND_DELTA, self.seq, bytes([flags]) + b''.join(parts))
+
+    def keyframe(self):
+        """Pełny stan o bieżącym numerze sekwencji (ze stanu kodera, nie silnika)."""
+        return _frame(KIND_KEYFRAME, self.seq, self.piece + self.next_piece + self.stats + self.grid)
+
+
+class DeltaDecoder:
+    """Odtwarza stan gry ze strumienia ramek. Po wykryciu luki czeka na klatkę kluczową."""
+
+    def __init__(self):
+        self.seq = 0
+        self.synced = False
+        self.gaps = 0
+        self.grid = bytearray(GRID_WIDTH * GRID_HEIGHT)
+        self.current_piece = None
+        self.next_piece = None
+        self.score = self.level = self.lines = self.pieces = 0
+        self.game_over = False
+
+    def _read_piece(self, data, offset):
+        shape, rotation, x, y = PIECE.unpack_from(data, offset)
+        self.current_piece = {'shape': SHAPE_NAMES[shape], 'rotation': rotation, 'x': x, 'y': y}
+        return offset + PIECE.size
+
+    def _read_stats(self, data, offset):
+        self.score, self.level, self.lines, self.pieces, game_over = STATS.unpack_from(data, offset)
+        self.game_over = bool(game_over)
+        return offset + STATS.size
+
+    def feed(self, frame):
+        """Stosuje jedną ramkę. Zwraca False, jeśli stan jest nieaktualny i trzeba resync."""
+        length, kind, seq = HEADER.unpack_from(frame)
+        if len(frame) != length + 2:
+            raise ValueError(f"Bad frame length: {len(frame)} != {length + 2}")
+        offset = HEADER.size
+        if kind == KIND_KEYFRAME:
+            offset = self._read_piece(frame, offset)
+            self.next_piece = SHAPE_NAMES[frame[offset]]
+            offset = self._read_stats(frame, offset + NEXT.size)
+            self.grid[:] = GRID.unpack_from(frame, offset)[0]
+            self.seq = seq
+            self.synced = True
+            return True
+        if kind != KIND_DELTA:
+            raise ValueError(f"Unknown frame kind: {kind}")
+        if self.synced and seq <= self.seq:
+            # Ramka sprzed ostatniej klatki kluczowej
+            return True
+        if not self.synced or seq != self.seq + 1:
+            if self.synced:
+                self.gaps += 1
+                self.synced = False
+            return False
+        flags = frame[offset]
+        offset += 1
+        if flags & DELTA_PIECE:
+            offset = self._read_piece(frame, offset)
+        if flags & DELTA_NEXT:
+            self.next_piece = SHAPE_NAMES[frame[offset]]
+            offset += NEXT.size
+        if flags & DELTA_STATS:
+            offset = self._read_stats(frame, offset)
+        if flags & DELTA_ROWS:
+            count = frame[offset]
+            offset += ROW_COUNT.size
+            for _ in range(count):
+                y, row = ROW.unpack_from(frame, offset)
+                self.grid[y * GRID_WIDTH:(y + 1) * GRID_WIDTH] = row
+                offset += ROW.size
+        self.seq = seq
+        return True
+
+    def cells(self):
+        """Zwraca (x, y, kształt) dla każdego zajętego pola, jak board.cells()."""
+        grid = self.grid
+        for i, code in enumerate(grid):
+            if code:
+                yield i % GRID_WIDTH, i // GRID_WIDTH, SHAPE_NAMES[code]
+
+
+class Publisher:
+    """Strumień jednego silnika do wielu widzów; każda aktualizacja jest kodowana raz."""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.encoder = DeltaEncoder()
+        self.subscribers = set()
+        self.encoder.update(engine)
+        # Klatka kluczowa dla bieżącego numeru sekwencji: (seq, bajty)
+        self.keyframe_cache = (None, None)
+        self.frames = 0
+        self.bytes_out = 0
+
+    def keyframe(self):
+        seq, frame = self.keyframe_cache
+        if seq != self.encoder.seq:
+            frame = self.encoder.keyframe()
+            self.keyframe_cache = (self.encoder.seq, frame)
+        return frame
+
+    def subscribe(self, send):
+        self.subscribers.add(send)
+        self.resync(send)
+
+    def unsubscribe(self, send):
+        self.subscribers.discard(send)
+
+    def resync(self, send):
+        frame = self.keyframe()
+        self.bytes_out += len(frame)
+        send(frame)
+
+    def publish(self):
+        """Koduje zmiany od ostatniej aktualizacji i wysyła je wszystkim widzom."""
+        frame = self.encoder.update(self.engine)
+        if frame is None:
+            return None
+        self.frames += 1
+        self.bytes_out += len(frame) * len(self.subscribers)
+        for send in list(self.subscribers):
+            send(frame)
+        return frame
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure the delta-encoded spectator stream on bot games.")
+    parser.add_argument('--games', type=int, default=3)
+    parser.add_argument('--max-pieces', type=int, default=300)
+    parser.add_argument('--viewers', type=int, default=100)
+    parser.add_argument('--loss', type=float, default=0.0, help='frame loss rate of one lossy viewer')
+    parser.add_argument('--frame-ms', type=int, default=16, help='game time between updates')
+    args = parser.parse_args(argv)
+
+    rng = random.Random(0)
+    updates = delta_bytes = full_bytes = json_bytes = 0
+    encode_time = 0.0
+    mismatches = resyncs = 0
+    for seed in range(args.games):
+        engine = TetrisEngine(board='bit', seed=seed)
+        publisher = Publisher(engine)
+        decoders = [DeltaDecoder() for _ in range(args.viewers)]
+        for decoder in decoders:
+            publisher.subscribe(decoder.feed)
+        lossy = DeltaDecoder()
+
+        def lossy_feed(frame):
+            if rng.random() >= args.loss and not lossy.feed(frame):
+                publisher.resync(lossy_feed)
+
+        publisher.subscribe(lossy_feed)
+        bot = BotPlayer()
+        while not engine.game_over and engine.pieces < args.max_pieces:
+            # Ruch bota co klatkę i grawitacja, jak w pętli gry
+            engine.step(bot(engine))
+            engine.advance_gravity(args.frame_ms)
+            start = time.perf_counter()
+            frame = publisher.publish()
+            encode_time += time.perf_counter() - start
+            if frame is None:
+                continue
+            updates += 1
+            delta_bytes += len(frame)
+            full_bytes += len(publisher.encoder.keyframe())
+            json_bytes += len(base64.b64encode(engine.snapshot()))
+            expected = engine.board.to_bytes()
+            for decoder in decoders[:1] + [lossy]:
+                # Widz, któremu zginęła ostatnia ramka, jeszcze o tym nie wie
+                if decoder.seq == publisher.encoder.seq and (bytes(decoder.grid) != expected
+                                       or decoder.current_piece != engine.current_piece
+                                       or decoder.score != engine.score):
+                    mismatches += 1
+        resyncs += lossy.gaps
+        print(f"seed {seed}: pieces={engine.pieces} frames={publisher.frames} "
+              f"bytes out={publisher.bytes_out} viewer gaps={lossy.gaps}")
+
+    print(f"{updates} updates: delta {delta_bytes / updates:.1f} B/update, "
+          f"keyframe {full_bytes / updates:.1f} B, base64 snapshot {json_bytes / updates:.1f} B")
+    print(f"publish to {args.viewers + 1} decoding viewers: {encode_time / updates * 1e6:.1f} us/update")
+    print(f"mismatches={mismatches} resyncs={resyncs}")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,89 @@
+import random
+
+import numpy as np
+
+from batch import BatchEngine
+from board import SHAPE_IDS
+from bot import BotPlayer
+from engine import ACTION_HARD_DROP, ACTIONS, MAX_LEVEL, MAX_SCORE, TetrisEngine
+
+
+def game_seed(index, game):
+    return 1000 * index + game
+
+
+class EngineBags(BatchEngine):
+    """BatchEngine z workami losowanymi jak w TetrisEngine o seedzie game_seed(gra, numer)."""
+
+    def __init__(self, n):
+        self.games = [-1] * n
+        self.feeds = [None] * n
+        super().__init__(n)
+
+    def reset(self, mask):
+        for i in np.flatnonzero(mask):
+            self.games[i] += 1
+            self.feeds[i] = TetrisEngine(seed=game_seed(int(i), self.games[i]))
+            self.feeds[i].bag_index = 0
+        super().reset(mask)
+
+    def _shuffle_bags(self, mask):
+        # TetrisEngine zdejmuje kształty z końca worka
+        for i in np.flatnonzero(mask):
+            self.bags[i] = [SHAPE_IDS[shape] for shape in reversed(self.feeds[i].shuffled_bag())]
+            self.bag_pos[i] = 0
+
+
+def assert_same(batch, i, engine):
+    assert batch.boards[i].tobytes() == engine.board.to_bytes()
+    piece = engine.current_piece
+    assert (batch.piece[i], batch.rotation[i], batch.x[i], batch.y[i]) == \
+        (SHAPE_IDS[piece['shape']], piece['rotation'], piece['x'], piece['y'])
+    assert batch.next_piece[i] == SHAPE_IDS[engine.next_piece]
+    assert (batch.score[i], batch.level[i], batch.lines[i], batch.pieces[i]) == \
+        (engine.score, engine.level, engine.lines, engine.pieces)
+
+
+def test_batch_matches_engine_step_by_step():
+    """Parzyste gry prowadzi bot (długie gry z liniami), nieparzyste losowe akcje (szybkie końce gier)."""
+    n = 8
+    rng = random.Random(0)
+    batch = EngineBags(n)
+    engines = [TetrisEngine(board='bit', seed=game_seed(i, 0)) for i in range(n)]
+    bots = [BotPlayer() for _ in range(n)]
+    finished = 0
+    for _ in range(4000):
+        actions = [bots[i](engine) if i % 2 == 0 else rng.choice(ACTIONS) for i, engine in enumerate(engines)]
+        lines, done = batch.step(actions)
+        for i, engine in enumerate(engines):
+            assert lines[i] == engine.step(actions[i])
+            assert done[i] == engine.game_over
+            if engine.game_over:
+                finished += 1
+                assert batch.final_score[i] == engine.score
+                engine = engines[i] = TetrisEngine(board='bit', seed=game_seed(i, batch.games[i]))
+                bots[i] = BotPlayer()
+            assert_same(batch, i, engine)
+    assert finished > 50
+    assert sum(engine.lines for engine in engines[::2]) > 0
+
+
+def test_score_saturates_like_engine():
+    batch = BatchEngine(2, seed=0)
+    engine = TetrisEngine(seed=0)
+    for score in (MAX_SCORE - 50, MAX_SCORE):
+        batch.score[:] = engine.score = score
+        batch.level[:] = engine.level = MAX_LEVEL
+        # Dolny wiersz z luką na poziomy klocek I w kolumnach 0-3
+        batch.boards[:] = 0
+        batch.boards[:, -1, 4:] = SHAPE_IDS['O']
+        batch.piece[:] = SHAPE_IDS['I']
+        batch.rotation[:] = 0
+        batch.x[:] = 0
+        batch.y[:] = 0
+        lines, done = batch.step([ACTION_HARD_DROP] * 2)
+        assert list(lines) == [1, 1] and not done.any()
+        assert not batch.boards.any()
+        engine.update_score(1)
+        assert list(batch.score) == [engine.score] * 2 == [MAX_SCORE] * 2
+        assert list(batch.level) == [engine.level] * 2 == [MAX_LEVEL] * 2
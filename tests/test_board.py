@@ -0,0 +1,83 @@
+import random
+
+from board import GRID_HEIGHT, GRID_WIDTH, SHAPE_IDS, SHAPES, BitBoard, ListBoard, column_heights, rows_hash
+from bot import BotPlayer, board_rows
+from engine import TetrisEngine
+
+
+def assert_same(lst, bit):
+    assert lst.to_bytes() == bit.to_bytes()
+    assert lst.grid == bit.grid
+    assert sorted(lst.cells()) == sorted(bit.cells())
+    assert lst.hash == bit.hash == rows_hash(board_rows(bit))
+    assert lst.heights == bit.heights == column_heights(board_rows(bit))
+
+
+def test_boards_agree_through_a_game():
+    """Te same ruchy (wybierane na planszy bitowej) na obu planszach, z grawitacją i śmieciami."""
+    bot = BotPlayer()
+    rng = random.Random(0)
+    lst, bit = TetrisEngine(board='list', seed=4), TetrisEngine(board='bit', seed=4)
+    garbage = 50
+    while not bit.game_over and bit.pieces < 300:
+        action = bot(bit)
+        assert lst.step(action) == bit.step(action)
+        lst.advance_gravity(16)
+        bit.advance_gravity(16)
+        if bit.pieces >= garbage:
+            garbage += 50
+            hole = rng.randrange(GRID_WIDTH)
+            lst.add_garbage(2, hole)
+            bit.add_garbage(2, hole)
+        assert lst.snapshot() == bit.snapshot()
+        assert_same(lst.board, bit.board)
+    assert bit.pieces == 300 and bit.lines > 0
+
+
+def test_collision_and_drop_distance_agree():
+    engine = TetrisEngine(board='bit', seed=8)
+    bot = BotPlayer()
+    while engine.pieces < 40:
+        engine.step(bot(engine))
+    bit = engine.board
+    lst = ListBoard()
+    lst.load_bytes(bit.to_bytes())
+    assert_same(lst, bit)
+    for shape, rotations in SHAPES.items():
+        for rotation in range(len(rotations)):
+            for x in range(-2, GRID_WIDTH + 1):
+                for y in range(-2, GRID_HEIGHT + 1):
+                    collides = lst.collides(shape, rotation, x, y)
+                    assert collides == bit.collides(shape, rotation, x, y)
+                    if not collides:
+                        assert lst.drop_distance(shape, rotation, x, y) == bit.drop_distance(shape, rotation, x, y)
+
+
+def test_clear_lines_agree_on_random_grids():
+    """Losowe siatki z pustymi wierszami, wiszącymi polami i 1-4 pełnymi wierszami w dowolnych miejscach."""
+    rng = random.Random(1)
+    shapes = list(SHAPES)
+    for _ in range(300):
+        top = rng.randrange(GRID_HEIGHT)
+        cells = bytearray(GRID_WIDTH * GRID_HEIGHT)
+        for i in range(top * GRID_WIDTH, len(cells)):
+            if rng.random() < 0.6:
+                cells[i] = SHAPE_IDS[rng.choice(shapes)]
+        for y in rng.sample(range(top, GRID_HEIGHT), min(rng.randint(1, 4), GRID_HEIGHT - top)):
+            cells[y * GRID_WIDTH:(y + 1) * GRID_WIDTH] = bytes([SHAPE_IDS['I']]) * GRID_WIDTH
+        lst, bit = ListBoard(), BitBoard()
+        lst.load_bytes(bytes(cells))
+        bit.load_bytes(bytes(cells))
+        assert lst.clear_lines() == bit.clear_lines() > 0
+        assert_same(lst, bit)
+        assert lst.masks == bit.rows
+
+
+def test_external_color_buffer_is_updated_in_place():
+    buffer = bytearray(GRID_WIDTH * GRID_HEIGHT)
+    engine = TetrisEngine(board=BitBoard(memoryview(buffer)), seed=1)
+    bot = BotPlayer()
+    while engine.lines == 0:
+        engine.step(bot(engine))
+    assert engine.board.colors.obj is buffer
+    assert bytes(buffer) == engine.board.to_bytes()
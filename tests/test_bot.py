@@ -0,0 +1,90 @@
+import random
+
+import pytest
+
+from board import SHAPES, GRID_HEIGHT, GRID_WIDTH
+from bot import (
+    CANONICAL_ROTATION, DEFAULT_WEIGHTS, POPCOUNT, BotPlayer, board_heights, board_rows, evaluate, find_path,
+    placement_score, placements,
+)
+from engine import ACTION_HARD_DROP, TetrisEngine
+
+
+def midgame(seed, pieces=30):
+    """Silnik z nierówną planszą: bot z losowymi zrzutami co kilka klocków."""
+    rng = random.Random(seed)
+    bot = BotPlayer()
+    engine = TetrisEngine(board='bit', seed=seed)
+    while engine.pieces < pieces and not engine.game_over:
+        engine.step(ACTION_HARD_DROP if rng.random() < 0.05 else bot(engine))
+    assert not engine.game_over
+    return engine
+
+
+def brute_force_landings(board, shape, start):
+    """BFS po stanach (rotacja, x, y) z kolizjami planszy, jak ruchy silnika."""
+    count = len(SHAPES[shape])
+    seen = {start}
+    queue = [start]
+    for r, x, y in queue:
+        for state in ((r, x - 1, y), (r, x + 1, y), (r, x, y + 1), ((r + 1) % count, x, y)):
+            if state not in seen and not board.collides(shape, *state):
+                seen.add(state)
+                queue.append(state)
+    return {(CANONICAL_ROTATION[shape][r], x, y) for r, x, y in seen if board.collides(shape, r, x, y + 1)}
+
+
+@pytest.mark.parametrize('seed', range(4))
+def test_placements_match_brute_force(seed):
+    engine = midgame(seed)
+    rows = board_rows(engine.board)
+    piece = engine.current_piece
+    start = (piece['rotation'], piece['x'], piece['y'])
+    for shape in SHAPES:
+        candidates, _ = placements(rows, shape, *start)
+        assert len(candidates) == len(set(candidates))
+        found = {(CANONICAL_ROTATION[shape][r], x, y) for r, x, y in candidates}
+        assert found == brute_force_landings(engine.board, shape, start)
+
+
+@pytest.mark.parametrize('seed', range(4))
+def test_every_path_reaches_its_target(seed):
+    engine = midgame(seed)
+    rows = board_rows(engine.board)
+    piece = engine.current_piece
+    start = (piece['rotation'], piece['x'], piece['y'])
+    candidates, free = placements(rows, piece['shape'], *start)
+    for target in candidates:
+        path = find_path(free, start, target)
+        assert path[-1] == (ACTION_HARD_DROP, None)
+        copy = TetrisEngine.from_snapshot(engine.snapshot(), board='bit')
+        for action, after in path[:-1]:
+            copy.step(action)
+            moved = copy.current_piece
+            assert (moved['rotation'], moved['x'], moved['y']) == after
+        # Reszta drogi to zrzut: klocek spada dokładnie do celu
+        moved = copy.current_piece
+        assert (moved['rotation'], moved['x'], moved['y'] + copy.drop_distance()) == target
+
+
+@pytest.mark.parametrize('seed', range(4))
+def test_placement_score_matches_full_evaluation(seed):
+    engine = midgame(seed)
+    rows = board_rows(engine.board)
+    heights = board_heights(engine.board, rows)
+    cells = sum(POPCOUNT[row] for row in rows)
+    for shape in SHAPES:
+        candidates, _ = placements(rows, shape, 0, GRID_WIDTH // 2 - 1, 0)
+        for candidate in candidates:
+            expected = evaluate(rows, shape, *candidate, DEFAULT_WEIGHTS)
+            assert placement_score(rows, heights, cells, shape, *candidate, DEFAULT_WEIGHTS) == \
+                pytest.approx(expected)
+
+
+def test_bot_survives_and_clears_lines():
+    bot = BotPlayer()
+    engine = TetrisEngine(board='bit', seed=0)
+    while engine.pieces < 500 and not engine.game_over:
+        engine.step(bot(engine))
+    assert not engine.game_over
+    assert engine.lines >= 500 * 4 // GRID_WIDTH - GRID_HEIGHT
@@ -0,0 +1,91 @@
+import random
+
+import pytest
+
+from board import SHAPES
+from bot import BotPlayer
+from engine import ACTION_HARD_DROP, ACTIONS, MAX_LEVEL, MAX_SCORE, TetrisEngine
+
+
+def play(engine, steps, seed=0, gravity_ms=16):
+    """Losowe akcje z grawitacją; zwraca sumę linii zwróconych przez step()."""
+    rng = random.Random(seed)
+    lines = 0
+    for _ in range(steps):
+        if engine.game_over:
+            break
+        lines += engine.step(rng.choice(ACTIONS))
+        engine.advance_gravity(gravity_ms)
+    return lines
+
+
+def test_same_seed_same_game():
+    first, second = TetrisEngine(seed=5), TetrisEngine(seed=5)
+    play(first, 3000)
+    play(second, 3000)
+    assert first.snapshot() == second.snapshot()
+    assert TetrisEngine(seed=6).snapshot() != TetrisEngine(seed=5).snapshot()
+
+
+def bot_game(seed, pieces):
+    """Gra bota; zwraca silnik, kształty kolejnych klocków i sumę linii ze step()."""
+    bot = BotPlayer()
+    engine = TetrisEngine(seed=seed)
+    shapes = [engine.current_piece['shape']]
+    lines = 0
+    while not engine.game_over and engine.pieces < pieces:
+        placed = engine.pieces
+        lines += engine.step(bot(engine))
+        if engine.pieces != placed:
+            shapes.append(engine.current_piece['shape'])
+    return engine, shapes, lines
+
+
+def test_pieces_come_in_bags_of_seven():
+    _, shapes, _ = bot_game(1, 70)
+    assert len(shapes) > 70
+    for i in range(0, 70, 7):
+        assert sorted(shapes[i:i + 7]) == sorted(SHAPES)
+
+
+def test_step_returns_cleared_lines():
+    engine, _, lines = bot_game(2, 200)
+    assert engine.lines > 0
+    assert lines == engine.lines
+
+
+@pytest.mark.parametrize('board', ['list', 'bit'])
+def test_snapshot_round_trip_continues_identically(board):
+    engine = TetrisEngine(board=board, seed=9)
+    play(engine, 400)
+    copy = TetrisEngine.from_snapshot(engine.snapshot(), board=board)
+    assert copy.snapshot() == engine.snapshot()
+    assert copy.zobrist_key() == engine.zobrist_key()
+    play(engine, 400, seed=1)
+    play(copy, 400, seed=1)
+    assert copy.snapshot() == engine.snapshot()
+
+
+@pytest.mark.parametrize('board', ['list', 'bit'])
+def test_long_game_saturates_score_and_snapshots(board):
+    bot = BotPlayer()
+    engine = TetrisEngine(board=board, seed=0)
+    while not engine.game_over and engine.pieces < 2200:
+        engine.step(bot(engine))
+        if engine.pieces % 100 == 0:
+            copy = TetrisEngine.from_snapshot(engine.snapshot(), board=board)
+            assert copy.snapshot() == engine.snapshot()
+            assert (copy.score, copy.level) == (engine.score, engine.level)
+    assert engine.pieces == 2200
+    # Wynik rośnie wykładniczo i zatrzymuje się na MAX_SCORE
+    assert engine.score == MAX_SCORE and engine.level == MAX_LEVEL
+
+
+def test_game_over_stops_the_game():
+    engine = TetrisEngine(seed=3)
+    while not engine.game_over:
+        engine.step(ACTION_HARD_DROP)
+    state = engine.snapshot()
+    assert engine.step(ACTION_HARD_DROP) == 0
+    assert engine.advance_gravity(10000) == 0
+    assert engine.snapshot() == state
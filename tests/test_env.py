@@ -0,0 +1,104 @@
+import random
+
+import numpy as np
+import pytest
+
+from board import GRID_HEIGHT, GRID_WIDTH, SHAPE_IDS
+from bot import BotPlayer
+from engine import ACTIONS, MAX_LEVEL, MAX_SCORE
+from env import OBSERVATION, TetrisEnv
+
+
+def assert_observation(obs, engine):
+    record = np.frombuffer(obs, dtype=OBSERVATION)[0] if isinstance(obs, memoryview) else obs
+    assert record['grid'].tobytes() == engine.board.to_bytes()
+    piece = engine.current_piece
+    assert list(record['piece']) == [SHAPE_IDS[piece['shape']], piece['rotation'], piece['x'], piece['y']]
+    assert record['next'] == SHAPE_IDS[engine.next_piece]
+    assert (record['score'], record['level'], record['lines'], record['pieces'], record['game_over']) == \
+        (engine.score, engine.level, engine.lines, engine.pieces, engine.game_over)
+
+
+@pytest.mark.parametrize('action_mode', ['move', 'placement'])
+@pytest.mark.parametrize('observation', ['array', 'memoryview'])
+def test_observation_is_one_buffer_tracking_the_engine(action_mode, observation):
+    env = TetrisEnv(action_mode, observation)
+    rng = random.Random(0)
+    obs, info = env.reset(seed=1)
+    assert_observation(obs, env.engine)
+    for episode in range(3):
+        terminated = False
+        while not terminated:
+            score = env.engine.score
+            result, reward, terminated, truncated, step_info = env.step(rng.randrange(env.action_count))
+            assert result is obs and step_info is info
+            assert reward == env.engine.score - score and not truncated
+            assert_observation(obs, env.engine)
+        obs_again, _ = env.reset(seed=episode)
+        assert obs_again is obs
+
+
+def test_observation_is_read_only():
+    env = TetrisEnv(observation='array')
+    obs, _ = env.reset(seed=0)
+    with pytest.raises(ValueError):
+        obs['score'] = 1
+    env = TetrisEnv(observation='memoryview')
+    obs, _ = env.reset(seed=0)
+    with pytest.raises(TypeError):
+        obs[0] = 1
+
+
+def test_same_seed_same_episode():
+    def episode(seed):
+        env = TetrisEnv('placement')
+        obs, _ = env.reset(seed=seed)
+        rng = random.Random(7)
+        copies = []
+        terminated = False
+        while not terminated:
+            obs, _, terminated, _, _ = env.step(rng.randrange(env.action_count))
+            copies.append(obs.copy())
+        return copies
+
+    first, second = episode(3), episode(3)
+    assert len(first) == len(second)
+    assert all(a.tobytes() == b.tobytes() for a, b in zip(first, second))
+
+
+def test_placement_mode_reports_unreachable_targets():
+    env = TetrisEnv('placement')
+    env.reset(seed=0)
+    # Kolumna poza zasięgiem klocka przy prawej krawędzi
+    _, _, _, _, info = env.step(GRID_WIDTH - 1)
+    assert info['invalid']
+    _, _, _, _, info = env.step(GRID_WIDTH // 2 - 1)
+    assert not info['invalid']
+
+
+def test_truncation_and_argument_errors():
+    env = TetrisEnv(max_steps=5)
+    with pytest.raises(RuntimeError):
+        env.step(0)
+    env.reset(seed=0)
+    with pytest.raises(ValueError):
+        env.step(len(ACTIONS))
+    truncated = [env.step(0)[3] for _ in range(5)]
+    assert truncated == [False] * 4 + [True]
+    with pytest.raises(ValueError):
+        TetrisEnv(action_mode='bogus')
+    assert OBSERVATION['grid'].shape == (GRID_HEIGHT, GRID_WIDTH)
+
+
+def test_long_episode_saturates_score_and_level():
+    env = TetrisEnv('move')
+    obs, _ = env.reset(seed=0)
+    bot = BotPlayer()
+    rewards = []
+    while env.engine.pieces < 2200:
+        obs, reward, terminated, _, _ = env.step(bot(env.engine))
+        assert not terminated
+        rewards.append(reward)
+    assert_observation(obs, env.engine)
+    assert (obs['score'], obs['level']) == (MAX_SCORE, MAX_LEVEL)
+    assert sum(rewards) == MAX_SCORE and rewards[-1] == 0
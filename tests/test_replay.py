@@ -0,0 +1,117 @@
+import pytest
+
+from bot import BotPlayer
+from engine import MAX_SCORE, TetrisEngine, ACTION_HARD_DROP, ACTION_NONE
+from replay import (
+    ACTION_END, ACTION_KEYFRAME, HEADER, ReplayRecorder, iter_records, keyframe_index, read_header,
+    replay, replay_file, seek,
+)
+
+
+def record_game(path, seed=3, steps=1500, keyframe_interval=10):
+    """Nagrywa grę bota tak jak frontend: grawitacja, akcja, checkpoint."""
+    bot = BotPlayer()
+    engine = TetrisEngine(seed=seed)
+    recorder = ReplayRecorder(str(path), seed, keyframe_interval=keyframe_interval)
+    for _ in range(steps):
+        if engine.game_over:
+            break
+        recorder.gravity(16)
+        engine.advance_gravity(16)
+        recorder.checkpoint(engine)
+        action = bot(engine)
+        recorder.action(action)
+        engine.step(action)
+        recorder.checkpoint(engine)
+    recorder.close(engine)
+    return engine
+
+
+def test_round_trip_verifies(tmp_path):
+    path = tmp_path / 'game.trpl'
+    engine = record_game(path)
+    replayed, verified = replay_file(str(path))
+    assert verified is True
+    assert (replayed.score, replayed.lines, replayed.pieces) == (engine.score, engine.lines, engine.pieces)
+    assert replayed.board.to_bytes() == engine.board.to_bytes()
+
+
+def test_long_game_replay_verifies(tmp_path):
+    """Klatki kluczowe zapisują też wynik zatrzymany na MAX_SCORE."""
+    path = tmp_path / 'long.trpl'
+    engine = record_game(path, seed=0, steps=40000, keyframe_interval=50)
+    assert engine.score == MAX_SCORE
+    replayed, verified = replay_file(str(path))
+    assert verified is True
+    assert replayed.snapshot() == engine.snapshot()
+    assert seek(path.read_bytes(), pieces=engine.pieces - 10).score == MAX_SCORE
+
+
+def test_tampered_replay_fails_verification(tmp_path):
+    path = tmp_path / 'game.trpl'
+    record_game(path)
+    data = bytearray(path.read_bytes())
+    # Pierwszy rekord za nagłówkiem: akcja zamieniona na zrzut klocka
+    data[HEADER.size + 2] = ACTION_HARD_DROP if data[HEADER.size + 2] != ACTION_HARD_DROP else ACTION_NONE
+    _, verified = replay(bytes(data))
+    assert verified is False
+
+
+def test_unfinished_replay_has_no_verdict(tmp_path):
+    path = tmp_path / 'game.trpl'
+    record_game(path)
+    data = path.read_bytes()
+    _, verified = replay(data[:len(data) // 2])
+    assert verified is None
+
+
+def naive_seek(data, pieces):
+    """Odtwarzanie od początku, bez klatek kluczowych, do `pieces` klocków."""
+    engine = TetrisEngine(board='bit', seed=read_header(data))
+    for delta, action, _ in iter_records(data):
+        if action == ACTION_END or engine.pieces >= pieces:
+            break
+        if action == ACTION_KEYFRAME:
+            continue
+        if delta:
+            engine.advance_gravity(delta)
+        if action != ACTION_NONE:
+            engine.step(action)
+    return engine
+
+
+@pytest.mark.parametrize('pieces', [0, 5, 17, 40, 10 ** 6])
+def test_seek_matches_replay_from_start(tmp_path, pieces):
+    path = tmp_path / 'game.trpl'
+    record_game(path)
+    data = path.read_bytes()
+    assert len(keyframe_index(data)) >= 3
+    assert seek(data, pieces=pieces).snapshot() == naive_seek(data, pieces).snapshot()
+
+
+def test_esc_terminated_recording_verifies(tmp_path):
+    pygame = pytest.importorskip('pygame')
+    import frontend
+
+    class QuittingGame(frontend.TetrisGame):
+        """Gra bota, w której gracz wciska ESC tuż przed zrzutem klocka przez bota."""
+        quit_after = 5
+
+        def draw(self):
+            super().draw()
+            plan = self.player.plan
+            if self.engine.pieces >= self.quit_after and plan and plan[-1][0] == ACTION_HARD_DROP:
+                pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_ESCAPE))
+
+    pygame.init()
+    try:
+        window = pygame.display.set_mode((800, 600))
+        path = tmp_path / 'quit.trpl'
+        game = QuittingGame(window, frontend.SkinManager(), 'test', seed=11,
+                            replay_path=str(path), player=BotPlayer())
+        game.run()
+        replayed, verified = replay_file(str(path))
+        assert verified is True
+        assert replayed.pieces == game.engine.pieces
+    finally:
+        pygame.quit()
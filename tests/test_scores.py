@@ -0,0 +1,134 @@
+import json
+import os
+import random
+
+import pytest
+
+from scores import HighScoreManager, SqliteHighScoreManager
+
+
+def expected_top(entries, count):
+    """Ranking wzorcowy: malejąco po wyniku, przy remisie wcześniejszy wynik wyżej."""
+    ranked = sorted(enumerate(entries), key=lambda e: (-e[1][1], e[0]))[:count]
+    return [{'name': name, 'score': score} for _, (name, score) in ranked]
+
+
+@pytest.fixture
+def filename(tmp_path):
+    return str(tmp_path / 'highscores.json')
+
+
+def reload(filename, **kwargs):
+    """Wczytuje ranking od nowa i od razu zamyka wątek zapisu."""
+    manager = HighScoreManager(filename, **kwargs)
+    manager.close()
+    return manager
+
+
+def fill(manager, count, seed=1):
+    rng = random.Random(seed)
+    entries = []
+    for _ in range(count):
+        entry = (f"p{rng.randrange(50)}", rng.randrange(10000))
+        manager.add_score(*entry, level=1)
+        entries.append(entry)
+    return entries
+
+
+def test_top_and_personal_best_survive_restart(filename):
+    manager = HighScoreManager(filename, compact_every=50)
+    entries = fill(manager, 500)
+    manager.close()
+    assert manager.high_scores == expected_top(entries, 10)
+
+    reloaded = reload(filename)
+    assert reloaded.high_scores == expected_top(entries, 10)
+    assert reloaded.page(2) == expected_top(entries, 30)[20:]
+    assert reloaded.personal_best('p7') == max(s for n, s in entries if n == 'p7')
+
+
+def test_log_is_truncated_after_snapshot(filename):
+    manager = HighScoreManager(filename, compact_every=100)
+    entries = fill(manager, 1000)
+    manager.close()
+    log_path = os.path.splitext(filename)[0] + '.log'
+    # Ostatni snapshot przy zamknięciu obejmuje wszystkie wyniki
+    assert os.path.getsize(log_path) == 0
+
+    manager = HighScoreManager(filename)
+    more = fill(manager, 10, seed=2)
+    manager.close()
+    assert os.path.getsize(log_path) == 0
+    assert reload(filename).high_scores == expected_top(entries + more, 10)
+
+
+def test_crash_between_snapshot_and_truncation(filename):
+    log_path = os.path.splitext(filename)[0] + '.log'
+    manager = HighScoreManager(filename, compact_every=10 ** 6)
+    entries = fill(manager, 30)
+    manager.queue.put(None)
+    # Zamknięcie pisze dziennik i snapshot; odtwarzamy dziennik sprzed obcięcia
+    manager.writer.join()
+    lines = [json.dumps({'seq': i + 1, 'name': n, 'score': s}) + '\n' for i, (n, s) in enumerate(entries)]
+    with open(log_path, 'w') as f:
+        f.writelines(lines)
+    # Wyniki ujęte w snapshocie nie mogą zostać policzone drugi raz
+    assert reload(filename, top_k=1000).top(1000) == expected_top(entries, 1000)
+
+
+def test_truncated_last_log_line_is_dropped(filename):
+    log_path = os.path.splitext(filename)[0] + '.log'
+    manager = HighScoreManager(filename, compact_every=10 ** 6)
+    manager.add_score('a', 10)
+    manager.close()
+    with open(log_path, 'a') as f:
+        f.write(json.dumps({'seq': 2, 'name': 'b', 'score': 20}) + '\n')
+        f.write('{"seq": 3, "na')
+    manager = HighScoreManager(filename)
+    assert manager.high_scores == [{'name': 'b', 'score': 20}, {'name': 'a', 'score': 10}]
+    manager.add_score('c', 5)
+    manager.close()
+    assert reload(filename).top(3)[-1] == {'name': 'c', 'score': 5}
+
+
+def test_legacy_json_list_is_loaded(filename):
+    with open(filename, 'w') as f:
+        json.dump([{'name': 'old', 'score': 500}, {'name': 'older', 'score': 100}], f)
+    manager = HighScoreManager(filename)
+    manager.add_score('new', 300)
+    manager.close()
+    assert reload(filename).high_scores == [
+        {'name': 'old', 'score': 500}, {'name': 'new', 'score': 300}, {'name': 'older', 'score': 100},
+    ]
+
+
+@pytest.fixture
+def sqlite_manager(tmp_path):
+    manager = SqliteHighScoreManager(str(tmp_path / 'highscores.db'))
+    yield manager
+    manager.close()
+
+
+def test_sqlite_ranking_and_player_queries(sqlite_manager):
+    entries = fill(sqlite_manager, 300)
+    sqlite_manager.save_high_scores()
+    ranked = sorted(enumerate(entries), key=lambda e: (-e[1][1], e[0]))
+    assert [(r['name'], r['score']) for r in sqlite_manager.page(1, 20)] == [e for _, e in ranked[20:40]]
+    assert sqlite_manager.personal_best('p7') == max(s for n, s in entries if n == 'p7')
+    assert sqlite_manager.personal_best('nobody') is None
+    history = sqlite_manager.history('p7', limit=3)
+    assert len(history) == 3 and all(r['name'] == 'p7' for r in history)
+    assert [r['played_at'] for r in history] == sorted((r['played_at'] for r in history), reverse=True)
+
+
+def test_sqlite_percentiles(sqlite_manager):
+    assert sqlite_manager.percentile_of(100) == 0.0
+    assert sqlite_manager.score_at_percentile(50) is None
+    scores = [s for _, s in fill(sqlite_manager, 200)]
+    sqlite_manager.save_high_scores()
+    ordered = sorted(scores)
+    for score in (-1, 0, ordered[57], ordered[-1], 10 ** 6):
+        assert sqlite_manager.percentile_of(score) == 100 * sum(s < score for s in scores) / len(scores)
+    assert sqlite_manager.score_at_percentile(0) == ordered[0]
+    assert sqlite_manager.score_at_percentile(100) == ordered[-1]
+    assert sqlite_manager.score_at_percentile(50) == ordered[round(0.5 * (len(ordered) - 1))]
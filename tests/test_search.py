@@ -0,0 +1,55 @@
+import pytest
+
+from board import rows_hash
+from bot import board_rows
+from engine import TetrisEngine
+from search import LookaheadPlayer, TranspositionTable
+
+
+def play(player, seed=0, pieces=40, gravity_ms=0):
+    engine = TetrisEngine(board='bit', seed=seed)
+    actions = []
+    while not engine.game_over and engine.pieces < pieces:
+        action = player(engine)
+        actions.append(action)
+        engine.step(action)
+        if gravity_ms:
+            engine.advance_gravity(gravity_ms)
+        assert engine.board.hash == rows_hash(board_rows(engine.board))
+    return actions
+
+
+@pytest.mark.parametrize('previews, pieces, gravity_ms', [(1, 60, 0), (1, 60, 16), (2, 15, 0)])
+def test_table_does_not_change_decisions(previews, pieces, gravity_ms):
+    with_table = LookaheadPlayer(previews=previews, table=TranspositionTable())
+    without_table = LookaheadPlayer(previews=previews)
+    assert play(with_table, pieces=pieces, gravity_ms=gravity_ms) == \
+        play(without_table, pieces=pieces, gravity_ms=gravity_ms)
+    assert without_table.table.hits == 0
+
+
+def test_decision_after_gravity_reuses_root():
+    player = LookaheadPlayer()
+    play(player, pieces=200, gravity_ms=16)
+    redecisions = player.decisions - 200
+    # Ponowne decyzje dla tego samego klocka biorą zapamiętany korzeń, bez tablicy
+    assert player.table.size == 0
+    assert redecisions > 0
+    assert player.root_hits >= redecisions // 2
+
+
+def test_depth_policy_keeps_deeper_entry():
+    table = TranspositionTable(1024, policy='depth')
+    collision = 1 + table.size
+    table.put(1, 3, 'deep')
+    table.put(collision, 1, 'shallow')
+    assert table.get(1, 3) == 'deep'
+    assert table.get(1, 4) is None
+    assert table.get(collision, 1) is None
+    assert table.stats()['rejected'] == 1
+
+    table = TranspositionTable(1024, policy='always')
+    table.put(1, 3, 'deep')
+    table.put(collision, 1, 'shallow')
+    assert table.get(collision, 1) == 'shallow'
+    assert table.get(1, 1) is None
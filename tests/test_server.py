@@ -0,0 +1,83 @@
+import asyncio
+import json
+
+from engine import ACTION_LEFT, ACTION_RIGHT
+from server import GameServer, Match, encode
+from spectate import HEADER, DeltaDecoder
+
+
+async def read_frame(reader):
+    header = await reader.readexactly(HEADER.size)
+    length, _, _ = HEADER.unpack(header)
+    return header + await reader.readexactly(length + 2 - HEADER.size)
+
+
+async def watch_with_bad_messages(frames=20):
+    server = GameServer(players=1, tick_ms=5, seed=1)
+    port = await server.start(port=0)
+    try:
+        _, player = await asyncio.open_connection('127.0.0.1', port)
+        player.write(encode({'type': 'join', 'name': 'p'}))
+        while not server.matches:
+            await asyncio.sleep(0.01)
+
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        writer.write(encode({'type': 'spectate', 'match': 99}))
+        error = json.loads(await reader.readline())
+        writer.write(encode({'type': 'spectate', 'match': 0}))
+        decoder = DeltaDecoder()
+        assert decoder.feed(await read_frame(reader))
+        # Po subskrypcji błędy nie mogą trafić do strumienia ramek
+        writer.write(b'not json\n' + encode({'type': 'join'}) + encode({'type': 'spectate', 'match': 0}))
+        await writer.drain()
+        for i in range(frames):
+            # Ruchy gracza, żeby strumień nie czekał na grawitację
+            player.write(encode({'type': 'input', 'actions': [ACTION_LEFT if i % 2 else ACTION_RIGHT]}))
+            assert decoder.feed(await read_frame(reader))
+        player.close()
+        writer.close()
+        return error, decoder
+    finally:
+        await server.close()
+
+
+def test_spectator_stream_has_no_error_replies():
+    error, decoder = asyncio.run(asyncio.wait_for(watch_with_bad_messages(), 10))
+    assert error == {'type': 'error', 'message': 'no such match or player'}
+    assert decoder.synced and decoder.gaps == 0
+
+
+async def play_until_end(players=2):
+    server = GameServer(players=players, tick_ms=5, seed=2)
+    port = await server.start(port=0)
+    try:
+        clients = [await asyncio.open_connection('127.0.0.1', port) for _ in range(players)]
+        for i, (_, writer) in enumerate(clients):
+            writer.write(encode({'type': 'join', 'name': f'p{i}'}))
+        ends = []
+        for reader, writer in clients:
+            while True:
+                message = json.loads(await reader.readline())
+                if message['type'] == 'end':
+                    ends.append(message)
+                    break
+            writer.close()
+        return ends, server
+    finally:
+        await server.close()
+
+
+def test_failing_tick_ends_the_match_for_every_player(monkeypatch, capsys):
+    tick = Match.tick
+
+    def failing_tick(self):
+        if self.ticks == 3:
+            raise OverflowError('boom')
+        tick(self)
+
+    monkeypatch.setattr(Match, 'tick', failing_tick)
+    ends, server = asyncio.run(asyncio.wait_for(play_until_end(), 10))
+    assert [end['error'] for end in ends] == ['internal error'] * 2
+    assert all(end['winner'] is None and end['tick'] == 3 for end in ends)
+    assert server.finished == 1 and not server.matches
+    assert 'OverflowError: boom' in capsys.readouterr().err
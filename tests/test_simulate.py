@@ -0,0 +1,82 @@
+import json
+import os
+
+import pytest
+
+import simulate
+from simulate import load_done_seeds, main, play_game, random_policy, run
+
+MAX_PIECES = 10
+
+
+def fail_on_seed_7(engine, rng):
+    """Polityka z błędem w jednej grze (ładowana przez procesy robocze jako 'test_simulate:fail_on_seed_7')."""
+    if engine.seed == 7:
+        raise ValueError("bad seed 7")
+    return random_policy(engine, rng)
+
+
+def exit_on_seed_7(engine, rng):
+    """Polityka zabijająca proces roboczy bez znacznika końca."""
+    if engine.seed == 7:
+        os._exit(3)
+    return random_policy(engine, rng)
+
+
+def read_results(path):
+    with open(path) as f:
+        return [json.loads(line) for line in f]
+
+
+def test_resume_covers_every_seed_once(tmp_path):
+    out = str(tmp_path / 'results.jsonl')
+    assert run(range(200), out, workers=2, chunk_size=16, max_pieces=MAX_PIECES) == 200
+    # Urwana ostatnia linia po przerwaniu nie liczy się jako wynik
+    with open(out, 'a') as f:
+        f.write('{"seed": 2')
+    assert load_done_seeds(out) == set(range(200))
+    assert run(range(250), out, workers=2, chunk_size=16, max_pieces=MAX_PIECES) == 50
+    assert run(range(250), out, workers=2, chunk_size=16, max_pieces=MAX_PIECES) == 0
+
+    with open(out) as f:
+        lines = f.read().split('\n')
+    results = [json.loads(line) for line in lines if line.endswith('}')]
+    seeds = [result['seed'] for result in results]
+    assert sorted(seeds) == list(range(250))
+    expected = play_game(123, random_policy, MAX_PIECES)
+    (result,) = [result for result in results if result['seed'] == 123]
+    assert {**result, 'duration': 0} == {**expected, 'duration': 0}
+
+
+def test_failing_game_is_reported_and_retried(tmp_path):
+    out = str(tmp_path / 'results.jsonl')
+    with pytest.raises(RuntimeError, match=r"(?s)1 simulation error.*19 results written.*bad seed 7"):
+        run(range(20), out, workers=2, chunk_size=4, policy='test_simulate:fail_on_seed_7',
+            max_pieces=MAX_PIECES)
+    assert load_done_seeds(out) == set(range(20)) - {7}
+    assert run(range(20), out, workers=2, chunk_size=4, max_pieces=MAX_PIECES) == 1
+    assert sorted(result['seed'] for result in read_results(out)) == list(range(20))
+
+
+def test_dead_worker_is_reported_without_hanging(tmp_path, monkeypatch, capsys):
+    monkeypatch.setattr(simulate, 'POLL_SECONDS', 0.1)
+    out = str(tmp_path / 'results.jsonl')
+    argv = ['--games', '20', '--workers', '2', '--chunk-size', '4', '--max-pieces', str(MAX_PIECES),
+            '--out', out]
+    assert main(argv + ['--policy', 'test_simulate:exit_on_seed_7']) == 1
+    assert "exited with code 3" in capsys.readouterr().err
+    # Gry z paczki zabitego procesu są liczone ponownie, bez duplikatów
+    assert 7 not in load_done_seeds(out)
+    assert main(argv) == 0
+    assert sorted(result['seed'] for result in read_results(out)) == list(range(20))
+
+
+def test_bad_policy_exits_with_usage_error(tmp_path, capsys):
+    out = tmp_path / 'results.jsonl'
+    with pytest.raises(SystemExit) as exit_info:
+        main(['--games', '1', '--policy', 'no_such_policy', '--out', str(out)])
+    assert exit_info.value.code == 2
+    assert "bad --policy 'no_such_policy'" in capsys.readouterr().err
+    with pytest.raises(ValueError):
+        run(range(1), str(out), policy='no_such_policy')
+    assert not out.exists()
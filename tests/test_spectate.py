@@ -0,0 +1,114 @@
+import random
+
+from board import GRID_WIDTH
+from bot import BotPlayer
+from engine import ACTION_NONE, MAX_SCORE, TetrisEngine
+from spectate import HEADER, PIECE, DeltaDecoder, Publisher
+
+
+def assert_matches(decoder, engine):
+    assert bytes(decoder.grid) == engine.board.to_bytes()
+    assert decoder.current_piece == engine.current_piece
+    assert decoder.next_piece == engine.next_piece
+    assert (decoder.score, decoder.level, decoder.lines, decoder.pieces, decoder.game_over) == \
+        (engine.score, engine.level, engine.lines, engine.pieces, engine.game_over)
+
+
+def frames(engine, publisher, pieces=150, seed=0):
+    """Gra bota ze śmieciami; zwraca kolejne ramki publikacji (bez pustych)."""
+    bot = BotPlayer()
+    rng = random.Random(seed)
+    garbage = 40
+    while not engine.game_over and engine.pieces < pieces:
+        engine.step(bot(engine))
+        engine.advance_gravity(16)
+        if engine.pieces >= garbage:
+            garbage += 40
+            engine.add_garbage(1, rng.randrange(GRID_WIDTH))
+        frame = publisher.publish()
+        if frame is not None:
+            yield frame
+
+
+def test_decoder_follows_engine():
+    engine = TetrisEngine(board='bit', seed=1)
+    publisher = Publisher(engine)
+    decoder = DeltaDecoder()
+    publisher.subscribe(decoder.feed)
+    moves = 0
+    for frame in frames(engine, publisher):
+        assert_matches(decoder, engine)
+        moves += len(frame) == HEADER.size + 1 + PIECE.size
+    assert decoder.gaps == 0
+    # Większość ramek to sam ruch klocka
+    assert moves > publisher.frames // 2
+
+
+def test_unchanged_state_sends_nothing():
+    engine = TetrisEngine(seed=2)
+    publisher = Publisher(engine)
+    engine.step(ACTION_NONE)
+    assert publisher.publish() is None
+
+
+def test_late_viewer_starts_from_shared_keyframe():
+    engine = TetrisEngine(board='bit', seed=3)
+    publisher = Publisher(engine)
+    stream = frames(engine, publisher)
+    for _ in range(100):
+        next(stream)
+    first, second = DeltaDecoder(), DeltaDecoder()
+    publisher.subscribe(first.feed)
+    publisher.subscribe(second.feed)
+    # Klatka kluczowa jest budowana raz na numer sekwencji
+    assert publisher.keyframe() is publisher.keyframe_cache[1]
+    assert_matches(first, engine)
+    for _ in stream:
+        assert_matches(second, engine)
+    assert first.seq == second.seq == publisher.encoder.seq
+
+
+def test_gap_requires_keyframe():
+    engine = TetrisEngine(board='bit', seed=4)
+    publisher = Publisher(engine)
+    decoder = DeltaDecoder()
+    sent = []
+    publisher.subscribe(sent.append)
+    stream = frames(engine, publisher)
+    for _ in range(5):
+        next(stream)
+    assert all(decoder.feed(frame) for frame in sent[:3])
+    # Ramka numer 3 ginie
+    assert not decoder.feed(sent[4])
+    assert decoder.gaps == 1 and not decoder.synced
+    assert not decoder.feed(next(stream))
+    publisher.resync(decoder.feed)
+    assert decoder.synced
+    assert_matches(decoder, engine)
+    for frame in stream:
+        assert decoder.feed(frame)
+    assert_matches(decoder, engine)
+    assert decoder.gaps == 1
+
+
+def test_long_game_stream_with_saturated_score():
+    engine = TetrisEngine(board='bit', seed=0)
+    publisher = Publisher(engine)
+    decoder = DeltaDecoder()
+    rng = random.Random(5)
+
+    def lossy_feed(frame):
+        # Co setna ramka ginie; widz wykrywa lukę i prosi o klatkę kluczową
+        if rng.random() >= 0.01 and not decoder.feed(frame):
+            publisher.resync(lossy_feed)
+
+    publisher.subscribe(lossy_feed)
+    bot = BotPlayer()
+    while engine.pieces < 2200:
+        engine.step(bot(engine))
+        engine.advance_gravity(16)
+        publisher.publish()
+    assert not engine.game_over and engine.score == MAX_SCORE
+    assert decoder.gaps > 10
+    publisher.resync(decoder.feed)
+    assert_matches(decoder, engine)
@@ -0,0 +1,97 @@
+import json
+
+import pytest
+
+from frontend import LOGIC_TICK_MS, MAX_CATCHUP_TICKS
+from timing import FRAME, PHASES, FixedTimestep, FrameProfiler
+
+
+class FakeClock:
+    """Zegar sterowany przez test (w sekundach, jak time.perf_counter)."""
+
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, ms):
+        self.now += ms / 1000
+
+
+def test_timestep_runs_whole_ticks_and_keeps_the_rest():
+    timestep = FixedTimestep(LOGIC_TICK_MS, MAX_CATCHUP_TICKS)
+    frames = [0.5, 0.5, 0.7, 3.3, 0.0, 1.0, 2.9]
+    ticks, alphas = [], []
+    for elapsed in frames:
+        ticks.append(timestep.update(elapsed * LOGIC_TICK_MS))
+        alphas.append(timestep.alpha)
+    assert ticks == [0, 1, 0, 4, 0, 1, 2]
+    assert alphas == pytest.approx([0.5, 0.0, 0.7, 0.0, 0.0, 0.0, 0.9])
+    # Bez odrzuceń cały czas trafia do kroków albo do akumulatora
+    assert sum(ticks) * LOGIC_TICK_MS + timestep.accumulator == pytest.approx(sum(frames) * LOGIC_TICK_MS)
+    assert timestep.dropped_ms == 0
+
+
+def test_timestep_caps_catchup_and_drops_the_excess():
+    timestep = FixedTimestep(LOGIC_TICK_MS, MAX_CATCHUP_TICKS)
+    timestep.update(LOGIC_TICK_MS // 2)
+    # Zawieszenie okna na 100 kroków i 3 ms
+    stall = 100 * LOGIC_TICK_MS + 3
+    assert timestep.update(stall) == MAX_CATCHUP_TICKS
+    assert timestep.dropped_ms == (100 - MAX_CATCHUP_TICKS) * LOGIC_TICK_MS
+    assert timestep.alpha == pytest.approx((LOGIC_TICK_MS // 2 + 3) / LOGIC_TICK_MS)
+    # Po przerwie kolejna zwykła klatka nie nadrabia odrzuconego czasu
+    assert timestep.update(LOGIC_TICK_MS) == 1
+    assert 0 <= timestep.alpha < 1
+
+
+def test_profiler_splits_frames_into_phases():
+    clock = FakeClock()
+    profiler = FrameProfiler(budget_ms=15, clock=clock)
+    for frame in range(40):
+        profiler.start()
+        for phase, ms in zip(PHASES, (1, 2, 3, 4)):
+            clock.advance(ms * (3 if frame == 7 else 1))
+            if phase == PHASES[-1]:
+                profiler.end(phase)
+            else:
+                profiler.mark(phase)
+    assert profiler.frames == 40
+    assert profiler.phases['draw'].rolling() == pytest.approx([3, 3, 9])
+    assert profiler.phases[FRAME].max == pytest.approx(30)
+    # Tylko klatka 7 (30 ms) przekracza budżet, pozostałe trwają 10 ms
+    assert profiler.slow_count == 1
+    frame, frame_ms, phases = profiler.slow[0]
+    assert (frame, frame_ms) == (7, pytest.approx(30))
+    assert phases == pytest.approx({'events': 3, 'logic': 6, 'draw': 9, 'flip': 12})
+
+
+def test_profiler_overlay_refresh_and_dump(tmp_path):
+    clock = FakeClock()
+    profiler = FrameProfiler(budget_ms=5, clock=clock)
+
+    def frame(ms):
+        profiler.start()
+        clock.advance(ms)
+        profiler.end('draw')
+
+    frame(2)
+    lines = profiler.overlay(refresh=30)
+    assert lines[0].startswith("ms") and len(lines) == len(PHASES) + 2
+    frame(8)
+    # Nakładka jest przeliczana dopiero co `refresh` klatek
+    assert profiler.overlay(refresh=30) is lines
+    assert profiler.overlay(refresh=2) is not lines
+
+    path = tmp_path / 'profiles' / 'timings.jsonl'
+    profiler.dump(str(path), seed=3)
+    with open(path) as f:
+        records = [json.loads(line) for line in f]
+    assert records[0] == {'seed': 3, 'type': 'game', 'frames': 2, 'budget_ms': 5, 'slow_frames': 1}
+    phases = {record['phase']: record for record in records if record['type'] == 'phase'}
+    assert set(phases) == set(PHASES + (FRAME,))
+    assert phases[FRAME]['count'] == 2 and phases[FRAME]['max'] == pytest.approx(8)
+    assert phases['logic']['histogram'] == [2]
+    (slow,) = [record for record in records if record['type'] == 'slow']
+    assert slow['frame'] == 1 and slow['phases'] == {'draw': pytest.approx(8)}
@@ -0,0 +1,191 @@
+"""Stały krok logiki i pomiar czasu faz każdej klatki gry (bez zależności od pygame).
+
+FixedTimestep dzieli czas rzeczywisty na kroki logiki o stałej długości,
+niezależnie od tego, ile klatek na sekundę zdąży narysować ekran.
+
+Pętla gry dzieli klatkę na fazy PHASES:
+    events  obsługa zdarzeń (handle_input)
+    logic   grawitacja i krok silnika
+    draw    rysowanie sceny
+    flip    flip/update ekranu i czekanie w clock.tick(FPS)
+
+Dla każdej fazy i dla całej klatki FrameProfiler trzyma okno ostatnich
+WINDOW pomiarów (percentyle na bieżąco, np. dla nakładki na ekranie)
+oraz histogram całej gry w przedziałach BIN_MS. Klatki dłuższe niż
+budżet (domyślnie 1000/60 ms) są zapamiętywane z rozbiciem na fazy, żeby
+było widać, czy budżet przekracza rysowanie, czy logika.
+
+dump() dopisuje wynik gry do pliku JSON-lines:
+    {"type": "game", ...}     podsumowanie i metadane
+    {"type": "phase", ...}    percentyle i histogram jednej fazy
+    {"type": "slow", ...}     pojedyncza klatka ponad budżet
+"""
+import json
+import os
+import time
+from collections import deque
+
+PHASES = ('events', 'logic', 'draw', 'flip')
+FRAME = 'frame'
+WINDOW = 300
+BIN_MS = 0.25
+BINS = 200
+MAX_SLOW_FRAMES = 1000
+
+
+def percentile(values, p):
+    """Percentyl p (0-100) z listy posortowanych wartości."""
+    if not values:
+        return 0.0
+    k = min(len(values) - 1, max(0, round(p / 100 * (len(values) - 1))))
+    return values[k]
+
+
+class FixedTimestep:
+    """Akumulator czasu rzeczywistego wydający stałe kroki logiki po tick_ms.
+
+    Zaległe kroki są nadrabiane, ale najwyżej max_ticks na jedną klatkę;
+    nadmiar (np. po przeciągnięciu okna lub zawieszeniu) jest odrzucany
+    i liczony w dropped_ms, żeby jedna długa przerwa nie zamieniła się
+    w coraz dłuższe klatki."""
+
+    def __init__(self, tick_ms, max_ticks):
+        self.tick_ms = tick_ms
+        self.max_ticks = max_ticks
+        self.accumulator = 0
+        self.dropped_ms = 0
+
+    def update(self, elapsed_ms):
+        """Dodaje czas od poprzedniej klatki i zwraca liczbę kroków logiki do wykonania."""
+        self.accumulator += elapsed_ms
+        ticks = self.accumulator // self.tick_ms
+        if ticks > self.max_ticks:
+            self.dropped_ms += (ticks - self.max_ticks) * self.tick_ms
+            ticks = self.max_ticks
+        self.accumulator -= ticks * self.tick_ms
+        if self.accumulator >= self.tick_ms:
+            self.accumulator %= self.tick_ms
+        return ticks
+
+    @property
+    def alpha(self):
+        """Część następnego kroku zebrana w akumulatorze (0 <= alpha < 1), do interpolacji rysowania."""
+        return self.accumulator / self.tick_ms
+
+
+class RollingHistogram:
+    """Okno ostatnich pomiarów plus histogram wszystkich pomiarów (ms)."""
+
+    def __init__(self, window=WINDOW, bin_ms=BIN_MS, bins=BINS):
+        self.recent = deque(maxlen=window)
+        self.bin_ms = bin_ms
+        # Ostatni przedział zbiera wszystkie pomiary powyżej bins * bin_ms
+        self.counts = [0] * (bins + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, ms):
+        self.recent.append(ms)
+        self.counts[min(int(ms / self.bin_ms), len(self.counts) - 1)] += 1
+        self.count += 1
+        self.total += ms
+        if ms > self.max:
+            self.max = ms
+
+    def rolling(self, ps=(50, 95, 99)):
+        """Percentyle z okna ostatnich pomiarów."""
+        values = sorted(self.recent)
+        return [percentile(values, p) for p in ps]
+
+    def overall(self, ps=(50, 95, 99)):
+        """Percentyle całej gry z histogramu (górna granica przedziału)."""
+        result = []
+        for p in ps:
+            target = p / 100 * self.count
+            seen = 0
+            for i, n in enumerate(self.counts):
+                seen += n
+                if n and seen >= target:
+                    result.append(min((i + 1) * self.bin_ms, self.max))
+                    break
+            else:
+                result.append(0.0)
+        return result
+
+    def to_dict(self):
+        p50, p95, p99 = self.overall()
+        # Puste przedziały na końcu nie są zapisywane
+        last = max((i for i, n in enumerate(self.counts) if n), default=-1)
+        return {
+            'count': self.count,
+            'mean': self.total / self.count if self.count else 0.0,
+            'max': self.max,
+            'p50': p50,
+            'p95': p95,
+            'p99': p99,
+            'bin_ms': self.bin_ms,
+            'histogram': self.counts[:last + 1],
+        }
+
+
+class FrameProfiler:
+    """Mierzy fazy kolejnych klatek: start(), mark(faza) po każdej fazie, end(faza) na końcu."""
+
+    def __init__(self, budget_ms=1000 / 60, clock=time.perf_counter):
+        self.budget_ms = budget_ms
+        self.clock = clock
+        self.phases = {name: RollingHistogram() for name in PHASES + (FRAME,)}
+        self.frames = 0
+        self.slow = []
+        self.slow_count = 0
+        self.current = {}
+        self.frame_start = self.last = 0.0
+        self.overlay_lines = ()
+
+    def start(self):
+        self.frame_start = self.last = self.clock()
+        self.current = {}
+
+    def mark(self, phase):
+        """Zamyka fazę `phase` bieżącej klatki (czas od poprzedniego znacznika)."""
+        now = self.clock()
+        self.current[phase] = self.current.get(phase, 0.0) + (now - self.last) * 1000
+        self.last = now
+
+    def end(self, phase):
+        """Zamyka ostatnią fazę i całą klatkę."""
+        self.mark(phase)
+        frame_ms = (self.last - self.frame_start) * 1000
+        for name in PHASES:
+            self.phases[name].add(self.current.get(name, 0.0))
+        self.phases[FRAME].add(frame_ms)
+        if frame_ms > self.budget_ms:
+            self.slow_count += 1
+            if len(self.slow) < MAX_SLOW_FRAMES:
+                self.slow.append((self.frames, frame_ms, dict(self.current)))
+        self.frames += 1
+
+    def overlay(self, refresh=30):
+        """Napisy nakładki (percentyle z okna); przeliczane co `refresh` klatek."""
+        if not self.overlay_lines or self.frames % refresh == 0:
+            lines = ["ms      p50   p95   p99"]
+            for name in PHASES + (FRAME,):
+                p50, p95, p99 = self.phases[name].rolling()
+                lines.append(f"{name:6s} {p50:5.1f} {p95:5.1f} {p99:5.1f}")
+            self.overlay_lines = tuple(lines)
+        return self.overlay_lines
+
+    def dump(self, path, **meta):
+        """Dopisuje podsumowanie gry, histogramy faz i wolne klatki do pliku JSON-lines."""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, 'a') as f:
+            game = dict(meta, type='game', frames=self.frames, budget_ms=self.budget_ms,
+                        slow_frames=self.slow_count)
+            f.write(json.dumps(game) + '\n')
+            for name, histogram in self.phases.items():
+                f.write(json.dumps(dict(histogram.to_dict(), type='phase', phase=name)) + '\n')
+            for frame, frame_ms, phases in self.slow:
+                f.write(json.dumps({'type': 'slow', 'frame': frame, 'ms': frame_ms, 'phases': phases}) + '\n')